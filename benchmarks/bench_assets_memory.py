@@ -0,0 +1,126 @@
+"""Measure the memory held by scanned GameAssets with tracemalloc.
+
+Builds a synthetic games library in a temporary folder (or uses --folder),
+scans it, and compares the memory retained by the scan result against the
+same games stored the old way (a dataclass holding one Path per file).
+
+    python benchmarks/bench_assets_memory.py --games 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+def _ensure_src_on_path() -> None:
+    here = Path(__file__).resolve().parent
+    src = here.parent / "src"
+    for p in (src, here):
+        if str(p) not in sys.path:
+            sys.path.insert(0, str(p))
+
+
+_ensure_src_on_path()
+
+from bench_scan import build_library  # noqa: E402
+from sgm.domain import ASSET_KINDS  # noqa: E402
+from sgm.scanner import scan_folder  # noqa: E402
+
+
+@dataclass
+class LegacyGameAssets:
+    """The previous GameAssets layout: one Path object per present file."""
+
+    basename: str
+    folder: Path
+
+    rom: Path | None = None
+    config: Path | None = None
+    metadata: Path | None = None
+
+    box: Path | None = None
+    box_small: Path | None = None
+    overlay: Path | None = None
+    overlay2: Path | None = None
+    overlay3: Path | None = None
+    overlay_big: Path | None = None
+    qrcode: Path | None = None
+
+    snap1: Path | None = None
+    snap2: Path | None = None
+    snap3: Path | None = None
+
+    other: list[Path] = field(default_factory=list)
+
+
+def _traced(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - t0
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, current, peak, seconds
+
+
+def run(folder: Path) -> None:
+    # Warm the OS directory cache so both runs see the same I/O.
+    scan_folder(folder)
+
+    result, compact_cur, compact_peak, compact_s = _traced(lambda: scan_folder(folder))
+    names = [
+        (key, g.basename, g.folder, [(k.slot, p.name) for k in ASSET_KINDS if (p := getattr(g, k.slot)) is not None])
+        for key, g in result.games.items()
+    ]
+
+    def build_legacy() -> dict[str, LegacyGameAssets]:
+        games: dict[str, LegacyGameAssets] = {}
+        for key, basename, gfolder, files in names:
+            game = LegacyGameAssets(basename=basename, folder=gfolder)
+            for slot, name in files:
+                setattr(game, slot, gfolder / name)
+            games[key] = game
+        return games
+
+    legacy, legacy_cur, legacy_peak, legacy_s = _traced(build_legacy)
+
+    n = max(1, len(result.games))
+    print(f"library: {folder}")
+    print(f"games: {len(result.games)}")
+    print(f"{'layout':<10} {'retained MiB':>13} {'peak MiB':>9} {'bytes/game':>11} {'seconds':>9}")
+    print(f"{'legacy':<10} {legacy_cur / 2**20:>13.1f} {legacy_peak / 2**20:>9.1f} {legacy_cur // n:>11} {legacy_s:>9.3f}")
+    print(f"{'compact':<10} {compact_cur / 2**20:>13.1f} {compact_peak / 2**20:>9.1f} {compact_cur // n:>11} {compact_s:>9.3f}")
+    print("legacy = GameAssets objects only; compact = the whole ScanResult (keys and lists included)")
+    del legacy
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=50000, help="games to generate in the synthetic library")
+    parser.add_argument("--folder", type=Path, default=None, help="scan an existing library instead")
+    args = parser.parse_args(argv)
+
+    if args.folder is not None:
+        run(args.folder)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="sgm-bench-") as tmp:
+        root = Path(tmp)
+        build_library(root, args.games)
+        run(root)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
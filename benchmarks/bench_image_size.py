@@ -0,0 +1,95 @@
+"""Compare the header-only PNG size probe against opening images with Pillow.
+
+Writes a set of PNG files in a temporary folder (or uses the PNGs under
+--folder) and times reading every file's size both ways.
+
+    python benchmarks/bench_image_size.py --images 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _ensure_src_on_path() -> None:
+    src = Path(__file__).resolve().parents[1] / "src"
+    if str(src) not in sys.path:
+        sys.path.insert(0, str(src))
+
+
+_ensure_src_on_path()
+
+from PIL import Image  # noqa: E402
+
+from sgm.image_ops import get_image_sizes, probe_png_size  # noqa: E402
+
+
+SIZES = [(1280, 720), (320, 240), (640, 480), (256, 256)]
+
+
+def build_images(root: Path, count: int) -> list[Path]:
+    # Tiny solid images compress to a few hundred bytes; the header is what matters.
+    templates = [Image.new("RGBA", size, (32, 64, 96, 255)) for size in SIZES]
+    paths: list[Path] = []
+    for i in range(count):
+        p = root / f"img{i:05d}.png"
+        templates[i % len(templates)].save(p, format="PNG")
+        paths.append(p)
+    return paths
+
+
+def pillow_size(path: Path) -> tuple[int, int] | None:
+    """The previous get_image_size: open the image with Pillow."""
+
+    try:
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def run(paths: list[Path], rounds: int) -> None:
+    def timed(fn) -> float:
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    t_pillow = timed(lambda: [pillow_size(p) for p in paths])
+    t_probe = timed(lambda: [probe_png_size(p) for p in paths])
+    t_batch = timed(lambda: get_image_sizes(paths))
+
+    mismatched = sum(1 for p in paths if probe_png_size(p) not in (None, pillow_size(p)))
+    n = max(1, len(paths))
+    print(f"images: {len(paths)} (best of {rounds})")
+    print(f"{'method':<10} {'seconds':>9} {'us/image':>9}")
+    for name, t in (("pillow", t_pillow), ("probe", t_probe), ("batch", t_batch)):
+        print(f"{name:<10} {t:>9.3f} {t * 1e6 / n:>9.1f}")
+    print(f"speedup (probe vs pillow): {t_pillow / max(t_probe, 1e-9):.1f}x")
+    print(f"size mismatches: {mismatched}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=2000, help="PNG files to generate")
+    parser.add_argument("--rounds", type=int, default=3, help="timing rounds (best is reported)")
+    parser.add_argument("--folder", type=Path, default=None, help="probe the PNGs of an existing library instead")
+    args = parser.parse_args(argv)
+
+    if args.folder is not None:
+        run(sorted(args.folder.rglob("*.png")), args.rounds)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="sgm-bench-") as tmp:
+        run(build_images(Path(tmp), args.images), args.rounds)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
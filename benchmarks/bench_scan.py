@@ -0,0 +1,138 @@
+"""Compare the scanner's directory walk against the old pathlib-based walk.
+
+Builds a synthetic games library in a temporary folder (or uses --folder),
+then counts the os.stat/os.lstat calls and directory reads made by each walk.
+
+    python benchmarks/bench_scan.py --games 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _ensure_src_on_path() -> None:
+    src = Path(__file__).resolve().parents[1] / "src"
+    if str(src) not in sys.path:
+        sys.path.insert(0, str(src))
+
+
+_ensure_src_on_path()
+
+from sgm.scanner import scan_folder  # noqa: E402
+
+
+SUFFIXES = ["", "_small", "_overlay", "_big_overlay", "_qrcode", "_snap1", "_snap2"]
+
+
+def build_library(root: Path, games: int, *, per_folder: int = 500) -> None:
+    for i in range(games):
+        sub = root / f"Folder{i // per_folder:03d}"
+        sub.mkdir(parents=True, exist_ok=True)
+        base = f"Game{i:05d}"
+        for name in [f"{base}.int", f"{base}.cfg", f"{base}.json"] + [f"{base}{s}.png" for s in SUFFIXES]:
+            (sub / name).touch()
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.stat = 0
+        self.listdir = 0
+
+
+@contextmanager
+def count_syscalls():
+    counters = _Counters()
+    orig_stat, orig_lstat = os.stat, os.lstat
+    orig_scandir, orig_listdir = os.scandir, os.listdir
+
+    def stat(*args, **kwargs):
+        counters.stat += 1
+        return orig_stat(*args, **kwargs)
+
+    def lstat(*args, **kwargs):
+        counters.stat += 1
+        return orig_lstat(*args, **kwargs)
+
+    def scandir(*args, **kwargs):
+        counters.listdir += 1
+        return orig_scandir(*args, **kwargs)
+
+    def listdir(*args, **kwargs):
+        counters.listdir += 1
+        return orig_listdir(*args, **kwargs)
+
+    os.stat, os.lstat, os.scandir, os.listdir = stat, lstat, scandir, listdir
+    try:
+        yield counters
+    finally:
+        os.stat, os.lstat, os.scandir, os.listdir = orig_stat, orig_lstat, orig_scandir, orig_listdir
+
+
+def legacy_walk(folder: Path) -> int:
+    """The filesystem access pattern of the old Path.iterdir()-based scanner."""
+
+    files = 0
+    stack: list[Path] = [folder]
+    while stack:
+        cur = stack.pop()
+        try:
+            entries = list(cur.iterdir())
+        except Exception:
+            continue
+        for entry in entries:
+            if entry.is_dir() and not entry.name.startswith("."):
+                stack.append(entry)
+        for entry in entries:
+            if entry.is_dir():
+                continue
+            if not entry.is_file():
+                continue
+            files += 1
+    return files
+
+
+def run(folder: Path) -> None:
+    t0 = time.perf_counter()
+    with count_syscalls() as legacy:
+        legacy_walk(folder)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with count_syscalls() as current:
+        result = scan_folder(folder)
+    t_current = time.perf_counter() - t0
+
+    print(f"library: {folder}")
+    print(f"games: {len(result.games)}")
+    print(f"{'walk':<10} {'stat calls':>12} {'dir reads':>10} {'seconds':>9}")
+    print(f"{'legacy':<10} {legacy.stat:>12} {legacy.listdir:>10} {t_legacy:>9.3f}")
+    print(f"{'scandir':<10} {current.stat:>12} {current.listdir:>10} {t_current:>9.3f}")
+    print(f"stat calls avoided: {legacy.stat - current.stat}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000, help="games to generate in the synthetic library")
+    parser.add_argument("--folder", type=Path, default=None, help="scan an existing library instead")
+    args = parser.parse_args(argv)
+
+    if args.folder is not None:
+        run(args.folder)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="sgm-bench-") as tmp:
+        root = Path(tmp)
+        build_library(root, args.games)
+        run(root)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
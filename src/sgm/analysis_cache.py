@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from sgm.image_ops import get_image_size
+from sgm.scan_snapshot import RACY_WINDOW_NS, SNAPSHOT_DIR_NAME
+
+
+ANALYSIS_FILE_NAME = "analysis.db"
+ANALYSIS_VERSION = 1
+
+# The metadata JSON keys the warning analysis looks at.
+JSON_FACT_KEYS = ("name", "nb_players", "editor", "year", "description", "jzintv_extra")
+
+
+def read_json_facts(path: Path) -> dict | None:
+    """The JSON_FACT_KEYS part of a metadata file; {} if it is not a JSON object, None if missing."""
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: data[k] for k in JSON_FACT_KEYS if k in data}
+
+
+def file_stamps(paths: Iterable[str | Path]) -> tuple[tuple[int, int] | None, ...] | None:
+    """(size, mtime_ns) of each file, None for a missing one.
+
+    Comparing two stamps tells whether any of the files changed in between.
+    Returns None if a file was modified too recently for its mtime to be
+    trusted; such a stamp never matches.
+    """
+
+    now = time.time_ns()
+    stamps: list[tuple[int, int] | None] = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            stamps.append(None)
+            continue
+        if now - st.st_mtime_ns < RACY_WINDOW_NS:
+            return None
+        stamps.append((st.st_size, st.st_mtime_ns))
+    return tuple(stamps)
+
+
+class AnalysisCache:
+    """Per-library cache of the file facts the warning analysis needs.
+
+    Stored in `<root>/.sgm/analysis.db`: image dimensions and metadata JSON
+    facts, each keyed by the file's path, size and mtime_ns. A file whose
+    size and mtime still match is not read again.
+
+    Unlike ScanSnapshot, rows are looked up on demand (a large library has
+    hundreds of thousands of files). New rows are kept in memory until
+    save(). Lookups may run on worker threads; save() and close() must be
+    called from the owning thread.
+    """
+
+    def __init__(self, root: Path, *, db_path: Path | None = None):
+        self.root = root
+        self.db_path = db_path
+        self._con: sqlite3.Connection | None = None
+        self._pending: dict[str, tuple[int, int, int, str, str]] = {}
+        self._seen: set[str] | None = None
+        self._seen_kinds: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path(root: Path) -> Path:
+        return root / SNAPSHOT_DIR_NAME / ANALYSIS_FILE_NAME
+
+    @staticmethod
+    def open(root: Path) -> "AnalysisCache":
+        cache = AnalysisCache(root, db_path=AnalysisCache.default_path(root))
+        cache._connect()
+        return cache
+
+    def _connect(self) -> None:
+        if self.db_path is None or not self.db_path.exists():
+            return
+        try:
+            con = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            row = con.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or str(row[0]) != str(ANALYSIS_VERSION):
+                con.close()
+                return
+            self._con = con
+        except Exception:
+            # A corrupt or foreign file is treated as an empty cache.
+            self._con = None
+
+    def close(self) -> None:
+        with self._lock:
+            con, self._con = self._con, None
+        if con is not None:
+            try:
+                con.close()
+            except Exception:
+                pass
+
+    def _key(self, path: Path) -> str:
+        try:
+            rel = path.relative_to(self.root)
+        except Exception:
+            return path.as_posix()
+        return rel.as_posix()
+
+    def begin_analysis(self) -> None:
+        """Start tracking which files a full analysis looks at (for pruning)."""
+        with self._lock:
+            self._seen = set()
+            self._seen_kinds = set()
+
+    def _lookup(self, path: Path, kind: str) -> tuple[str, int, int, str | None]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return "", -1, -1, None
+        key = self._key(path)
+        with self._lock:
+            if self._seen is not None:
+                self._seen.add(key)
+                self._seen_kinds.add(kind)
+            row = self._pending.get(key)
+            if row is None and self._con is not None:
+                try:
+                    row = self._con.execute(
+                        "SELECT size, mtime_ns, checked_ns, kind, facts FROM files WHERE path = ?", (key,)
+                    ).fetchone()
+                except Exception:
+                    row = None
+        if row is None:
+            return key, st.st_size, st.st_mtime_ns, None
+        size, mtime_ns, checked_ns, row_kind, facts = row
+        if (size, mtime_ns, row_kind) != (st.st_size, st.st_mtime_ns, kind):
+            return key, st.st_size, st.st_mtime_ns, None
+        # A read within the mtime resolution may have missed a later write.
+        if checked_ns - mtime_ns < RACY_WINDOW_NS:
+            return key, st.st_size, st.st_mtime_ns, None
+        return key, st.st_size, st.st_mtime_ns, facts
+
+    def _put(self, key: str, size: int, mtime_ns: int, kind: str, facts: str) -> None:
+        with self._lock:
+            self._pending[key] = (size, mtime_ns, time.time_ns(), kind, facts)
+
+    def image_size(self, path: Path) -> tuple[int, int] | None:
+        key, size, mtime_ns, facts = self._lookup(path, "image")
+        if facts is not None:
+            value = json.loads(facts)
+            return (int(value[0]), int(value[1])) if value else None
+        result = get_image_size(path)
+        if size >= 0:
+            self._put(key, size, mtime_ns, "image", json.dumps(list(result) if result else None))
+        return result
+
+    def image_sizes(self, paths: Iterable[Path | None]) -> dict[Path, tuple[int, int] | None]:
+        """image_size for many files at once; None entries are skipped."""
+
+        sizes: dict[Path, tuple[int, int] | None] = {}
+        for p in paths:
+            if p is not None and p not in sizes:
+                sizes[p] = self.image_size(p)
+        return sizes
+
+    def json_facts(self, path: Path) -> dict | None:
+        """Cached read_json_facts()."""
+
+        key, size, mtime_ns, facts = self._lookup(path, "json")
+        if facts is not None:
+            return json.loads(facts)
+        result = read_json_facts(path)
+        if result is not None and size >= 0:
+            self._put(key, size, mtime_ns, "json", json.dumps(result))
+        return result
+
+    def save(self, *, prune: bool = False) -> None:
+        """Write new rows.
+
+        With prune=True, rows of the kinds the last full analysis looked at
+        (images, JSON) are dropped if it did not look at their file.
+        """
+
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            seen = self._seen if prune else None
+            seen_kinds = self._seen_kinds
+            if prune:
+                self._seen = None
+
+        if self.db_path is None or (not pending and seen is None):
+            return
+
+        try:
+            if self._con is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                con = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                con.execute("DROP TABLE IF EXISTS files")
+                con.execute(
+                    "CREATE TABLE files ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, checked_ns INTEGER, kind TEXT, facts TEXT)"
+                )
+                with con:
+                    con.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                        (str(ANALYSIS_VERSION),),
+                    )
+                with self._lock:
+                    self._con = con
+            with self._lock:
+                con = self._con
+                assert con is not None
+                with con:
+                    con.executemany(
+                        "INSERT OR REPLACE INTO files (path, size, mtime_ns, checked_ns, kind, facts) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(k, *row) for k, row in pending.items()],
+                    )
+                    if seen is not None:
+                        stale = [
+                            (k,)
+                            for k, kind in con.execute("SELECT path, kind FROM files")
+                            if kind in seen_kinds and k not in seen
+                        ]
+                        con.executemany("DELETE FROM files WHERE path = ?", stale)
+        except Exception:
+            # Read-only libraries (or a locked db) just re-read files next time.
+            return
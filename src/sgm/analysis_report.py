@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from sgm.analysis_cache import AnalysisCache, read_json_facts
+from sgm.config import AppConfig
+from sgm.domain import ASSET_KINDS, GameAssets
+from sgm.helper_paths import HelperPathIndex
+from sgm.image_ops import get_image_size
+from sgm.scan_snapshot import ScanSnapshot
+from sgm.scanner import scan_folder
+from sgm.warning_rules import CODE_BITS, WARNING_CODES, WarningContext, evaluate_rules, select_rules
+
+
+REPORT_FORMATS = ("csv", "jsonl")
+
+# Slots whose image size is reported.
+IMAGE_SLOTS: tuple[str, ...] = tuple(k.slot for k in ASSET_KINDS if ".png" in k.exts)
+
+CSV_COLUMNS: tuple[str, ...] = (
+    "game",
+    "folder",
+    "basename",
+    *(k.slot for k in ASSET_KINDS),
+    *(f"{slot}_size" for slot in IMAGE_SLOTS),
+    "codes",
+)
+
+# Cache rows are written out this often during a headless run, so they do not pile up in memory.
+_SAVE_EVERY = 1000
+
+# Image sizes remembered without an analysis cache: enough for the games a row lags behind its rules.
+_SIZE_MEMO = 256
+
+
+def report_format_for(path: str | Path, default: str = "csv") -> str:
+    """The report format implied by a file name (.jsonl / .csv), else `default`."""
+
+    suffix = Path(path).suffix.lower()
+    if suffix in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    return default
+
+
+def iter_report_rows(
+    entries: Iterable[tuple[str, GameAssets, int]],
+    *,
+    root: Path,
+    image_size: Callable[[Path], tuple[int, int] | None],
+) -> Iterator[dict]:
+    """One report row per (game id, game, warning mask).
+
+    Paths are relative to `root` (POSIX style), image sizes are [width,
+    height] (None if unreadable) and codes are listed in registry order.
+    """
+
+    def rel(p: Path) -> str:
+        try:
+            return p.relative_to(root).as_posix()
+        except Exception:
+            return str(p)
+
+    for game_id, game, mask in entries:
+        files: dict[str, str] = {}
+        sizes: dict[str, list[int] | None] = {}
+        for kind in ASSET_KINDS:
+            p = getattr(game, kind.slot)
+            if p is None:
+                continue
+            files[kind.slot] = rel(p)
+            if kind.slot in IMAGE_SLOTS:
+                size = image_size(p)
+                sizes[kind.slot] = list(size) if size else None
+        yield {
+            "game": game_id,
+            "folder": rel(game.folder) if game.folder != root else "",
+            "basename": game.basename,
+            "files": files,
+            "image_sizes": sizes,
+            "codes": [code for code in WARNING_CODES if mask & CODE_BITS[code]],
+        }
+
+
+def _csv_record(row: dict) -> dict[str, str]:
+    record = {"game": row["game"], "folder": row["folder"], "basename": row["basename"]}
+    record.update(row["files"])
+    for slot, size in row["image_sizes"].items():
+        record[f"{slot}_size"] = f"{size[0]}x{size[1]}" if size else ""
+    record["codes"] = ";".join(row["codes"])
+    return record
+
+
+def write_report(rows: Iterable[dict], out: TextIO, fmt: str) -> int:
+    """Write rows as CSV (one column per file / image size, codes joined with ';') or JSON Lines.
+
+    Rows are written as they come; returns how many were written.
+    """
+
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, restval="")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(_csv_record(row))
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+            count += 1
+    return count
+
+
+def export_report(path: Path, rows: Iterable[dict], fmt: str | None = None) -> int:
+    """write_report() into a file; the format defaults to the one implied by its name."""
+
+    fmt = fmt or report_format_for(path)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return write_report(rows, f, fmt)
+
+
+def analyze_library(
+    root: Path,
+    config: AppConfig,
+    *,
+    include_json_checks: bool = False,
+    cache: AnalysisCache | None = None,
+    image_size: Callable[[Path], tuple[int, int] | None] | None = None,
+) -> Iterator[tuple[str, GameAssets, int]]:
+    """Scan `root` and yield (game id, game, warning mask) per game, like Analyze in the app.
+
+    Uses the library's scan snapshot when the config enables it. With a
+    `cache`, image sizes and JSON facts come from it and new rows are saved
+    as the games go by; the caller closes it. `image_size` overrides where
+    sizes come from.
+    """
+
+    snapshot = ScanSnapshot.open(root) if bool(getattr(config, "scan_cache", True)) else None
+    scan = scan_folder(
+        root,
+        palette_exts=set(config.palette_extensions or []),
+        workers=config.scan_workers,
+        snapshot=snapshot,
+    )
+    if snapshot is not None:
+        snapshot.save()
+
+    if image_size is None:
+        image_size = cache.image_size if cache is not None else get_image_size
+    json_facts = cache.json_facts if cache is not None else read_json_facts
+    helper_paths = HelperPathIndex.build(root, scan.palette_files, scan.keyboard_files)
+    rules = select_rules(include_json_checks=include_json_checks)
+    for i, (game_id, game) in enumerate(scan.games.items(), 1):
+        ctx = WarningContext(
+            game,
+            config,
+            root=root,
+            image_size=image_size,
+            json_facts=json_facts,
+            path_exists=helper_paths.exists,
+        )
+        yield game_id, game, evaluate_rules(rules, ctx)
+        if cache is not None and i % _SAVE_EVERY == 0:
+            cache.save()
+    if cache is not None:
+        cache.save()
+
+
+def main(argv: list[str] | None = None, *, default_config: Path | None = None) -> int:
+    """Headless analysis export: `SprintGameManager export-analysis <games folder> [-o report.csv]`.
+
+    Settings come from --config, else `default_config` (the app's sgm.ini),
+    else ./sgm.ini if present.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="export-analysis",
+        description="Analyze a games folder and write one row per game (files, image sizes, warning codes).",
+    )
+    parser.add_argument("folder", type=Path, help="games folder")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: standard output)")
+    parser.add_argument(
+        "-f", "--format", choices=REPORT_FORMATS, help="csv or jsonl (default: from the output name, else csv)"
+    )
+    parser.add_argument(
+        "--json-checks", action="store_true", help="also check metadata JSON (like 'Include JSON Checks')"
+    )
+    parser.add_argument(
+        "--config", type=Path, help="sgm.ini to read settings from (default: the one the app uses, if any)"
+    )
+    args = parser.parse_args(argv)
+
+    root: Path = args.folder.resolve()
+    if not root.is_dir():
+        print(f"Not a folder: {args.folder}", file=sys.stderr)
+        return 2
+
+    config_path: Path | None = args.config or default_config
+    if config_path is None and (Path.cwd() / "sgm.ini").exists():
+        config_path = Path.cwd() / "sgm.ini"
+    config = AppConfig.load(config_path) if config_path is not None else AppConfig.defaults()
+
+    cache = AnalysisCache.open(root) if bool(getattr(config, "analysis_cache", True)) else None
+    if cache is not None:
+        image_size = cache.image_size
+    else:
+        # A game's row is built right after its rules ran: reuse the sizes they read.
+        image_size = lru_cache(maxsize=_SIZE_MEMO)(get_image_size)
+    try:
+        rows = iter_report_rows(
+            analyze_library(root, config, include_json_checks=args.json_checks, cache=cache, image_size=image_size),
+            root=root,
+            image_size=image_size,
+        )
+        fmt = args.format or (report_format_for(args.output) if args.output != "-" else "csv")
+        if args.output == "-":
+            count = write_report(rows, sys.stdout, fmt)
+        else:
+            count = export_report(Path(args.output), rows, fmt)
+    finally:
+        if cache is not None:
+            cache.save()
+            cache.close()
+    print(f"Exported {count} games", file=sys.stderr)
+    return 0
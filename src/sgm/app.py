@@ -4,10 +4,11 @@ import os
 import sys
 from pathlib import Path
 
-from PySide6.QtCore import QStandardPaths
+from PySide6.QtCore import QCoreApplication, QStandardPaths
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication
 
+from sgm.analysis_report import main as export_analysis_main
 from sgm.config import AppConfig
 from sgm.resources import resource_path
 from sgm.ui.main_window import MainWindow
@@ -33,17 +34,28 @@ def _app_config_path() -> Path:
     return cfg_dir / "sgm.ini"
 
 
-def _load_config() -> tuple[AppConfig, Path]:
-    local_cfg = Path.cwd() / "sgm.ini"
-    app_cfg = _app_config_path()
+def _existing_config_path() -> Path | None:
+    """The sgm.ini to read, if one exists (see _load_config)."""
 
     # Prefer existing local config to preserve current Windows behavior.
+    local_cfg = Path.cwd() / "sgm.ini"
     if local_cfg.exists():
-        return (AppConfig.load_or_create(local_cfg), local_cfg)
+        return local_cfg
 
     # Next prefer existing per-user app config (useful for macOS .app launches).
+    app_cfg = _app_config_path()
     if app_cfg.exists():
-        return (AppConfig.load_or_create(app_cfg), app_cfg)
+        return app_cfg
+    return None
+
+
+def _load_config() -> tuple[AppConfig, Path]:
+    local_cfg = Path.cwd() / "sgm.ini"
+    app_cfg = _app_config_path()
+
+    existing = _existing_config_path()
+    if existing is not None:
+        return (AppConfig.load_or_create(existing), existing)
 
     # Neither exists: attempt to create/populate local first.
     try:
@@ -57,6 +69,12 @@ def _load_config() -> tuple[AppConfig, Path]:
 
 
 def main() -> int:
+    # Headless: `export-analysis <games folder> ...` writes the analysis report without opening a window.
+    if len(sys.argv) > 1 and sys.argv[1] == "export-analysis":
+        # Same settings file as the app (the per-user location depends on the app name).
+        QCoreApplication.setApplicationName(APP_NAME)
+        return export_analysis_main(sys.argv[2:], default_config=_existing_config_path())
+
     if os.name == "nt" and not os.environ.get("QT_QPA_FONTDIR"):
         windir = Path(os.environ.get("WINDIR", r"C:\Windows"))
         fonts_dir = windir / "Fonts"
@@ -64,6 +64,27 @@ class AppConfig:
     # Example: ".txt|.cfg|.pal"
     palette_extensions: list[str] = None  # populated in defaults()
 
+    # Number of threads used to list folders while scanning the games folder.
+    # 1 scans one folder at a time; higher values help on network shares.
+    scan_workers: int = 4
+
+    # If True: remember folder listings in <games folder>/.sgm/scan.db so
+    # unchanged folders are not read again on the next scan.
+    scan_cache: bool = True
+
+    # If True: remember image sizes and metadata JSON facts in
+    # <games folder>/.sgm/analysis.db so Analyze skips unchanged files.
+    analysis_cache: bool = True
+
+    # If True: keep image card thumbnails in <games folder>/.sgm/thumbs
+    # (at most thumbnail_cache_mb megabytes) so images are not decoded again.
+    thumbnail_cache: bool = True
+    thumbnail_cache_mb: int = 64
+
+    # If True: watch the games folder and update changed games in place
+    # (including changes made by other programs).
+    watch_game_folder: bool = True
+
     metadata_editors: list[str] = None  # populated in defaults()
 
     # Used by Bulk JSON Update dialog to offer common JSON keys.
@@ -131,6 +152,12 @@ class AppConfig:
             "ConfirmImageOverwrite": "True" if cfg.confirm_image_overwrite else "False",
             "JzIntvMediaPrefix": (cfg.jzintv_media_prefix or "/media/usb0").strip() or "/media/usb0",
             "PaletteExtensions": "|".join(_normalize_extensions(cfg.palette_extensions or [])),
+            "ScanWorkers": str(int(cfg.scan_workers)),
+            "ScanCache": "True" if cfg.scan_cache else "False",
+            "AnalysisCache": "True" if cfg.analysis_cache else "False",
+            "ThumbnailCache": "True" if cfg.thumbnail_cache else "False",
+            "ThumbnailCacheMB": str(int(cfg.thumbnail_cache_mb)),
+            "WatchGameFolder": "True" if cfg.watch_game_folder else "False",
             "MetadataEditors": "|".join(editors_clean),
             "JsonKeys": "|".join(json_keys_clean),
         }
@@ -286,6 +313,14 @@ class AppConfig:
             _parse_string_list(data.get("PaletteExtensions"), default=cfg.palette_extensions)
         )
 
+        cfg.scan_workers = _parse_int(data.get("ScanWorkers"), default=cfg.scan_workers)
+        cfg.scan_workers = max(1, min(32, cfg.scan_workers))
+        cfg.scan_cache = _parse_bool(data.get("ScanCache"), default=cfg.scan_cache)
+        cfg.analysis_cache = _parse_bool(data.get("AnalysisCache"), default=cfg.analysis_cache)
+        cfg.thumbnail_cache = _parse_bool(data.get("ThumbnailCache"), default=cfg.thumbnail_cache)
+        cfg.thumbnail_cache_mb = max(0, _parse_int(data.get("ThumbnailCacheMB"), default=cfg.thumbnail_cache_mb))
+        cfg.watch_game_folder = _parse_bool(data.get("WatchGameFolder"), default=cfg.watch_game_folder)
+
         cfg.metadata_editors = _parse_string_list(
             data.get("MetadataEditors"),
             default=cfg.metadata_editors,
@@ -1,57 +1,202 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import os
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 
 
 ROM_EXTS = {".int", ".bin", ".rom"}
 
 
-@dataclass
+@dataclass(frozen=True)
+class AssetKind:
+    """One kind of game file: how it is recognized and how it is named.
+
+    A file belongs to this kind if its extension is in `exts` and its stem
+    ends with `suffix` (case-insensitive); the rest of the stem is the game's
+    basename. `template` builds the file name for a basename; `{ext}` is the
+    file's current extension.
+    """
+
+    slot: str
+    exts: frozenset[str]
+    suffix: str
+    template: str
+    # False for ROM/CFG, which do not apply to folders.
+    folder_asset: bool = True
+
+    def build_name(self, basename: str, ext: str) -> str:
+        return self.template.format(basename=basename, ext=ext)
+
+
+_PNG = frozenset({".png"})
+
+# The asset kinds, in GameAssets slot order. Add new kinds here.
+ASSET_KINDS: tuple[AssetKind, ...] = (
+    AssetKind("rom", frozenset(ROM_EXTS), "", "{basename}{ext}", folder_asset=False),
+    AssetKind("config", frozenset({".cfg"}), "", "{basename}.cfg", folder_asset=False),
+    AssetKind("metadata", frozenset({".json"}), "", "{basename}.json"),
+    # A .png with no recognized suffix is box art.
+    AssetKind("box", _PNG, "", "{basename}.png"),
+    AssetKind("box_small", _PNG, "_small", "{basename}_small.png"),
+    AssetKind("overlay", _PNG, "_overlay", "{basename}_overlay.png"),
+    AssetKind("overlay2", _PNG, "_overlay2", "{basename}_overlay2.png"),
+    AssetKind("overlay3", _PNG, "_overlay3", "{basename}_overlay3.png"),
+    AssetKind("overlay_big", _PNG, "_big_overlay", "{basename}_big_overlay.png"),
+    AssetKind("qrcode", _PNG, "_qrcode", "{basename}_qrcode.png"),
+    AssetKind("snap1", _PNG, "_snap1", "{basename}_snap1.png"),
+    AssetKind("snap2", _PNG, "_snap2", "{basename}_snap2.png"),
+    AssetKind("snap3", _PNG, "_snap3", "{basename}_snap3.png"),
+)
+
+ASSET_KIND_BY_SLOT: dict[str, AssetKind] = {k.slot: k for k in ASSET_KINDS}
+_SLOT_INDEX: dict[str, int] = {k.slot: i for i, k in enumerate(ASSET_KINDS)}
+
+
+class _AssetSlot:
+    """A GameAssets slot: reads and writes the slot's Path (or None)."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.index = _SLOT_INDEX[name]
+
+    def __get__(self, obj: GameAssets | None, objtype: type | None = None) -> Path | None:
+        if obj is None:
+            return self  # type: ignore[return-value]
+        return obj._get(self.index)
+
+    def __set__(self, obj: GameAssets, value: Path | None) -> None:
+        obj._set(self.index, value)
+
+
 class GameAssets:
-    basename: str
-    folder: Path
+    """The files of one game (or the support files next to a folder).
 
-    rom: Path | None = None
-    config: Path | None = None
-    metadata: Path | None = None
+    Libraries can hold tens of thousands of games, so this is kept compact:
+    the folder is stored once, present slots are bits in `_mask`, and a file
+    name is only stored when it differs from the kind's usual name for
+    `basename` (e.g. ROMs, whose extension varies, or odd letter case). Slot
+    attributes build their Path on access. `basename` and `folder` must not
+    change after construction.
+    """
 
-    box: Path | None = None
-    box_small: Path | None = None
-    overlay: Path | None = None
-    overlay2: Path | None = None
-    overlay3: Path | None = None
-    overlay_big: Path | None = None
-    qrcode: Path | None = None
+    __slots__ = ("basename", "folder", "other", "_mask", "_names")
 
-    snap1: Path | None = None
-    snap2: Path | None = None
-    snap3: Path | None = None
+    rom = _AssetSlot()
+    config = _AssetSlot()
+    metadata = _AssetSlot()
 
-    other: list[Path] = field(default_factory=list)
+    box = _AssetSlot()
+    box_small = _AssetSlot()
+    overlay = _AssetSlot()
+    overlay2 = _AssetSlot()
+    overlay3 = _AssetSlot()
+    overlay_big = _AssetSlot()
+    qrcode = _AssetSlot()
+
+    snap1 = _AssetSlot()
+    snap2 = _AssetSlot()
+    snap3 = _AssetSlot()
+
+    def __init__(self, basename: str, folder: Path, *, other: Iterable[Path] = (), **paths: Path | None):
+        self.basename = basename
+        self.folder = folder
+        self.other: tuple[Path, ...] = tuple(other)
+        self._mask = 0
+        # (slot index, file name or full Path), sorted by index.
+        self._names: tuple[tuple[int, str | Path], ...] = ()
+        for slot, path in paths.items():
+            if slot not in _SLOT_INDEX:
+                raise TypeError(f"GameAssets() got an unexpected keyword argument {slot!r}")
+            self._set(_SLOT_INDEX[slot], path)
 
     def all_paths(self) -> list[Path]:
         paths: list[Path] = []
-        for p in [
-            self.rom,
-            self.config,
-            self.metadata,
-            self.box,
-            self.box_small,
-            self.overlay,
-            self.overlay2,
-            self.overlay3,
-            self.overlay_big,
-            self.qrcode,
-            self.snap1,
-            self.snap2,
-            self.snap3,
-        ]:
+        for i in range(len(ASSET_KINDS)):
+            p = self._get(i)
             if p is not None:
                 paths.append(p)
         paths.extend(self.other)
         return paths
 
+    def all_path_strs(self) -> list[str]:
+        """all_paths() as strings, without building Path objects (for bulk os.stat calls)."""
+
+        folder = str(self.folder)
+        stored = dict(self._names)
+        strs: list[str] = []
+        for i, kind in enumerate(ASSET_KINDS):
+            if not self._mask >> i & 1:
+                continue
+            name = stored.get(i)
+            if name is None:
+                strs.append(os.path.join(folder, kind.build_name(self.basename, "")))
+            elif isinstance(name, Path):
+                strs.append(str(name))
+            else:
+                strs.append(os.path.join(folder, name))
+        strs.extend(str(p) for p in self.other)
+        return strs
+
+    def assign(self, kind: AssetKind, name: str) -> None:
+        """Store file `name` (inside `folder`) in the slot of its asset kind."""
+
+        i = _SLOT_INDEX[kind.slot]
+        if kind.slot == "rom" and self._mask >> i & 1:
+            current = self._get(i)
+            assert current is not None
+            if choose_rom(current, self.folder / name) == current:
+                return
+        self._store(i, name)
+
+    def _get(self, i: int) -> Path | None:
+        if not self._mask >> i & 1:
+            return None
+        for j, name in self._names:
+            if j == i:
+                return name if isinstance(name, Path) else self.folder / name
+        return self.folder / ASSET_KINDS[i].build_name(self.basename, "")
+
+    def _set(self, i: int, value: Path | None) -> None:
+        if value is None:
+            self._mask &= ~(1 << i)
+            self._names = tuple(item for item in self._names if item[0] != i)
+            return
+        value = Path(value)
+        self._store(i, value.name if value.parent == self.folder else value)
+
+    def _store(self, i: int, name: str | Path) -> None:
+        self._mask |= 1 << i
+        names = [item for item in self._names if item[0] != i]
+        kind = ASSET_KINDS[i]
+        if isinstance(name, Path) or "{ext}" in kind.template or name != kind.build_name(self.basename, ""):
+            names.append((i, name))
+            names.sort(key=lambda item: item[0])
+        self._names = tuple(names)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GameAssets):
+            return NotImplemented
+        return (
+            self.basename == other.basename
+            and self.folder == other.folder
+            and self._mask == other._mask
+            and self._names == other._names
+            and self.other == other.other
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        parts = [f"basename={self.basename!r}", f"folder={self.folder!r}"]
+        for i, kind in enumerate(ASSET_KINDS):
+            p = self._get(i)
+            if p is not None:
+                parts.append(f"{kind.slot}={p!r}")
+        if self.other:
+            parts.append(f"other={list(self.other)!r}")
+        return f"GameAssets({', '.join(parts)})"
+
 
 def choose_rom(current: Path | None, candidate: Path) -> Path:
     if current is None:
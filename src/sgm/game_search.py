@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sgm.sprint_fs import sprint_name_key
+
+
+# Joins a game's keys; a query word never contains it, so words cannot match across keys.
+_SEP = "\n"
+
+
+def search_terms(query: str | None) -> tuple[str, ...]:
+    """The words of a search query, compared with sprint_name_key()."""
+
+    return tuple(sprint_name_key(query).split())
+
+
+class GameSearchIndex:
+    """Casefolded search keys per game: basename, metadata name and folder path.
+
+    A query matches a game when each of its words occurs in one of the keys.
+    The keys are built once per game, so a search is substring tests over
+    in-memory strings; a query that extends the previous one (more letters,
+    more words) only re-checks the games that matched it.
+    """
+
+    def __init__(self):
+        # Game id -> [basename, metadata name, folder] keys.
+        self._parts: dict[str, list[str]] = {}
+        self._keys: dict[str, str] = {}
+        # Games whose metadata name is not known (yet, or any more).
+        self._unnamed: set[str] = set()
+        self._last: tuple[tuple[str, ...], set[str]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._keys
+
+    def game_ids(self) -> list[str]:
+        return list(self._keys)
+
+    def clear(self) -> None:
+        self._parts.clear()
+        self._keys.clear()
+        self._unnamed.clear()
+        self._last = None
+
+    def set_game(self, game_id: str, *, basename: str, folder: str) -> None:
+        """Add or update a game; a metadata name set before is kept."""
+
+        parts = self._parts.get(game_id)
+        if parts is None:
+            self._unnamed.add(game_id)
+        name = parts[1] if parts is not None else ""
+        parts = [sprint_name_key(basename), name, sprint_name_key(folder)]
+        self._parts[game_id] = parts
+        self._keys[game_id] = _SEP.join(parts)
+        self._last = None
+
+    def set_name(self, game_id: str, name: str | None) -> None:
+        """Set a game's metadata name (None or "" if it has none)."""
+
+        parts = self._parts.get(game_id)
+        if parts is None:
+            return
+        parts[1] = sprint_name_key(name)
+        self._keys[game_id] = _SEP.join(parts)
+        self._unnamed.discard(game_id)
+        self._last = None
+
+    def unnamed(self) -> list[str]:
+        """The games whose metadata name still has to be set."""
+        return list(self._unnamed)
+
+    def forget_names(self, game_ids: Iterable[str]) -> None:
+        """Mark names as needing to be read again; the old ones still match meanwhile."""
+        self._unnamed.update(gid for gid in game_ids if gid in self._keys)
+
+    def remove(self, game_ids: Iterable[str]) -> None:
+        for gid in game_ids:
+            self._parts.pop(gid, None)
+            self._keys.pop(gid, None)
+            self._unnamed.discard(gid)
+        self._last = None
+
+    def matches(self, game_id: str, query: str | None) -> bool:
+        key = self._keys.get(game_id)
+        return key is not None and all(t in key for t in search_terms(query))
+
+    def search(self, query: str | None) -> set[str] | None:
+        """The ids of the games matching `query`; None for a blank query (no filtering)."""
+
+        terms = search_terms(query)
+        if not terms:
+            return None
+        keys = self._keys
+        last = self._last
+        if last is not None and all(any(old in t for t in terms) for old in last[0]):
+            # Every old word is part of a new one: the matches can only shrink.
+            found, rest = last[1], terms
+        else:
+            found, rest = {gid for gid, key in keys.items() if terms[0] in key}, terms[1:]
+        for t in rest:
+            found = {gid for gid in found if t in keys[gid]}
+        self._last = (terms, found)
+        return set(found)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import shlex
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Iterable
+
+from sgm.sprint_fs import sprint_name_key
+
+
+DEFAULT_MEDIA_PREFIX = "/media/usb0"
+
+# The jzintv_extra flags that point at helper files: (name, prefix).
+HELPER_FLAGS: tuple[tuple[str, str], ...] = (
+    ("kbdhackfile", "--kbdhackfile="),
+    ("gfx-palette", "--gfx-palette="),
+)
+
+
+def strip_wrapping_quotes(s: str) -> str:
+    s = (s or "").strip()
+    if len(s) >= 2 and ((s[0] == s[-1] == '"') or (s[0] == s[-1] == "'")):
+        return s[1:-1]
+    return s
+
+
+def split_flags(value: str) -> list[str]:
+    s = (value or "").strip()
+    if not s:
+        return []
+    try:
+        return shlex.split(s, posix=True)
+    except Exception:
+        return [t for t in s.split(" ") if t.strip()]
+
+
+def find_equals_flag_value(tokens: list[str], flag_prefix: str) -> str | None:
+    for t in tokens:
+        if t.startswith(flag_prefix):
+            return t[len(flag_prefix) :]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def extra_flag_value(extra: str, flag_prefix: str) -> str | None:
+    """find_equals_flag_value over a jzintv_extra string; many games share the same one."""
+
+    return find_equals_flag_value(split_flags(extra), flag_prefix)
+
+
+def normalize_media_prefix(prefix: str | None) -> str:
+    s = (prefix or "").strip() or DEFAULT_MEDIA_PREFIX
+    s = s.rstrip("/")
+    return s or DEFAULT_MEDIA_PREFIX
+
+
+def device_to_local_path(*, root: Path, device_path: str, media_prefix: str) -> Path | None:
+    s = strip_wrapping_quotes(device_path)
+    prefix = normalize_media_prefix(media_prefix)
+    if s == prefix:
+        return root
+    if s.startswith(prefix + "/"):
+        rel = s[len(prefix) + 1 :]
+        if rel:
+            return root / Path(PurePosixPath(rel))
+        return root
+    return None
+
+
+def flag_target_path(value: str, *, root: Path, media_prefix: str) -> Path:
+    """The local file a jzintv flag value points at: mapped from the device media prefix, else the value as is."""
+
+    local = device_to_local_path(root=root, device_path=value, media_prefix=media_prefix)
+    return local if local is not None else Path(strip_wrapping_quotes(value))
+
+
+def _path_key(path: str | Path) -> str:
+    return os.path.normcase(os.path.normpath(str(path)))
+
+
+class HelperPathIndex:
+    """Answers "does this jzintv helper file exist?" for jzintv_extra flag targets.
+
+    Most games point their --kbdhackfile / --gfx-palette flags at the same
+    few palette and keyboard files, which the scan already found. Those,
+    plus one listing of the library root, are answered from memory; any
+    other path is checked on disk once. A path that only differs in case
+    from a known one is checked on disk too, so the answer follows the
+    file system (case-insensitive on Windows and macOS) like Path.exists().
+
+    Every answer, including "missing", is remembered for the life of the
+    index: build a new one when the library's files change (MainWindow
+    drops it on each rescan and watcher update).
+    """
+
+    def __init__(self, root: Path, files: Iterable[Path], root_names: Iterable[str] | None = None):
+        self.root = root
+        self._known: dict[str, bool] = {_path_key(p): True for p in files}
+        # With a listing of the root, a name directly under it that is not listed
+        # in any case does not exist.
+        self._root_key = _path_key(root) if root_names is not None else None
+        self._root_names: set[str] = set()
+        for name in root_names or ():
+            self._known[_path_key(root / name)] = True
+            self._root_names.add(sprint_name_key(name))
+
+    @staticmethod
+    def build(root: Path, palette_files: Iterable[Path], keyboard_files: Iterable[Path]) -> "HelperPathIndex":
+        names: list[str] | None
+        try:
+            with os.scandir(root) as it:
+                names = [e.name for e in it]
+        except OSError:
+            names = None
+        return HelperPathIndex(root, [*palette_files, *keyboard_files], names)
+
+    @staticmethod
+    def key(path: str | Path) -> str:
+        """A normalized form of `path`; equal keys mean the same file."""
+        return _path_key(path)
+
+    def exists(self, path: str | Path) -> bool:
+        key = _path_key(path)
+        found = self._known.get(key)
+        if (
+            found is None
+            and os.path.dirname(key) == self._root_key
+            and sprint_name_key(os.path.basename(key)) not in self._root_names
+        ):
+            found = False
+        if found is None:
+            try:
+                found = os.path.exists(key)
+            except Exception:
+                found = False
+            self._known[key] = found
+        return found
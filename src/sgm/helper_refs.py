@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Mapping
+
+from sgm.domain import GameAssets
+from sgm.helper_paths import HELPER_FLAGS, HelperPathIndex, extra_flag_value, flag_target_path
+from sgm.sprint_fs import sprint_name_key
+
+
+@dataclass(frozen=True)
+class HelperReference:
+    """One --kbdhackfile / --gfx-palette flag in a game's jzintv_extra."""
+
+    game_id: str
+    flag: str
+    # As written in jzintv_extra.
+    value: str
+    # The local file it points at; None for an empty value.
+    path: Path | None
+    exists: bool
+
+
+@dataclass
+class HelperReferenceReport:
+    """Which games use which palette and keyboard files.
+
+    `users` maps each referenced file to the references pointing at it,
+    `unused` lists the scanned helper files nothing points at and `dangling`
+    the references whose file does not exist.
+    """
+
+    root: Path
+    references: list[HelperReference] = field(default_factory=list)
+    users: dict[Path, list[HelperReference]] = field(default_factory=dict)
+    unused: list[Path] = field(default_factory=list)
+    dangling: list[HelperReference] = field(default_factory=list)
+    # Helper file -> "palette" or "keyboard".
+    kinds: dict[Path, str] = field(default_factory=dict)
+
+    def rel_path(self, p: Path | None) -> str | None:
+        """`p` relative to the library root, as a POSIX string."""
+        if p is None:
+            return None
+        try:
+            return p.relative_to(self.root).as_posix()
+        except Exception:
+            return str(p)
+
+    def to_json(self) -> dict:
+        """The report as plain JSON data (paths relative to the library root where possible)."""
+
+        def ref(r: HelperReference) -> dict:
+            return {"game": r.game_id, "flag": r.flag, "value": r.value, "path": self.rel_path(r.path), "exists": r.exists}
+
+        return {
+            "root": str(self.root),
+            "helper_files": [
+                {"path": self.rel_path(p), "kind": self.kinds.get(p, ""), "games": sorted({r.game_id for r in refs})}
+                for p, refs in self.users.items()
+            ],
+            "unused": [{"path": self.rel_path(p), "kind": self.kinds.get(p, "")} for p in self.unused],
+            "dangling": [ref(r) for r in self.dangling],
+            "references": [ref(r) for r in self.references],
+        }
+
+
+def build_helper_reference_report(
+    games: Mapping[str, GameAssets],
+    *,
+    root: Path,
+    palette_files: list[Path],
+    keyboard_files: list[Path],
+    media_prefix: str,
+    json_facts: Callable[[Path], dict | None],
+    helper_paths: HelperPathIndex | None = None,
+) -> HelperReferenceReport:
+    """Resolve every game's helper-file flags in one pass.
+
+    Metadata comes from `json_facts` (the analysis cache in the app), so
+    files already parsed by Analyze are not read again.
+    """
+
+    if helper_paths is None:
+        helper_paths = HelperPathIndex.build(root, palette_files, keyboard_files)
+
+    report = HelperReferenceReport(root=root)
+    by_key: dict[str, Path] = {}
+    # For flags that differ in case from the file's name (found on case-insensitive file systems).
+    by_folded_key: dict[str, Path] = {}
+    for kind, files in (("palette", palette_files), ("keyboard", keyboard_files)):
+        for p in files:
+            by_key.setdefault(HelperPathIndex.key(p), p)
+            by_folded_key.setdefault(sprint_name_key(HelperPathIndex.key(p)), p)
+            report.kinds.setdefault(p, kind)
+    users: dict[Path, list[HelperReference]] = {}
+
+    for game_id, game in games.items():
+        if game.metadata is None:
+            continue
+        data = json_facts(game.metadata)
+        if not data:
+            continue
+        extra = data.get("jzintv_extra")
+        extra_s = ("" if extra is None else str(extra)).strip()
+        if not extra_s:
+            continue
+        for flag, prefix in HELPER_FLAGS:
+            value = extra_flag_value(extra_s, prefix)
+            if value is None:
+                continue
+            path: Path | None = None
+            exists = False
+            if value.strip():
+                try:
+                    path = flag_target_path(value, root=root, media_prefix=media_prefix)
+                    exists = helper_paths.exists(path)
+                except Exception:
+                    exists = False
+            r = HelperReference(game_id=game_id, flag=flag, value=value, path=path, exists=exists)
+            report.references.append(r)
+            if not exists or path is None:
+                report.dangling.append(r)
+                continue
+            # Files that exist but were not scanned as helpers (other extensions) are listed too.
+            key = HelperPathIndex.key(path)
+            target = by_key.get(key) or by_folded_key.get(sprint_name_key(key), path)
+            users.setdefault(target, []).append(r)
+
+    report.users = dict(sorted(users.items(), key=lambda kv: str(kv[0]).casefold()))
+    report.unused = sorted((p for p in by_key.values() if p not in users), key=lambda p: str(p).casefold())
+    return report
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import struct
+import zlib
 from pathlib import Path
+from typing import Iterable
 
 import qrcode
 from PIL import Image
@@ -115,7 +118,38 @@ def build_overlay_png_from_file(
         raise ImageProcessError(str(e))
 
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Signature (8) + IHDR length/type (8) + width/height (8) + rest of IHDR (5) + CRC (4).
+_PNG_HEADER_LEN = 33
+
+
+def probe_png_size(path: Path) -> tuple[int, int] | None:
+    """Read a PNG's size from its IHDR chunk without decoding anything.
+
+    Returns None if the file is not a PNG or its header is malformed; callers
+    should then fall back to Pillow (see get_image_size).
+    """
+
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_PNG_HEADER_LEN)
+    except OSError:
+        return None
+    if len(head) < _PNG_HEADER_LEN or head[:8] != _PNG_SIGNATURE or head[8:16] != b"\x00\x00\x00\rIHDR":
+        return None
+    # Pillow rejects a bad IHDR CRC, so let it decide about those files.
+    if zlib.crc32(head[12:29]) != struct.unpack(">I", head[29:33])[0]:
+        return None
+    width, height = struct.unpack(">II", head[16:24])
+    if width == 0 or height == 0:
+        return None
+    return width, height
+
+
 def get_image_size(path: Path) -> tuple[int, int] | None:
+    size = probe_png_size(path)
+    if size is not None:
+        return size
     try:
         with Image.open(path) as img:
             return img.size
@@ -123,6 +157,16 @@ def get_image_size(path: Path) -> tuple[int, int] | None:
         return None
 
 
+def get_image_sizes(paths: Iterable[Path | None]) -> dict[Path, tuple[int, int] | None]:
+    """get_image_size for many files at once; None entries are skipped."""
+
+    sizes: dict[Path, tuple[int, int] | None] = {}
+    for p in paths:
+        if p is not None and p not in sizes:
+            sizes[p] = get_image_size(p)
+    return sizes
+
+
 def save_png_resized_from_file(src: Path, dest: Path, *, expected: Resolution) -> None:
     try:
         with Image.open(src) as img:
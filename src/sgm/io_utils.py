@@ -4,6 +4,7 @@ import shutil
 import uuid
 from pathlib import Path
 
+from sgm.domain import ASSET_KIND_BY_SLOT
 from sgm.scanner import _classify
 from sgm.sprint_fs import sprint_path_key
 
@@ -129,30 +130,7 @@ def swap_files(a: Path, b: Path) -> None:
 
 
 def _build_name(new_basename: str, old_path: Path, kind: str) -> str:
-    suffix = old_path.suffix
-
-    if kind == "rom":
-        return new_basename + suffix
-    if kind == "config":
-        return new_basename + ".cfg"
-    if kind == "metadata":
-        return new_basename + ".json"
-    if kind == "box":
-        return new_basename + ".png"
-    if kind == "box_small":
-        return new_basename + "_small.png"
-    if kind == "overlay":
-        return new_basename + "_overlay.png"
-    if kind == "overlay2":
-        return new_basename + "_overlay2.png"
-    if kind == "overlay3":
-        return new_basename + "_overlay3.png"
-    if kind == "overlay_big":
-        return new_basename + "_big_overlay.png"
-    if kind == "qrcode":
-        return new_basename + "_qrcode.png"
-    if kind in {"snap1", "snap2", "snap3"}:
-        n = kind[-1]
-        return new_basename + f"_snap{n}.png"
-
-    return new_basename + suffix
+    spec = ASSET_KIND_BY_SLOT.get(kind)
+    if spec is None:
+        return new_basename + old_path.suffix
+    return spec.build_name(new_basename, old_path.suffix)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+SNAPSHOT_DIR_NAME = ".sgm"
+SNAPSHOT_FILE_NAME = "scan.db"
+SNAPSHOT_VERSION = 1
+
+# Directory mtimes can have coarse resolution (FAT: 2s, some network shares: 1s).
+# A listing taken within this window of the directory's mtime may have missed a
+# change that landed in the same tick, so it is not trusted on the next scan.
+RACY_WINDOW_NS = 3_000_000_000
+
+
+@dataclass
+class SnapshotEntry:
+    mtime_ns: int
+    listed_ns: int
+    subdirs: list[tuple[str, bool]]
+    files: list[str]
+
+    # In-memory only: per-scan-mode results derived from this listing.
+    memo: dict = field(default_factory=dict)
+
+
+class ScanSnapshot:
+    """Per-library cache of directory listings keyed by directory mtime.
+
+    Stored in `<root>/.sgm/scan.db`. A directory whose mtime still matches
+    its recorded listing is not listed again; adding, removing or renaming an
+    entry always bumps the directory's mtime.
+
+    All rows are loaded on open and lookups are served from memory, so the
+    snapshot can be read from the scanner's worker threads. Writes go back to
+    disk only in save(), which must be called from the owning thread.
+    """
+
+    def __init__(self, root: Path, *, db_path: Path | None = None):
+        self.root = root
+        self.db_path = db_path
+        self._entries: dict[str, SnapshotEntry] = {}
+        self._dirty: set[str] = set()
+        self._seen: set[str] = set()
+        # Directories read from disk (snapshot misses) since begin_scan().
+        self._listed: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path(root: Path) -> Path:
+        return root / SNAPSHOT_DIR_NAME / SNAPSHOT_FILE_NAME
+
+    @staticmethod
+    def open(root: Path) -> "ScanSnapshot":
+        snap = ScanSnapshot(root, db_path=ScanSnapshot.default_path(root))
+        snap._load()
+        return snap
+
+    def _connect(self) -> sqlite3.Connection:
+        assert self.db_path is not None
+        con = sqlite3.connect(str(self.db_path))
+        con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, listed_ns INTEGER, subdirs TEXT, files TEXT)"
+        )
+        return con
+
+    def _load(self) -> None:
+        if self.db_path is None or not self.db_path.exists():
+            return
+        try:
+            con = sqlite3.connect(str(self.db_path))
+            try:
+                row = con.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                if row is None or str(row[0]) != str(SNAPSHOT_VERSION):
+                    return
+                for rel, mtime_ns, listed_ns, subdirs, files in con.execute(
+                    "SELECT path, mtime_ns, listed_ns, subdirs, files FROM dirs"
+                ):
+                    self._entries[str(rel)] = SnapshotEntry(
+                        mtime_ns=int(mtime_ns),
+                        listed_ns=int(listed_ns),
+                        subdirs=[(str(n), bool(h)) for n, h in json.loads(subdirs)],
+                        files=[str(n) for n in json.loads(files)],
+                    )
+            finally:
+                con.close()
+        except Exception:
+            # A corrupt or foreign file is treated as an empty snapshot.
+            self._entries = {}
+
+    def _key(self, path: Path) -> str:
+        try:
+            rel = path.relative_to(self.root)
+        except Exception:
+            return path.as_posix()
+        return rel.as_posix()
+
+    def begin_scan(self) -> None:
+        """Start tracking which directories a full scan visits (for pruning)."""
+        with self._lock:
+            self._seen = set()
+            self._listed = set()
+
+    def get(self, path: Path, mtime_ns: int) -> SnapshotEntry | None:
+        key = self._key(path)
+        with self._lock:
+            self._seen.add(key)
+            entry = self._entries.get(key)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            return None
+        if entry.listed_ns - entry.mtime_ns < RACY_WINDOW_NS:
+            return None
+        return entry
+
+    def put(self, path: Path, mtime_ns: int, subdirs: list[tuple[str, bool]], files: list[str]) -> SnapshotEntry:
+        key = self._key(path)
+        entry = SnapshotEntry(mtime_ns=mtime_ns, listed_ns=time.time_ns(), subdirs=list(subdirs), files=list(files))
+        with self._lock:
+            self._seen.add(key)
+            self._listed.add(key)
+            self._entries[key] = entry
+            self._dirty.add(key)
+        return entry
+
+    def listed_dirs(self) -> list[Path]:
+        """The directories read from disk (not served from the snapshot) since begin_scan()."""
+        with self._lock:
+            return [self.root / key for key in self._listed]
+
+    def save(self, *, prune: bool = True) -> None:
+        """Write changed rows; with prune=True drop directories the last scan did not visit."""
+
+        with self._lock:
+            dirty = {k: self._entries[k] for k in self._dirty if k in self._entries}
+            removed: list[str] = []
+            if prune and self._seen:
+                removed = [k for k in self._entries if k not in self._seen]
+                for k in removed:
+                    self._entries.pop(k, None)
+            self._dirty = set()
+
+        if self.db_path is None or (not dirty and not removed):
+            return
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            con = self._connect()
+            try:
+                with con:
+                    con.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                        (str(SNAPSHOT_VERSION),),
+                    )
+                    con.executemany(
+                        "INSERT OR REPLACE INTO dirs (path, mtime_ns, listed_ns, subdirs, files) VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (k, e.mtime_ns, e.listed_ns, json.dumps(e.subdirs), json.dumps(e.files))
+                            for k, e in dirty.items()
+                        ],
+                    )
+                    con.executemany("DELETE FROM dirs WHERE path = ?", [(k,) for k in removed])
+            finally:
+                con.close()
+        except Exception:
+            # Read-only libraries (or a locked db) just keep the in-memory snapshot.
+            return
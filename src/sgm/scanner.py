@@ -1,16 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
-
 import os
+import re
+import stat
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
 IS_WINDOWS = os.name == "nt"
 
-from sgm.domain import GameAssets, ROM_EXTS, choose_rom
+from sgm.domain import ASSET_KINDS, AssetKind, GameAssets
+from sgm.scan_snapshot import SNAPSHOT_DIR_NAME
+
+if TYPE_CHECKING:
+    from sgm.scan_snapshot import ScanSnapshot
+
+
+SUPPORTED_EXTS = {ext for kind in ASSET_KINDS for ext in kind.exts}
+
 
+def _build_kind_table() -> dict[str, tuple[re.Pattern[str] | None, dict[str, AssetKind]]]:
+    """Per extension: a matcher for the kinds' stem suffixes, and the kinds by suffix."""
 
-SUPPORTED_EXTS = {".bin", ".int", ".rom", ".cfg", ".json", ".png"}
+    by_ext: dict[str, dict[str, AssetKind]] = {}
+    for kind in ASSET_KINDS:
+        for ext in kind.exts:
+            by_ext.setdefault(ext, {})[kind.suffix.lower()] = kind
+    table: dict[str, tuple[re.Pattern[str] | None, dict[str, AssetKind]]] = {}
+    for ext, kinds in by_ext.items():
+        # The leftmost match is the longest suffix ("_big_overlay", not "_overlay").
+        suffixes = [re.escape(s) for s in kinds if s]
+        matcher = re.compile("(?:" + "|".join(suffixes) + ")$") if suffixes else None
+        table[ext] = (matcher, kinds)
+    return table
+
+
+_KIND_TABLE = _build_kind_table()
 
 
 @dataclass(frozen=True)
@@ -20,236 +46,539 @@ class ScanResult:
     folders: dict[str, GameAssets]
     palette_files: list[Path]
     keyboard_files: list[Path]
+    # Non-hidden directories below `folder` (empty ones included), i.e. the
+    # folder nodes of the game tree. Directories inside hidden ones are left out.
+    directories: list[Path] = field(default_factory=list)
+
+
+# GameAssets fields compared by diff_scan (everything except the identity fields).
+ASSET_SLOTS: tuple[str, ...] = tuple(k.slot for k in ASSET_KINDS) + ("other",)
+
+
+@dataclass(frozen=True)
+class ScanDiff:
+    """Differences between two ScanResults of the same games folder.
+
+    Games and folders are identified by their ScanResult keys. `changed_*`
+    maps each key present in both results to the asset slots that differ.
+    """
+
+    added_games: list[str] = field(default_factory=list)
+    removed_games: list[str] = field(default_factory=list)
+    changed_games: dict[str, set[str]] = field(default_factory=dict)
+    added_folders: list[str] = field(default_factory=list)
+    removed_folders: list[str] = field(default_factory=list)
+    changed_folders: dict[str, set[str]] = field(default_factory=dict)
+    added_helper_files: list[Path] = field(default_factory=list)
+    removed_helper_files: list[Path] = field(default_factory=list)
+    added_directories: list[Path] = field(default_factory=list)
+    removed_directories: list[Path] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_games
+            or self.removed_games
+            or self.changed_games
+            or self.added_folders
+            or self.removed_folders
+            or self.changed_folders
+            or self.added_helper_files
+            or self.removed_helper_files
+            or self.added_directories
+            or self.removed_directories
+        )
+
+
+def diff_scan(old: ScanResult, new: ScanResult) -> ScanDiff:
+    """Compare two scans; see ScanDiff."""
+
+    added_games, removed_games, changed_games = _diff_assets(old.games, new.games)
+    added_folders, removed_folders, changed_folders = _diff_assets(old.folders, new.folders)
+
+    old_helpers = set(old.palette_files) | set(old.keyboard_files)
+    new_helpers = set(new.palette_files) | set(new.keyboard_files)
+    old_dirs = set(old.directories)
+    new_dirs = set(new.directories)
+    return ScanDiff(
+        added_games=added_games,
+        removed_games=removed_games,
+        changed_games=changed_games,
+        added_folders=added_folders,
+        removed_folders=removed_folders,
+        changed_folders=changed_folders,
+        added_helper_files=sorted(new_helpers - old_helpers, key=lambda p: str(p).casefold()),
+        removed_helper_files=sorted(old_helpers - new_helpers, key=lambda p: str(p).casefold()),
+        added_directories=[d for d in new.directories if d not in old_dirs],
+        removed_directories=[d for d in old.directories if d not in new_dirs],
+    )
+
+
+def _diff_assets(
+    old: dict[str, GameAssets], new: dict[str, GameAssets]
+) -> tuple[list[str], list[str], dict[str, set[str]]]:
+    added = [k for k in new if k not in old]
+    removed = [k for k in old if k not in new]
+    changed: dict[str, set[str]] = {}
+    for k, a in old.items():
+        b = new.get(k)
+        # Unchanged directories hand back the very same objects (see scan_folder).
+        if b is None or b is a or b == a:
+            continue
+        slots = {slot for slot in ASSET_SLOTS if getattr(a, slot) != getattr(b, slot)}
+        if a.basename != b.basename or a.folder != b.folder:
+            slots.add("basename")
+        if slots:
+            changed[k] = slots
+    return added, removed, changed
+
+
+@dataclass
+class _DirListing:
+    """Entries of a single directory, typed from the directory read itself.
 
+    `subdirs` holds (name, hidden) pairs; `files` holds the names of
+    non-hidden regular files.
+    """
 
-def scan_folder(folder: Path, *, palette_exts: set[str] | None = None) -> ScanResult:
-    games: dict[str, GameAssets] = {}
-    folders: dict[str, GameAssets] = {}
-    palette_files: list[Path] = []
-    keyboard_files: list[Path] = []
+    path: Path
+    subdirs: list[tuple[str, bool]] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
 
+
+def _is_hidden_dir_entry(entry: os.DirEntry) -> bool:
+    if entry.name.startswith("."):
+        return True
+    if IS_WINDOWS:
+        # On Windows the file attributes come back with the directory read,
+        # so this does not cost an extra syscall.
+        try:
+            attrs = entry.stat(follow_symlinks=False).st_file_attributes
+            return bool(attrs & stat.FILE_ATTRIBUTE_HIDDEN)
+        except Exception:
+            return False
+    return False
+
+
+def _list_directory(path: Path) -> _DirListing | None:
+    """Read one directory with os.scandir.
+
+    DirEntry.is_dir()/is_file() use the type information returned by the
+    directory read (d_type on Linux/macOS, FindNextFile data on Windows), so
+    this is about one syscall per directory instead of one stat per entry.
+    Returns None if the directory cannot be read.
+    """
+
+    listing = _DirListing(path=path)
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        listing.subdirs.append((entry.name, _is_hidden_dir_entry(entry)))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                # Keep this simple: dot-files are hidden.
+                # Note: we still traverse hidden directories for helper file discovery
+                # (palette/.kbd), so we do not rely on Windows hidden attributes here.
+                if entry.name.startswith("."):
+                    continue
+                listing.files.append(entry.name)
+    except Exception:
+        return None
+    return listing
+
+
+def scan_folder(
+    folder: Path,
+    *,
+    palette_exts: set[str] | None = None,
+    workers: int = 1,
+    snapshot: ScanSnapshot | None = None,
+) -> ScanResult:
+    """Scan a games folder.
+
+    With workers > 1, directories are listed concurrently on a thread pool
+    (useful on network shares where listing is latency-bound). Each
+    directory's entries are merged independently and the maps are sorted at
+    the end, so the result does not depend on the worker count.
+
+    With a snapshot, directories whose mtime has not changed since they were
+    last listed are served from the snapshot instead of being read again.
+    The caller owns the snapshot and decides when to save() it. GameAssets
+    for unchanged directories are reused between scans; treat them as
+    read-only.
+    """
+
+    builder = _ScanBuilder(folder)
     if not folder.exists() or not folder.is_dir():
-        return ScanResult(folder=folder, games={}, folders={}, palette_files=[], keyboard_files=[])
-
-    pal_exts = {".cfg", ".txt"} if not palette_exts else {e.lower() for e in palette_exts}
-
-    def is_hidden_dir(p: Path) -> bool:
-        name = p.name
-        if name.startswith("."):
-            return True
-        if IS_WINDOWS:
-            try:
-                import ctypes
-
-                # https://learn.microsoft.com/windows/win32/api/fileapi/nf-fileapi-getfileattributesw
-                # INVALID_FILE_ATTRIBUTES == 0xFFFFFFFF
-                attrs = ctypes.windll.kernel32.GetFileAttributesW(str(p))
-                if attrs in (-1, 0xFFFFFFFF, 4294967295):
-                    return False
-                FILE_ATTRIBUTE_HIDDEN = 0x2
-                return bool(attrs & FILE_ATTRIBUTE_HIDDEN)
-            except Exception:
-                return False
-        return False
-
-    def is_hidden_file(p: Path) -> bool:
-        # Keep this simple: dot-files are hidden.
-        # Note: we still traverse hidden directories for helper file discovery
-        # (palette/.kbd), so we do not rely on Windows hidden attributes here.
-        return p.name.startswith(".")
+        return builder.result()
+    for contrib in _walk(folder, pal_exts=_palette_ext_set(palette_exts), workers=workers, snapshot=snapshot):
+        builder.add(contrib)
+    return builder.result()
+
+
+@dataclass(frozen=True)
+class DirectoryScan:
+    """What one directory adds to a scan (see iter_scan_folder)."""
+
+    path: Path
+    # Non-hidden subdirectories, i.e. the folder nodes directly below `path`.
+    subdirs: list[Path]
+    # Games, folder assets and helper files found directly in `path`.
+    # Keys are relative to the games folder, as in scan_folder.
+    result: ScanResult
+
+
+def iter_scan_folder(
+    folder: Path,
+    *,
+    palette_exts: set[str] | None = None,
+    workers: int = 1,
+    snapshot: ScanSnapshot | None = None,
+) -> Iterator[DirectoryScan]:
+    """Scan a games folder, yielding each directory as soon as it is read.
+
+    Parents are always yielded before their subdirectories, but the order is
+    otherwise unspecified. Stop iterating (or close() the iterator) to cancel.
+    Merging every yielded result gives the same games and helper files as
+    scan_folder().
+    """
+
+    if not folder.exists() or not folder.is_dir():
+        return
+    for contrib in _walk(folder, pal_exts=_palette_ext_set(palette_exts), workers=workers, snapshot=snapshot):
+        result = ScanResult(
+            folder=folder,
+            games=dict(contrib.games),
+            folders=dict(contrib.folders),
+            palette_files=list(contrib.palette_files),
+            keyboard_files=list(contrib.keyboard_files),
+            directories=[child for child, allow_games in contrib.children if allow_games],
+        )
+        yield DirectoryScan(path=contrib.path, subdirs=list(result.directories), result=result)
+
+
+def _walk(
+    folder: Path,
+    *,
+    pal_exts: set[str],
+    workers: int,
+    snapshot: ScanSnapshot | None,
+) -> Iterator[_DirContribution]:
+    if snapshot is not None:
+        snapshot.begin_scan()
+
+    def read(path: Path, allow_games: bool) -> _DirContribution | None:
+        return _read_directory(folder, path, allow_games=allow_games, pal_exts=pal_exts, snapshot=snapshot)
 
     # Custom walk so we can prune hidden dirs for game discovery,
     # but still traverse them to find helper files (palette/.kbd).
     #
     # allow_games=False means: do NOT discover games or folder-supporting assets
     # from this subtree; only collect helper files.
-    stack: list[tuple[Path, bool]] = [(folder, True)]
-    while stack:
-        cur, allow_games = stack.pop()
+    if workers <= 1:
+        stack: list[tuple[Path, bool]] = [(folder, True)]
+        while stack:
+            cur, allow_games = stack.pop()
+            contrib = read(cur, allow_games)
+            if contrib is None:
+                continue
+            yield contrib
+            stack.extend(contrib.children)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sgm-scan")
+    try:
+        pending: set[Future] = {pool.submit(read, folder, True)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                contrib = fut.result()
+                if contrib is None:
+                    continue
+                for child, child_allow in contrib.children:
+                    pending.add(pool.submit(read, child, child_allow))
+                yield contrib
+    finally:
+        # Do not wait for queued directories if the caller stopped early.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_directory(
+    folder: Path,
+    directory: Path | None = None,
+    *,
+    palette_exts: set[str] | None = None,
+    snapshot: ScanSnapshot | None = None,
+) -> ScanResult:
+    """Scan a single directory of a games folder, without its subdirectories.
+
+    Keys are relative to `folder` exactly as in scan_folder, so the result can
+    replace that directory's share of a full scan. Helper files and
+    directories are only those directly inside `directory`.
+    """
+
+    directory = folder if directory is None else directory
+    builder = _ScanBuilder(folder)
+    try:
+        rel = directory.relative_to(folder)
+    except ValueError:
+        return builder.result()
+    if not directory.is_dir():
+        return builder.result()
+
+    # Games are only discovered outside hidden subtrees (see scan_folder).
+    allow_games = True
+    cur = folder
+    for part in rel.parts:
+        cur = cur / part
+        if _is_hidden_path(cur):
+            allow_games = False
+            break
+
+    contrib = _read_directory(
+        folder,
+        directory,
+        allow_games=allow_games,
+        pal_exts=_palette_ext_set(palette_exts),
+        snapshot=snapshot,
+    )
+    if contrib is not None:
+        builder.add(contrib)
+    return builder.result()
+
+
+def scan_game(folder: Path, basename: str) -> GameAssets | None:
+    """Scan the files of a single game in `folder`.
+
+    Reads the directory once but only classifies names starting with
+    `basename`. Returns None if the game has no files left, or if `basename`
+    names a subfolder (its files are folder assets, not a game).
+    """
+
+    listing = _list_directory(folder)
+    if listing is None:
+        return None
+    if any(name == basename and not hidden for name, hidden in listing.subdirs):
+        return None
+    listing.subdirs = []
+    listing.files = [name for name in listing.files if name.startswith(basename)]
+    # Treat `folder` as the root so the game's key is just its basename.
+    contrib = _merge_listing(folder, listing, allow_games=True, pal_exts=set())
+    return contrib.games.get(basename)
+
+
+def _palette_ext_set(palette_exts: set[str] | None) -> set[str]:
+    return {".cfg", ".txt"} if not palette_exts else {e.lower() for e in palette_exts}
+
+
+def _is_hidden_path(path: Path) -> bool:
+    if path.name.startswith("."):
+        return True
+    if IS_WINDOWS:
         try:
-            entries = list(cur.iterdir())
+            attrs = os.stat(path, follow_symlinks=False).st_file_attributes
+            return bool(attrs & stat.FILE_ATTRIBUTE_HIDDEN)
         except Exception:
+            return False
+    return False
+
+
+@dataclass
+class _DirContribution:
+    """What a single directory adds to a ScanResult."""
+
+    path: Path
+    games: dict[str, GameAssets] = field(default_factory=dict)
+    folders: dict[str, GameAssets] = field(default_factory=dict)
+    palette_files: list[Path] = field(default_factory=list)
+    keyboard_files: list[Path] = field(default_factory=list)
+    # Subdirectories to walk next, as (path, allow_games).
+    children: list[tuple[Path, bool]] = field(default_factory=list)
+
+
+def _read_directory(
+    folder: Path,
+    path: Path,
+    *,
+    allow_games: bool,
+    pal_exts: set[str],
+    snapshot: ScanSnapshot | None,
+) -> _DirContribution | None:
+    if snapshot is None:
+        listing = _list_directory(path)
+        if listing is None:
+            return None
+        return _merge_listing(folder, listing, allow_games=allow_games, pal_exts=pal_exts)
+
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    entry = snapshot.get(path, mtime_ns)
+    if entry is None:
+        listing = _list_directory(path)
+        if listing is None:
+            return None
+        entry = snapshot.put(path, mtime_ns, listing.subdirs, listing.files)
+    else:
+        listing = _DirListing(path=path, subdirs=entry.subdirs, files=entry.files)
+
+    memo_key = (allow_games, tuple(sorted(pal_exts)))
+    contrib = entry.memo.get(memo_key)
+    if contrib is None:
+        contrib = _merge_listing(folder, listing, allow_games=allow_games, pal_exts=pal_exts)
+        entry.memo[memo_key] = contrib
+    return contrib
+
+
+def _merge_listing(folder: Path, listing: _DirListing, *, allow_games: bool, pal_exts: set[str]) -> _DirContribution:
+    cur = listing.path
+    contrib = _DirContribution(path=cur)
+    games = contrib.games
+    folders = contrib.folders
+    palette_files = contrib.palette_files
+    keyboard_files = contrib.keyboard_files
+
+    dir_names: set[str] = set()
+    for name, hidden in listing.subdirs:
+        if name == SNAPSHOT_DIR_NAME and cur == folder:
+            # The app's own caches (scan snapshot, thumbnails): never walked,
+            # so writing them does not make the next scan list them again.
             continue
-
-        dir_names: set[str] = set()
-        if allow_games:
+        if allow_games and not hidden:
             # Pre-scan child directories so we can treat sibling files with the same
             # basename as folder-supporting assets (not games).
-            for entry in entries:
-                if not entry.is_dir():
-                    continue
-                if is_hidden_dir(entry):
-                    # Hidden directories should not contribute to game discovery,
-                    # but we still walk them for helper files.
-                    stack.append((entry, False))
-                    continue
-                dir_names.add(entry.name)
-                stack.append((entry, True))
+            dir_names.add(name)
+            contrib.children.append((cur / name, True))
         else:
-            # Helper-only mode: traverse the subtree, but never discover games/assets.
-            for entry in entries:
-                if entry.is_dir():
-                    stack.append((entry, False))
-
-        for entry in entries:
-            if entry.is_dir():
-                continue
-            if not entry.is_file():
-                continue
-            if is_hidden_file(entry):
-                continue
+            # Hidden directories should not contribute to game discovery,
+            # but we still walk them for helper files.
+            contrib.children.append((cur / name, False))
+
+    rel_folder = Path(".")
+    try:
+        rel_folder = cur.relative_to(folder)
+    except Exception:
+        rel_folder = Path(".")
+    rel_prefix = "" if str(rel_folder) in {".", ""} else f"{rel_folder.as_posix()}/"
+
+    for name in listing.files:
+        suffix = os.path.splitext(name)[1].lower()
+
+        # Track helper files used by Advanced JSON settings.
+        # Palette files: extension matches PaletteExtensions and name contains "palette".
+        if suffix in pal_exts and "palette" in name.casefold():
+            palette_files.append(cur / name)
+
+        # Keyboard hack files.
+        if suffix == ".kbd":
+            keyboard_files.append(cur / name)
+
+        if not allow_games:
+            continue
 
-            suffix = entry.suffix.lower()
+        base, kind = _match_asset_kind(name)
+        if base is None or kind is None:
+            continue
 
-            # Track helper files used by Advanced JSON settings.
-            # Palette files: extension matches PaletteExtensions and name contains "palette".
-            if suffix in pal_exts and "palette" in entry.name.casefold():
-                palette_files.append(entry)
+        # Folder-supporting assets live alongside a folder whose name is <basename>.
+        # These should not appear as games.
+        if base in dir_names:
+            if not kind.folder_asset:
+                continue
 
-            # Keyboard hack files.
-            if suffix == ".kbd":
-                keyboard_files.append(entry)
+            folder_dir = cur / base
+            fkey = str(folder_dir)
+            asset = folders.get(fkey)
+            if asset is None:
+                asset = GameAssets(basename=base, folder=cur)
+                folders[fkey] = asset
+            asset.assign(kind, name)
+            continue
 
-            if not allow_games:
-                continue
-            if suffix not in SUPPORTED_EXTS:
-                continue
+        # Unique key: include folder path when game is in a subfolder.
+        key = f"{rel_prefix}{base}"
+
+        game = games.get(key)
+        if game is None:
+            game = GameAssets(basename=base, folder=cur)
+            games[key] = game
+        game.assign(kind, name)
+
+    return contrib
+
+
+class _ScanBuilder:
+    """Accumulates per-directory contributions into a ScanResult."""
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        self.games: dict[str, GameAssets] = {}
+        self.folders: dict[str, GameAssets] = {}
+        self.palette_files: list[Path] = []
+        self.keyboard_files: list[Path] = []
+        self.directories: list[Path] = []
+
+    def add(self, contrib: _DirContribution) -> None:
+        self.games.update(contrib.games)
+        self.folders.update(contrib.folders)
+        self.palette_files.extend(contrib.palette_files)
+        self.keyboard_files.extend(contrib.keyboard_files)
+        self.directories.extend(child for child, allow_games in contrib.children if allow_games)
+
+    def result(self) -> ScanResult:
+        # Stable ordering for UI; names that only differ in case (possible on Linux)
+        # are ordered by their exact spelling, not by which worker finished first.
+        games = dict(sorted(self.games.items(), key=lambda kv: (kv[0].lower(), kv[0])))
+        folders = dict(sorted(self.folders.items(), key=lambda kv: (kv[0].lower(), kv[0])))
+        palette_files = sorted(self.palette_files, key=lambda p: (str(p).casefold(), str(p)))
+        keyboard_files = sorted(self.keyboard_files, key=lambda p: (str(p).casefold(), str(p)))
+        directories = sorted(self.directories, key=lambda p: (p.as_posix().lower(), p.as_posix()))
+        return ScanResult(
+            folder=self.folder,
+            games=games,
+            folders=folders,
+            palette_files=palette_files,
+            keyboard_files=keyboard_files,
+            directories=directories,
+        )
 
-            base, kind = _classify(entry)
-            if base is None or kind is None:
-                continue
 
-            # Folder-supporting assets live alongside a folder whose name is <basename>.
-            # These should not appear as games.
-            if base in dir_names:
-                # ROM and CFG do not apply to folders.
-                if kind in {"rom", "config"}:
-                    continue
+def _classify(path: Path) -> tuple[str | None, str | None]:
+    return _classify_name(path.name)
 
-                folder_dir = cur / base
-                fkey = str(folder_dir)
-                asset = folders.get(fkey)
-                if asset is None:
-                    asset = GameAssets(basename=base, folder=cur)
-                    folders[fkey] = asset
-
-                if kind == "metadata":
-                    asset.metadata = entry
-                elif kind == "box":
-                    asset.box = entry
-                elif kind == "box_small":
-                    asset.box_small = entry
-                elif kind == "overlay":
-                    asset.overlay = entry
-                elif kind == "overlay2":
-                    asset.overlay2 = entry
-                elif kind == "overlay3":
-                    asset.overlay3 = entry
-                elif kind == "overlay_big":
-                    asset.overlay_big = entry
-                elif kind == "qrcode":
-                    asset.qrcode = entry
-                elif kind == "snap1":
-                    asset.snap1 = entry
-                elif kind == "snap2":
-                    asset.snap2 = entry
-                elif kind == "snap3":
-                    asset.snap3 = entry
-                else:
-                    asset.other.append(entry)
-                continue
 
-            game_folder = entry.parent
-            rel_folder = Path(".")
-            try:
-                rel_folder = game_folder.relative_to(folder)
-            except Exception:
-                rel_folder = Path(".")
-
-            # Unique key: include folder path when game is in a subfolder.
-            if str(rel_folder) in {".", ""}:
-                key = base
-            else:
-                key = f"{rel_folder.as_posix()}/{base}"
-
-            game = games.get(key)
-            if game is None:
-                game = GameAssets(basename=base, folder=game_folder)
-                games[key] = game
-
-            if kind == "rom":
-                game.rom = choose_rom(game.rom, entry)
-            elif kind == "config":
-                game.config = entry
-            elif kind == "metadata":
-                game.metadata = entry
-            elif kind == "box":
-                game.box = entry
-            elif kind == "box_small":
-                game.box_small = entry
-            elif kind == "overlay":
-                game.overlay = entry
-            elif kind == "overlay2":
-                game.overlay2 = entry
-            elif kind == "overlay3":
-                game.overlay3 = entry
-            elif kind == "overlay_big":
-                game.overlay_big = entry
-            elif kind == "qrcode":
-                game.qrcode = entry
-            elif kind == "snap1":
-                game.snap1 = entry
-            elif kind == "snap2":
-                game.snap2 = entry
-            elif kind == "snap3":
-                game.snap3 = entry
-            else:
-                game.other.append(entry)
-
-    # Stable ordering for UI
-    games = dict(sorted(games.items(), key=lambda kv: kv[0].lower()))
-    folders = dict(sorted(folders.items(), key=lambda kv: kv[0].lower()))
-    palette_files = sorted(palette_files, key=lambda p: str(p).casefold())
-    keyboard_files = sorted(keyboard_files, key=lambda p: str(p).casefold())
-    return ScanResult(folder=folder, games=games, folders=folders, palette_files=palette_files, keyboard_files=keyboard_files)
+def _classify_name(name: str) -> tuple[str | None, str | None]:
+    base, kind = _match_asset_kind(name)
+    if kind is None:
+        return None, None
+    return base, kind.slot
 
 
-def _classify(path: Path) -> tuple[str | None, str | None]:
-    suffix = path.suffix.lower()
-    stem = path.stem
+def _match_asset_kind(name: str) -> tuple[str | None, AssetKind | None]:
+    stem, suffix = os.path.splitext(name)
+    entry = _KIND_TABLE.get(suffix.lower())
+    if entry is None:
+        return None, None
+    matcher, kinds = entry
+
+    m = matcher.search(stem.lower()) if matcher is not None else None
+    if m is None:
+        kind = kinds.get("")
+        base = stem
+    else:
+        kind = kinds[m.group()]
+        base = stem[: len(stem) - len(m.group())]
+    if kind is None:
+        return None, None
 
-    if suffix in ROM_EXTS:
-        return stem, "rom"
-    if suffix == ".cfg":
+    if kind.slot == "config" and "palette" in name.casefold():
         # Some games folders include palette/config helper files that are not game configs.
         # If the filename contains "palette" anywhere, ignore it for game discovery.
-        if "palette" in path.name.casefold():
-            return None, None
-        return stem, "config"
-    if suffix == ".json":
-        return stem, "metadata"
-    if suffix != ".png":
         return None, None
-
-    lower = stem.lower()
-
-    if lower.endswith("_big_overlay"):
-        return stem[: -len("_big_overlay")], "overlay_big"
-    if lower.endswith("_overlay2"):
-        return stem[: -len("_overlay2")], "overlay2"
-    if lower.endswith("_overlay3"):
-        return stem[: -len("_overlay3")], "overlay3"
-    if lower.endswith("_overlay"):
-        return stem[: -len("_overlay")], "overlay"
-    if lower.endswith("_qrcode"):
-        return stem[: -len("_qrcode")], "qrcode"
-    if lower.endswith("_small"):
-        return stem[: -len("_small")], "box_small"
-
-    for i in (1, 2, 3):
-        token = f"_snap{i}"
-        if lower.endswith(token):
-            return stem[: -len(token)], f"snap{i}"
-
-    # Default .png with no recognized suffix is box art.
-    return stem, "box"
+    return base, kind
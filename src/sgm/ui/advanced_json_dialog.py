@@ -24,6 +24,8 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
+from sgm.helper_paths import HelperPathIndex
+
 
 DEFAULT_MEDIA_PREFIX = "/media/usb0"
 
@@ -187,6 +189,7 @@ class AdvancedJsonDialog(QDialog):
         palette_files: list[Path],
         keyboard_files: list[Path],
         media_prefix: str | None = None,
+        helper_paths: HelperPathIndex | None = None,
         on_written=None,
     ):
         super().__init__(parent)
@@ -195,6 +198,8 @@ class AdvancedJsonDialog(QDialog):
         self._json_path = json_path
         self._root = root_folder
         self._media_prefix = _normalize_media_prefix(media_prefix)
+        # Shared with the warning analysis; answers without touching the disk for scanned helper files.
+        self._helper_paths = helper_paths or HelperPathIndex.build(root_folder, palette_files, keyboard_files)
         self._on_written = on_written
 
         self._palette_options = self._build_file_options(palette_files)
@@ -390,7 +395,7 @@ class AdvancedJsonDialog(QDialog):
 
         if kbd_val is not None:
             local = _device_to_local_path(root=self._root, device_path=kbd_val, media_prefix=self._media_prefix)
-            if local is None or not local.exists():
+            if local is None or not self._helper_paths.exists(local):
                 expected = str(local) if local is not None else "(unable to map to local path)"
                 self._lbl_kbd_missing.setText(
                     "Warning: referenced keyboard file does not exist.\n"
@@ -401,7 +406,7 @@ class AdvancedJsonDialog(QDialog):
 
         if pal_val is not None:
             local = _device_to_local_path(root=self._root, device_path=pal_val, media_prefix=self._media_prefix)
-            if local is None or not local.exists():
+            if local is None or not self._helper_paths.exists(local):
                 expected = str(local) if local is not None else "(unable to map to local path)"
                 self._lbl_palette_missing.setText(
                     "Warning: referenced palette file does not exist.\n"
@@ -427,9 +432,10 @@ class AdvancedJsonDialog(QDialog):
             return
 
         # Find matching option.
+        key = HelperPathIndex.key(local)
         for i in range(combo.count()):
             p = combo.itemData(i)
-            if isinstance(p, Path) and p.resolve() == local.resolve():
+            if isinstance(p, Path) and HelperPathIndex.key(p) == key:
                 combo.setCurrentIndex(i)
                 return
 
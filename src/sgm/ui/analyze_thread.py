@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from sgm.domain import GameAssets
+
+
+class AnalyzeThread(QThread):
+    """Analyzes a list of games in the background.
+
+    results_ready carries a dict of game id -> compute(game) for the games
+    finished since the last batch, sent at most every `interval_ms`.
+    analysis_finished carries True if every game was analyzed, False if it
+    was interrupted. If compute raises, the run stops there and `error` holds
+    the message.
+
+    `compute` runs on this thread; it must not touch widgets.
+    """
+
+    results_ready = Signal(dict)
+    analysis_finished = Signal(bool)
+
+    def __init__(
+        self,
+        games: list[tuple[str, GameAssets]],
+        compute: Callable[[GameAssets], object],
+        *,
+        interval_ms: int = 100,
+        parent: QObject | None = None,
+    ):
+        super().__init__(parent)
+        self._games = games
+        self._compute = compute
+        self._interval_s = max(0, int(interval_ms)) / 1000.0
+        self.error: str | None = None
+
+    def run(self) -> None:
+        completed = False
+        batch: dict[str, object] = {}
+        last = time.monotonic()
+        try:
+            for game_id, game in self._games:
+                if self.isInterruptionRequested():
+                    break
+                batch[game_id] = self._compute(game)
+                now = time.monotonic()
+                if now - last >= self._interval_s:
+                    self.results_ready.emit(batch)
+                    batch = {}
+                    last = now
+            else:
+                completed = True
+        except Exception as e:
+            completed = False
+            self.error = str(e) or type(e).__name__
+
+        if batch:
+            self.results_ready.emit(batch)
+        self.analysis_finished.emit(completed)
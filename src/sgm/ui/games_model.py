@@ -0,0 +1,510 @@
+from __future__ import annotations
+
+import bisect
+from pathlib import Path
+from typing import Callable, Iterable
+
+from PySide6.QtCore import QAbstractItemModel, QMimeData, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QBrush, QIcon
+
+from sgm.domain import GameAssets
+
+
+GAME_IDS_MIME = "application/x-sgm-game-ids"
+
+_ROOT = Path(".")
+
+def _folder_sort_key(rel: Path) -> str:
+    return rel.as_posix().lower()
+
+
+def _game_sort_key(game_id: str) -> str:
+    return game_id.lower()
+
+
+def _find(items: list, item, key: Callable) -> int:
+    """Position of `item` in `items` (sorted by `key`), or -1."""
+
+    k = key(item)
+    i = bisect.bisect_left(items, k, key=key)
+    while i < len(items) and key(items[i]) == k:
+        if items[i] == item:
+            return i
+        i += 1
+    return -1
+
+
+class _Node:
+    """A row of the games tree: a folder (key: path relative to the root) or a game (key: game id)."""
+
+    __slots__ = ("is_folder", "key", "parent", "children", "row")
+
+    def __init__(self, is_folder: bool, key, parent: _Node | None):
+        self.is_folder = is_folder
+        self.key = key
+        self.parent = parent
+        # Last known row under the parent; checked against the parent's key lists before use.
+        self.row = -1
+        # Folders only: the child rows, built the first time the view asks for one.
+        self.children: list[_Node] | None = None
+
+
+class GamesTreeModel(QAbstractItemModel):
+    """The scanned library as a tree: folders first, then games, each sorted case-insensitively.
+
+    The model holds every folder and game of the library; which games are
+    shown is up to GamesFilterProxyModel. Per folder it keeps the sorted
+    child folders and game ids, and only creates row objects for a folder's
+    children once a view looks at them, so collapsed folders cost nothing.
+    Folder paths and game ids map straight to their row objects, so looking
+    up a row does not walk the tree.
+
+    Rows carry the same UserRole dict the tree always used:
+    {"type": "folder", "path": ...} or {"type": "game", "id": ..., "folder": ...}.
+    `game_for` looks up a game's assets; `flagged` says whether a game is
+    drawn red (it has warnings the Analyze filters show).
+    """
+
+    def __init__(
+        self,
+        *,
+        game_for: Callable[[str], GameAssets | None],
+        folder_icon: QIcon,
+        game_icon: QIcon,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._game_for = game_for
+        self._flagged: Callable[[str], bool] = lambda _gid: False
+        self._folder_icon = folder_icon
+        self._game_icon = game_icon
+        self._drop_target: Path | None = None
+        self._drop_brush = QBrush()
+        self._reset_state(None)
+
+    def _reset_state(self, root: Path | None) -> None:
+        self._root = root
+        self._root_node = _Node(True, _ROOT, None)
+        self._folders: dict[Path, _Node] = {_ROOT: self._root_node}
+        self._subdirs: dict[Path, list[Path]] = {}
+        self._games_in: dict[Path, list[str]] = {}
+        self._game_folder: dict[str, Path] = {}
+        # Game id -> row object, for games whose folder rows have been built.
+        self._game_nodes: dict[str, _Node] = {}
+        # Game folder -> the node its games go under; many games share a folder.
+        self._parent_rels: dict[Path, Path] = {}
+        # Removed game rows, kept until the next reset: queued signals and persistent
+        # indexes may still carry a pointer to one.
+        self._retired: list[_Node] = []
+
+    # ---------- library ----------
+
+    @property
+    def root(self) -> Path | None:
+        return self._root
+
+    def set_flagged(self, flagged: Callable[[str], bool]) -> None:
+        """Set the red-text predicate; call refresh_games() / refresh_all() after its answers change."""
+        self._flagged = flagged
+
+    def set_drop_brush(self, brush: QBrush) -> None:
+        self._drop_brush = brush
+
+    def folder_rels(self) -> list[Path]:
+        """Every folder node, as a path relative to the root."""
+        return [rel for rel in self._folders if rel != _ROOT]
+
+    def has_folders(self) -> bool:
+        return len(self._folders) > 1
+
+    def has_folder(self, rel: Path) -> bool:
+        return rel != _ROOT and rel in self._folders
+
+    def has_game(self, game_id: str) -> bool:
+        return game_id in self._game_folder
+
+    def game_folder_rel(self, game_id: str) -> Path | None:
+        """The folder node a game is listed under (Path(".") for the top level)."""
+        return self._game_folder.get(game_id)
+
+    def game_count(self) -> int:
+        return len(self._game_folder)
+
+    def rel_folder(self, folder: Path) -> Path | None:
+        """`folder` relative to the root, or None if it is outside it."""
+
+        if self._root is None:
+            return None
+        try:
+            return folder.relative_to(self._root)
+        except Exception:
+            return None
+
+    def reset(self, root: Path | None, directories: Iterable[Path], games: Iterable[tuple[str, Path]]) -> None:
+        """Replace the whole tree: folder nodes for `directories`, then (game id, folder) pairs."""
+
+        self.beginResetModel()
+        self._reset_state(root)
+        if root is not None:
+            # Parents sort before their subfolders; a folder without a parent node goes to the top level.
+            for d in sorted(directories, key=lambda p: p.as_posix().lower()):
+                rel = self.rel_folder(d)
+                if rel is None or rel == _ROOT or rel in self._folders:
+                    continue
+                parent = self._folders.get(rel.parent, self._root_node)
+                self._folders[rel] = _Node(True, rel, parent)
+                self._subdirs.setdefault(parent.key, []).append(rel)
+            for subdirs in self._subdirs.values():
+                subdirs.sort(key=_folder_sort_key)
+            for game_id, folder in games:
+                rel = self._game_parent_rel(folder)
+                self._game_folder[game_id] = rel
+                self._games_in.setdefault(rel, []).append(game_id)
+            for ids in self._games_in.values():
+                ids.sort(key=_game_sort_key)
+        self.endResetModel()
+
+    def _game_parent_rel(self, folder: Path) -> Path:
+        found = self._parent_rels.get(folder)
+        if found is None:
+            rel = self.rel_folder(folder)
+            # Games in folders without a node (e.g. below hidden ones) go to the top level, as before.
+            found = rel if rel is not None and rel in self._folders else _ROOT
+            self._parent_rels[folder] = found
+        return found
+
+    def add_folders(self, parent_rel: Path, folders: Iterable[Path]) -> None:
+        """Add folder nodes under `parent_rel` (which must exist); known ones are skipped."""
+
+        parent = self._folders.get(parent_rel)
+        if parent is None or self._root is None:
+            return
+        new = []
+        for d in folders:
+            rel = self.rel_folder(d)
+            if rel is not None and rel not in self._folders and rel.parent == parent_rel:
+                new.append(rel)
+        if not new:
+            return
+        new.sort(key=_folder_sort_key)
+        self._parent_rels.clear()
+        for rel in new:
+            self._folders[rel] = _Node(True, rel, parent)
+        siblings = self._subdirs.setdefault(parent_rel, [])
+        if not siblings:
+            self._insert_rows(parent, 0, new, siblings, self._folders.__getitem__)
+            return
+        for rel in new:
+            row = bisect.bisect_right(siblings, _folder_sort_key(rel), key=_folder_sort_key)
+            self._insert_rows(parent, row, [rel], siblings, self._folders.__getitem__)
+
+    def add_games(self, games: Iterable[tuple[str, Path]]) -> None:
+        """Add (game id, folder) rows; games already in the tree are moved if their folder changed."""
+
+        by_parent: dict[Path, list[str]] = {}
+        for game_id, folder in games:
+            rel = self._game_parent_rel(folder)
+            old = self._game_folder.get(game_id)
+            if old == rel:
+                continue
+            if old is not None:
+                self.remove_games([game_id])
+            by_parent.setdefault(rel, []).append(game_id)
+
+        for rel, ids in by_parent.items():
+            parent = self._folders[rel]
+            ids.sort(key=_game_sort_key)
+            existing = self._games_in.setdefault(rel, [])
+            nsub = len(self._subdirs.get(rel, ()))
+            for gid in ids:
+                self._game_folder[gid] = rel
+            if not existing or _game_sort_key(existing[-1]) <= _game_sort_key(ids[0]):
+                # A new folder's games (the scan) or games sorting after the rest: one block.
+                self._insert_rows(parent, len(existing), ids, existing, lambda gid: self._game_node(gid, parent), offset=nsub)
+                continue
+            for gid in ids:
+                row = bisect.bisect_right(existing, _game_sort_key(gid), key=_game_sort_key)
+                self._insert_rows(parent, row, [gid], existing, lambda gid: self._game_node(gid, parent), offset=nsub)
+
+    def _insert_rows(
+        self,
+        parent: _Node,
+        pos: int,
+        keys: list,
+        into: list,
+        make_node: Callable[[object], _Node],
+        *,
+        offset: int = 0,
+    ) -> None:
+        first = offset + pos
+        self.beginInsertRows(self._index_of(parent), first, first + len(keys) - 1)
+        into[pos:pos] = keys
+        if parent.children is not None:
+            parent.children[first:first] = [make_node(k) for k in keys]
+        self.endInsertRows()
+
+    def remove_games(self, game_ids: Iterable[str]) -> None:
+        for gid in game_ids:
+            rel = self._game_folder.pop(gid, None)
+            if rel is None:
+                continue
+            parent = self._folders[rel]
+            ids = self._games_in[rel]
+            nsub = len(self._subdirs.get(rel, ()))
+            node = self._game_nodes.pop(gid, None)
+            pos = self._row_of(node) - nsub if node is not None else _find(ids, gid, _game_sort_key)
+            if pos < 0:
+                continue
+            row = nsub + pos
+            self.beginRemoveRows(self._index_of(parent), row, row)
+            del ids[pos]
+            if parent.children is not None:
+                self._retired.append(parent.children.pop(row))
+            self.endRemoveRows()
+
+    def refresh_games(self, game_ids: Iterable[str]) -> None:
+        """Redraw (and re-filter) the rows of the given games, where they have been built."""
+
+        for gid in game_ids:
+            ix = self.index_for_game(gid, build=False)
+            if ix.isValid():
+                self.dataChanged.emit(ix, ix)
+
+    def refresh_all(self) -> None:
+        """Redraw (and re-filter) every game row that has been built."""
+
+        for rel, node in list(self._folders.items()):
+            ids = self._games_in.get(rel)
+            if node.children is None or not ids:
+                continue
+            nsub = len(self._subdirs.get(rel, ()))
+            parent = self._index_of(node)
+            self.dataChanged.emit(self.index(nsub, 0, parent), self.index(nsub + len(ids) - 1, 0, parent))
+
+    def set_drop_target(self, rel: Path | None) -> None:
+        """Highlight the folder node `rel` as the drop target (None: none)."""
+
+        if rel == self._drop_target:
+            return
+        old, self._drop_target = self._drop_target, rel
+        for r in (old, rel):
+            ix = self.index_for_folder_rel(r) if r is not None else QModelIndex()
+            if ix.isValid():
+                self.dataChanged.emit(ix, ix, [Qt.ItemDataRole.BackgroundRole])
+
+    # ---------- lookups ----------
+
+    def _game_node(self, game_id: str, parent: _Node) -> _Node:
+        node = _Node(False, game_id, parent)
+        self._game_nodes[game_id] = node
+        return node
+
+    def _children(self, node: _Node) -> list[_Node]:
+        if node.children is None:
+            rel = node.key
+            children = [self._folders[r] for r in self._subdirs.get(rel, ())]
+            children.extend(self._game_node(gid, node) for gid in self._games_in.get(rel, ()))
+            for row, child in enumerate(children):
+                child.row = row
+            node.children = children
+        return node.children
+
+    def _row_of(self, node: _Node) -> int:
+        parent = node.parent
+        if parent is None:
+            return -1
+        rel = parent.key
+        subdirs = self._subdirs.get(rel, [])
+        if node.is_folder:
+            keys, offset, sort_key = subdirs, 0, _folder_sort_key
+        else:
+            keys, offset, sort_key = self._games_in.get(rel, []), len(subdirs), _game_sort_key
+        pos = node.row - offset
+        if not (0 <= pos < len(keys) and keys[pos] == node.key):
+            # Rows inserted or removed before it since; find it again.
+            pos = _find(keys, node.key, sort_key)
+            if pos < 0:
+                return -1
+            node.row = offset + pos
+        return node.row
+
+    def _index_of(self, node: _Node) -> QModelIndex:
+        if node is self._root_node:
+            return QModelIndex()
+        row = self._row_of(node)
+        return self.createIndex(row, 0, node) if row >= 0 else QModelIndex()
+
+    def index_for_folder_rel(self, rel: Path) -> QModelIndex:
+        # Folder nodes always exist, built rows or not.
+        node = self._folders.get(rel)
+        if node is None or node is self._root_node:
+            return QModelIndex()
+        return self._index_of(node)
+
+    def index_for_folder(self, folder: Path) -> QModelIndex:
+        rel = self.rel_folder(folder)
+        return self.index_for_folder_rel(rel) if rel is not None else QModelIndex()
+
+    def index_for_game(self, game_id: str, *, build: bool = True) -> QModelIndex:
+        """The row of a game; with `build=False`, invalid unless its folder's rows exist already."""
+
+        node = self._game_nodes.get(game_id)
+        if node is None:
+            rel = self._game_folder.get(game_id)
+            if rel is None or not build:
+                return QModelIndex()
+            self._children(self._folders[rel])
+            node = self._game_nodes.get(game_id)
+            if node is None:
+                return QModelIndex()
+        return self._index_of(node)
+
+    def child_keys(self, index: QModelIndex) -> tuple[list[Path], list[str]]:
+        """(subfolders, game ids) under a folder row (or the root); empty for a game."""
+
+        node = index.internalPointer() if index.isValid() else self._root_node
+        if not node.is_folder:
+            return [], []
+        return self._subdirs.get(node.key, []), self._games_in.get(node.key, [])
+
+    def child_info(self, source_row: int, source_parent: QModelIndex) -> tuple[bool, object]:
+        """(is folder, key) of a row without building its node; for the filter proxy."""
+
+        parent = source_parent.internalPointer() if source_parent.isValid() else self._root_node
+        rel = parent.key
+        subdirs = self._subdirs.get(rel, ())
+        if source_row < len(subdirs):
+            return True, subdirs[source_row]
+        return False, self._games_in[rel][source_row - len(subdirs)]
+
+    # ---------- QAbstractItemModel ----------
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if column != 0 or row < 0:
+            return QModelIndex()
+        node = parent.internalPointer() if parent.isValid() else self._root_node
+        if not node.is_folder:
+            return QModelIndex()
+        children = self._children(node)
+        if row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+        node: _Node = index.internalPointer()
+        parent = node.parent
+        if parent is None or parent is self._root_node:
+            return QModelIndex()
+        return self._index_of(parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self._root_node
+        if not node.is_folder:
+            return 0
+        return len(self._subdirs.get(node.key, ())) + len(self._games_in.get(node.key, ()))
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node: _Node = index.internalPointer()
+        if node.is_folder:
+            folder = (self._root or _ROOT) / node.key
+            if role == Qt.ItemDataRole.DisplayRole:
+                return node.key.name
+            if role == Qt.ItemDataRole.DecorationRole:
+                return self._folder_icon
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return str(folder)
+            if role == Qt.ItemDataRole.UserRole:
+                return {"type": "folder", "path": str(folder)}
+            if role == Qt.ItemDataRole.BackgroundRole and node.key == self._drop_target:
+                return self._drop_brush
+            return None
+
+        gid = node.key
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._game_icon
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QBrush(Qt.GlobalColor.red) if self._flagged(gid) else None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.UserRole):
+            return None
+        game = self._game_for(gid)
+        if game is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return game.basename
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return str(game.folder)
+        return {"type": "game", "id": gid, "folder": str(game.folder)}
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+        if index.internalPointer().is_folder:
+            flags |= Qt.ItemFlag.ItemIsDropEnabled
+        return flags
+
+    def mimeTypes(self) -> list[str]:
+        return [GAME_IDS_MIME]
+
+    def mimeData(self, indexes) -> QMimeData:
+        ids = []
+        for ix in indexes:
+            node = ix.internalPointer() if ix.isValid() else None
+            if node is not None and not node.is_folder and node.key not in ids:
+                ids.append(node.key)
+        mime = QMimeData()
+        mime.setData(GAME_IDS_MIME, "\n".join(ids).encode("utf-8"))
+        return mime
+
+    def supportedDragActions(self) -> Qt.DropAction:
+        return Qt.DropAction.MoveAction
+
+    def supportedDropActions(self) -> Qt.DropAction:
+        return Qt.DropAction.MoveAction | Qt.DropAction.CopyAction
+
+
+class GamesFilterProxyModel(QSortFilterProxyModel):
+    """Hides the games the Analyze filters (and the search box) exclude.
+
+    `accepts_game(game_id)` decides for games and `accepts_folder(rel)` for
+    folders (default: always shown). Rows are re-filtered when the source
+    model reports them changed (GamesTreeModel.refresh_games / refresh_all)
+    or on invalidateFilter(), and only for folders a view has looked at.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._accepts_game: Callable[[str], bool] | None = None
+        self._accepts_folder: Callable[[Path], bool] | None = None
+
+    def set_game_filter(self, accepts_game: Callable[[str], bool] | None) -> None:
+        self._accepts_game = accepts_game
+
+    def set_folder_filter(self, accepts_folder: Callable[[Path], bool] | None) -> None:
+        self._accepts_folder = accepts_folder
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        # The base class filters every child to answer; the view asks for each folder it paints.
+        folders, games = self.sourceModel().child_keys(self.mapToSource(parent))
+        if self._accepts_folder is None and folders:
+            return True
+        if any(self._accepts_folder(rel) for rel in folders):
+            return True
+        if self._accepts_game is None:
+            return bool(games)
+        return any(self._accepts_game(gid) for gid in games)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        is_folder, key = self.sourceModel().child_info(source_row, source_parent)
+        if is_folder:
+            return self._accepts_folder is None or self._accepts_folder(key)
+        return self._accepts_game is None or self._accepts_game(key)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTabWidget,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+)
+
+from sgm.helper_refs import HelperReference, HelperReferenceReport
+from sgm.ui.dialog_state import get_start_dir, remember_path
+
+
+_GAME_ROLE = Qt.ItemDataRole.UserRole
+
+
+class HelperReferencesDialog(QDialog):
+    """Palette / keyboard files and the games that use them, plus unused files and dangling references."""
+
+    def __init__(
+        self,
+        *,
+        parent=None,
+        report: HelperReferenceReport,
+        on_select_game: Callable[[str], None] | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Helper Files")
+        self.resize(760, 520)
+        self._report = report
+        self._on_select_game = on_select_game
+
+        root = QVBoxLayout(self)
+
+        games = {r.game_id for r in report.references}
+        summary = QLabel(
+            f"{len(report.references)} references from {len(games)} games; "
+            f"{len(report.users)} files used, {len(report.unused)} unused, {len(report.dangling)} dangling"
+        )
+        root.addWidget(summary)
+
+        tabs = QTabWidget()
+        tabs.addTab(self._build_used_tree(), f"Used Files ({len(report.users)})")
+        tabs.addTab(self._build_unused_tree(), f"Unused Files ({len(report.unused)})")
+        tabs.addTab(self._build_dangling_tree(), f"Dangling References ({len(report.dangling)})")
+        root.addWidget(tabs, 1)
+
+        buttons = QHBoxLayout()
+        btn_export = QPushButton("Export JSON...")
+        btn_export.setToolTip("Save the whole report (including every reference) as JSON")
+        btn_export.clicked.connect(self._export_json)
+        buttons.addWidget(btn_export)
+        buttons.addStretch(1)
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.accept)
+        buttons.addWidget(btn_close)
+        root.addLayout(buttons)
+
+    def _rel(self, p: Path | None) -> str:
+        return self._report.rel_path(p) or ""
+
+    def _new_tree(self, headers: list[str]) -> QTreeWidget:
+        tree = QTreeWidget()
+        tree.setHeaderLabels(headers)
+        tree.setRootIsDecorated(len(headers) <= 2)
+        tree.setUniformRowHeights(True)
+        tree.itemDoubleClicked.connect(self._item_double_clicked)
+        return tree
+
+    def _game_item(self, ref: HelperReference, columns: list[str]) -> QTreeWidgetItem:
+        item = QTreeWidgetItem(columns)
+        item.setData(0, _GAME_ROLE, ref.game_id)
+        return item
+
+    def _build_used_tree(self) -> QTreeWidget:
+        tree = self._new_tree(["File / Game", "Kind"])
+        for path, refs in self._report.users.items():
+            games = sorted({r.game_id for r in refs}, key=str.casefold)
+            parent = QTreeWidgetItem([f"{self._rel(path)} ({len(games)})", self._report.kinds.get(path, "")])
+            parent.setToolTip(0, str(path))
+            for gid in games:
+                child = QTreeWidgetItem([gid, ""])
+                child.setData(0, _GAME_ROLE, gid)
+                parent.addChild(child)
+            tree.addTopLevelItem(parent)
+        tree.resizeColumnToContents(0)
+        return tree
+
+    def _build_unused_tree(self) -> QTreeWidget:
+        tree = self._new_tree(["File", "Kind"])
+        for path in self._report.unused:
+            item = QTreeWidgetItem([self._rel(path), self._report.kinds.get(path, "")])
+            item.setToolTip(0, str(path))
+            tree.addTopLevelItem(item)
+        tree.resizeColumnToContents(0)
+        return tree
+
+    def _build_dangling_tree(self) -> QTreeWidget:
+        tree = self._new_tree(["Game", "Flag", "Value", "Local Path"])
+        for ref in self._report.dangling:
+            tree.addTopLevelItem(self._game_item(ref, [ref.game_id, ref.flag, ref.value, self._rel(ref.path)]))
+        for col in range(3):
+            tree.resizeColumnToContents(col)
+        return tree
+
+    def _item_double_clicked(self, item: QTreeWidgetItem, _column: int) -> None:
+        gid = item.data(0, _GAME_ROLE)
+        if gid and self._on_select_game is not None:
+            self._on_select_game(str(gid))
+
+    def _export_json(self) -> None:
+        start = Path(get_start_dir(self._report.root)) / "helper_files.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Export Helper Files Report", str(start), "JSON (*.json)")
+        if not path:
+            return
+        remember_path(path)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self._report.to_json(), f, indent=2, ensure_ascii=False)
+                f.write("\n")
+        except Exception as e:
+            QMessageBox.critical(self, "Export failed", str(e))
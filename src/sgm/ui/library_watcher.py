@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+
+def _norm(path: str | Path) -> str:
+    return os.path.normcase(os.path.normpath(str(path)))
+
+
+class LibraryWatcher(QObject):
+    """Watches the folders of a games library and reports changes in batches.
+
+    QFileSystemWatcher emits one signal per event, and a single edit often
+    produces several (an image save writes a temp file and renames it; a move
+    touches two folders). Events are coalesced with a short timer and
+    delivered as one list of changed directories.
+
+    Changes the window already applied itself can be acknowledged with
+    mark_synced(); a directory whose mtime still matches is then skipped.
+    """
+
+    directories_changed = Signal(list)
+
+    def __init__(self, parent: QObject | None = None, *, delay_ms: int = 200):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(0, int(delay_ms)))
+        self._timer.timeout.connect(self._flush)
+
+        self._pending: dict[str, str] = {}
+        self._synced: dict[str, int] = {}
+
+    def set_directories(self, paths: Iterable[Path]) -> None:
+        want = {_norm(p): str(p) for p in paths}
+        have = {_norm(p): p for p in self._watcher.directories()}
+
+        remove = [p for k, p in have.items() if k not in want]
+        add = [p for k, p in want.items() if k not in have]
+        if remove:
+            self._watcher.removePaths(remove)
+        if add:
+            # Paths that cannot be watched (gone, or over the OS watch limit)
+            # are returned and simply stay unwatched.
+            self._watcher.addPaths(add)
+
+        self._synced = {k: v for k, v in self._synced.items() if k in want}
+
+    def clear(self) -> None:
+        self.set_directories([])
+        self._pending = {}
+        self._timer.stop()
+
+    def mark_synced(self, paths: Iterable[Path]) -> None:
+        for p in paths:
+            key = _norm(p)
+            try:
+                self._synced[key] = os.stat(p).st_mtime_ns
+            except OSError:
+                self._synced.pop(key, None)
+
+    def _on_directory_changed(self, path: str) -> None:
+        self._pending[_norm(path)] = path
+        self._timer.start()
+
+    def _flush(self) -> None:
+        pending = self._pending
+        self._pending = {}
+
+        changed: list[Path] = []
+        for key, path in sorted(pending.items()):
+            try:
+                mtime_ns: int | None = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns is not None and self._synced.get(key) == mtime_ns:
+                continue
+            self._synced.pop(key, None)
+            changed.append(Path(path))
+
+        if changed:
+            self.directories_changed.emit(changed)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import copy
 import json
-import shlex
 from dataclasses import dataclass
-from pathlib import Path, PurePosixPath
+from pathlib import Path
 import os
 import subprocess
+import time
+from collections import deque
+from typing import Callable
 
-from PySide6.QtCore import QEvent, QObject, QSignalBlocker, QSize, Qt, QTimer, QUrl
+from PySide6.QtCore import QEvent, QModelIndex, QObject, QSignalBlocker, QSize, Qt, QTimer, QUrl, Signal
 from PySide6.QtGui import QBrush, QColor, QIcon, QPainter, QPalette, QDesktopServices, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
@@ -29,7 +32,7 @@ from PySide6.QtWidgets import (
     QMenu,
     QMessageBox,
     QPlainTextEdit,
-    QProgressDialog,
+    QProgressBar,
     QPushButton,
     QFrame,
     QScrollArea,
@@ -39,6 +42,7 @@ from PySide6.QtWidgets import (
     QTabWidget,
     QTextEdit,
     QToolButton,
+    QTreeView,
     QTreeWidget,
     QTreeWidgetItem,
     QVBoxLayout,
@@ -49,13 +53,19 @@ from shiboken6 import isValid
 
 from PySide6.QtWidgets import QStyle
 
+from sgm.analysis_cache import AnalysisCache, file_stamps, read_json_facts
+from sgm.analysis_report import export_report, iter_report_rows, report_format_for
+from sgm.helper_paths import HelperPathIndex
+from sgm.helper_refs import build_helper_reference_report
 from sgm.config import AppConfig
+from sgm.game_search import GameSearchIndex
 from sgm.domain import GameAssets
 from sgm.image_ops import (
     ImageProcessError,
     build_overlay_png_from_file,
     generate_qr_png,
     get_image_size,
+    get_image_sizes,
     save_png_resized_from_file,
 )
 from sgm.resources import resource_path, resources_dir
@@ -68,12 +78,32 @@ from sgm.io_utils import (
     rename_many,
     swap_files,
 )
-from sgm.scanner import _classify, scan_folder
+from sgm.scan_snapshot import ScanSnapshot
+from sgm.warning_index import WarningIndex
+from sgm.warning_rules import (
+    CODE_BITS,
+    WarningContext,
+    WarningRule,
+    codes_to_mask,
+    evaluate_rules,
+    mask_to_codes,
+    reevaluate_rules,
+    rules_for_settings,
+    select_rules,
+    settings_snapshot,
+)
+from sgm.scanner import ScanResult, _classify, diff_scan, scan_directory, scan_folder, scan_game
 from sgm.ui.advanced_json_dialog import AdvancedJsonDialog
+from sgm.ui.helper_refs_dialog import HelperReferencesDialog
+from sgm.ui.analyze_thread import AnalyzeThread
 from sgm.ui.bulk_json_update_dialog import BulkJsonUpdateDialog
+from sgm.ui.games_model import GamesFilterProxyModel, GamesTreeModel
+from sgm.ui.library_watcher import LibraryWatcher
 from sgm.ui.overlay_cleaner_dialog import OverlayImageCleanerDialog
 from sgm.ui.overlay_builder_dialog import OverlayBuilderDialog
+from sgm.ui.scan_thread import ScanThread
 from sgm.ui.settings_dialog import SettingsDialog
+from sgm.ui.thumbnail_cache import ThumbnailCache, ThumbnailStore
 from sgm.ui.widgets import ImageCard, ImageSpec, OverlayCard, OverlayPrimaryCard, SnapshotCard
 from sgm.ui.dialog_state import get_start_dir, remember_path
 from sgm.version import main_window_title
@@ -82,6 +112,8 @@ from sgm.sprint_fs import sprint_name_key, sprint_path_key
 
 ACCEPTED_ADD_EXTS = {".bin", ".int", ".rom", ".cfg", ".json", ".png"}
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp"}
+# A search with at most this many matches opens the folders holding them.
+SEARCH_EXPAND_MAX = 200
 
 
 def _is_hidden_dir(p: Path) -> bool:
@@ -150,16 +182,27 @@ def _is_image_path(p: Path) -> bool:
     return p.suffix.lower() in IMAGE_EXTS
 
 
-class GamesTreeWidget(QTreeWidget):
-    def __init__(self, *, parent: QWidget, on_move_games, on_add_files):
+class GamesTreeView(QTreeView):
+    """The games tree: a view over GamesTreeModel through GamesFilterProxyModel.
+
+    Indexes handed out (currentIndex(), selected_indexes(), indexAt()) are
+    proxy indexes; their UserRole data is the row's info dict.
+    """
+
+    selection_changed = Signal()
+
+    def __init__(self, *, parent: QWidget, model: GamesTreeModel, proxy: GamesFilterProxyModel, on_move_games, on_add_files):
         super().__init__(parent)
         self._on_move_games = on_move_games
         self._on_add_files = on_add_files
         self._drag_game_ids: list[str] = []
         self._drag_source_folders: set[Path] = set()
         self._root_folder: Path | None = None
+        self._games_model = model
+        self._proxy = proxy
+        # Paths of the expanded folder rows, kept from the expand / collapse signals.
+        self._expanded_folders: set[str] = set()
 
-        self._drop_hover_item: QTreeWidgetItem | None = None
         self._root_drop_active: bool = False
         self._base_stylesheet: str = self.styleSheet() or ""
 
@@ -167,9 +210,19 @@ class GamesTreeWidget(QTreeWidget):
         self._root_drop_border_color: str = QColor(hi).name()
         fill = QColor(hi)
         fill.setAlpha(60)
-        self._drop_hover_brush = QBrush(fill)
+        model.set_drop_brush(QBrush(fill))
+
+        self.setModel(proxy)
+        # Re-emitted so that blocking the view's signals also silences selection changes.
+        self.selectionModel().selectionChanged.connect(lambda *_: self.selection_changed.emit())
+        self.expanded.connect(self._folder_expanded)
+        self.collapsed.connect(self._folder_collapsed)
+        # A reset collapses every row; rows the proxy drops (a search hides folders) lose their state.
+        proxy.modelReset.connect(self._expanded_folders.clear)
+        proxy.rowsAboutToBeRemoved.connect(self._rows_about_to_be_removed)
 
         self.setHeaderHidden(True)
+        self.setUniformRowHeights(True)
         self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.setDragEnabled(True)
         self.setAcceptDrops(True)
@@ -179,63 +232,98 @@ class GamesTreeWidget(QTreeWidget):
         self.setAutoScroll(True)
         self.setAutoScrollMargin(24)
 
+    @staticmethod
+    def info(index: QModelIndex) -> dict | None:
+        info = index.data(Qt.ItemDataRole.UserRole) if index.isValid() else None
+        return info if isinstance(info, dict) else None
+
+    def selected_indexes(self) -> list[QModelIndex]:
+        return list(self.selectionModel().selectedRows())
+
+    def view_index(self, source_index: QModelIndex) -> QModelIndex:
+        """The proxy index of a model index; invalid if the filters hide the row."""
+        return self._proxy.mapFromSource(source_index) if source_index.isValid() else QModelIndex()
+
+    def _folder_expanded(self, index: QModelIndex) -> None:
+        info = self.info(index)
+        if info is not None and info.get("type") == "folder":
+            self._expanded_folders.add(str(info.get("path") or ""))
+
+    def _folder_collapsed(self, index: QModelIndex) -> None:
+        info = self.info(index)
+        if info is not None and info.get("type") == "folder":
+            self._expanded_folders.discard(str(info.get("path") or ""))
+
+    def _rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if not self._expanded_folders:
+            return
+        for row in range(first, last + 1):
+            info = self.info(self._proxy.index(row, 0, parent))
+            if info is None or info.get("type") != "folder":
+                # Folders come first.
+                break
+            path = str(info.get("path") or "")
+            prefix = path + os.sep
+            self._expanded_folders = {p for p in self._expanded_folders if p != path and not p.startswith(prefix)}
+
+    def expand_folder(self, index: QModelIndex) -> None:
+        """expand(), and remember it even while the view's signals are blocked."""
+        if index.isValid():
+            self.expand(index)
+            self._folder_expanded(index)
+
+    def expanded_folders(self) -> set[str]:
+        return set(self._expanded_folders)
+
     def _set_root_drop_active(self, active: bool) -> None:
         if self._root_drop_active == active:
             return
         self._root_drop_active = active
         if active:
-            extra = f"\nQTreeWidget {{ border: 2px dashed {self._root_drop_border_color}; }}\n"
+            extra = f"\nQTreeView {{ border: 2px dashed {self._root_drop_border_color}; }}\n"
             self.setStyleSheet(self._base_stylesheet + extra)
         else:
             self.setStyleSheet(self._base_stylesheet)
 
-    def _set_drop_hover_item(self, item: QTreeWidgetItem | None) -> None:
-        if self._drop_hover_item is item:
-            return
-        if self._drop_hover_item is not None:
-            try:
-                if isValid(self._drop_hover_item):
-                    for col in range(max(1, self.columnCount())):
-                        self._drop_hover_item.setBackground(col, QBrush())
-            except Exception:
-                pass
-        self._drop_hover_item = item
-        if item is not None:
-            try:
-                if isValid(item):
-                    for col in range(max(1, self.columnCount())):
-                        item.setBackground(col, self._drop_hover_brush)
-            except Exception:
-                pass
+    def _set_drop_hover_index(self, index: QModelIndex | None) -> None:
+        info = self.info(index) if index is not None else None
+        rel = None
+        if info is not None and info.get("type") == "folder":
+            rel = self._games_model.rel_folder(Path(str(info.get("path") or "")))
+        self._games_model.set_drop_target(rel)
+
+    def _folder_index_of(self, index: QModelIndex) -> QModelIndex | None:
+        """The folder row `index` drops into: itself for a folder, its parent folder for a game, None for the root."""
+
+        info = self.info(index)
+        if info is not None and info.get("type") == "folder":
+            return index
+        if info is not None and info.get("type") == "game":
+            parent = index.parent()
+            pinfo = self.info(parent)
+            if pinfo is not None and pinfo.get("type") == "folder":
+                return parent
+        return None
 
     def _update_drop_visuals(self, pos) -> None:
-        item = self.itemAt(pos)
-        if item is None:
-            self._set_drop_hover_item(None)
+        index = self.indexAt(pos)
+        if not index.isValid():
+            self._set_drop_hover_index(None)
             self._set_root_drop_active(True)
             return
 
-        info = item.data(0, Qt.ItemDataRole.UserRole)
-        if isinstance(info, dict) and info.get("type") == "folder":
-            self._set_drop_hover_item(item)
-            self._set_root_drop_active(False)
-            return
-        if isinstance(info, dict) and info.get("type") == "game":
-            parent = item.parent()
-            pinfo = parent.data(0, Qt.ItemDataRole.UserRole) if parent is not None else None
-            if isinstance(pinfo, dict) and pinfo.get("type") == "folder":
-                self._set_drop_hover_item(parent)
-                self._set_root_drop_active(False)
-                return
-            self._set_drop_hover_item(None)
-            self._set_root_drop_active(True)
+        info = self.info(index)
+        if info is not None and info.get("type") in {"folder", "game"}:
+            folder = self._folder_index_of(index)
+            self._set_drop_hover_index(folder)
+            self._set_root_drop_active(folder is None)
             return
 
-        self._set_drop_hover_item(None)
+        self._set_drop_hover_index(None)
         self._set_root_drop_active(False)
 
     def _clear_drop_visuals(self) -> None:
-        self._set_drop_hover_item(None)
+        self._set_drop_hover_index(None)
         self._set_root_drop_active(False)
 
     def set_root_folder(self, folder: Path | None) -> None:
@@ -272,9 +360,9 @@ class GamesTreeWidget(QTreeWidget):
         self._drag_source_folders = set()
 
         # Drag all selected games (folders are ignored).
-        for item in self.selectedItems() or []:
-            info = item.data(0, Qt.ItemDataRole.UserRole) if item is not None else None
-            if not isinstance(info, dict) or info.get("type") != "game":
+        for index in self.selected_indexes():
+            info = self.info(index)
+            if info is None or info.get("type") != "game":
                 continue
 
             game_id = str(info.get("id") or "").strip()
@@ -285,15 +373,14 @@ class GamesTreeWidget(QTreeWidget):
 
             # Track source folders for no-op drops (same-folder drop).
             src_folder: Path | None = None
-            p = info.get("folder") if isinstance(info, dict) else None
+            p = info.get("folder")
             if p:
                 try:
                     src_folder = Path(str(p))
                 except Exception:
                     src_folder = None
-            parent = item.parent() if item is not None else None
-            pinfo = parent.data(0, Qt.ItemDataRole.UserRole) if parent is not None else None
-            if isinstance(pinfo, dict) and pinfo.get("type") == "folder":
+            pinfo = self.info(index.parent())
+            if pinfo is not None and pinfo.get("type") == "folder":
                 p = pinfo.get("path")
                 if p:
                     try:
@@ -314,8 +401,8 @@ class GamesTreeWidget(QTreeWidget):
         # External file drops (from Explorer) should be allowed over folders
         # (and over games, where we treat it as that game's parent folder).
         if event.mimeData().hasUrls():
-            item = self.itemAt(pos)
-            if item is None:
+            index = self.indexAt(pos)
+            if not index.isValid():
                 if self._root_folder is not None:
                     self._update_drop_visuals(pos)
                     event.acceptProposedAction()
@@ -324,8 +411,8 @@ class GamesTreeWidget(QTreeWidget):
                 event.ignore()
                 return
 
-            info = item.data(0, Qt.ItemDataRole.UserRole)
-            if isinstance(info, dict) and info.get("type") in {"folder", "game"}:
+            info = self.info(index)
+            if info is not None and info.get("type") in {"folder", "game"}:
                 self._update_drop_visuals(pos)
                 event.acceptProposedAction()
                 return
@@ -338,8 +425,8 @@ class GamesTreeWidget(QTreeWidget):
             self._clear_drop_visuals()
             event.ignore()
             return
-        item = self.itemAt(pos)
-        if item is None:
+        index = self.indexAt(pos)
+        if not index.isValid():
             if self._root_folder is not None:
                 self._update_drop_visuals(pos)
                 event.acceptProposedAction()
@@ -348,41 +435,32 @@ class GamesTreeWidget(QTreeWidget):
             event.ignore()
             return
 
-        info = item.data(0, Qt.ItemDataRole.UserRole)
-        if isinstance(info, dict) and info.get("type") == "folder":
+        if self._folder_index_of(index) is not None:
             self._update_drop_visuals(pos)
             event.acceptProposedAction()
             return
-        if isinstance(info, dict) and info.get("type") == "game":
-            parent = item.parent()
-            pinfo = parent.data(0, Qt.ItemDataRole.UserRole) if parent is not None else None
-            if isinstance(pinfo, dict) and pinfo.get("type") == "folder":
-                self._update_drop_visuals(pos)
-                event.acceptProposedAction()
-                return
         self._clear_drop_visuals()
         event.ignore()
 
+    def _drop_destination(self, pos) -> str | None:
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return str(self._root_folder) if self._root_folder is not None else None
+        info = self.info(index)
+        if info is None or info.get("type") not in {"folder", "game"}:
+            return None
+        folder = self._folder_index_of(index)
+        if folder is None:
+            if info.get("type") == "game" and not index.parent().isValid():
+                return str(self._root_folder) if self._root_folder is not None else None
+            return None
+        finfo = self.info(folder)
+        return finfo.get("path") if finfo is not None else None
+
     def dropEvent(self, event) -> None:
         try:
             if event.mimeData().hasUrls():
-                item = self.itemAt(event.position().toPoint())
-                if item is None:
-                    dest = str(self._root_folder) if self._root_folder is not None else None
-                else:
-                    info = item.data(0, Qt.ItemDataRole.UserRole)
-                    if isinstance(info, dict) and info.get("type") == "folder":
-                        dest = info.get("path")
-                    elif isinstance(info, dict) and info.get("type") == "game":
-                        parent = item.parent()
-                        if parent is None:
-                            dest = str(self._root_folder) if self._root_folder is not None else None
-                        else:
-                            pinfo = parent.data(0, Qt.ItemDataRole.UserRole) if parent is not None else None
-                            dest = pinfo.get("path") if isinstance(pinfo, dict) and pinfo.get("type") == "folder" else None
-                    else:
-                        dest = None
-
+                dest = self._drop_destination(event.position().toPoint())
                 if not dest:
                     event.ignore()
                     return
@@ -414,30 +492,13 @@ class GamesTreeWidget(QTreeWidget):
                 event.ignore()
                 return
 
-            item = self.itemAt(event.position().toPoint())
-            if item is None:
-                dest = str(self._root_folder) if self._root_folder is not None else None
-            else:
-                info = item.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(info, dict) and info.get("type") == "folder":
-                    dest = info.get("path")
-                elif isinstance(info, dict) and info.get("type") == "game":
-                    parent = item.parent()
-                    if parent is None:
-                        dest = str(self._root_folder) if self._root_folder is not None else None
-                    else:
-                        pinfo = parent.data(0, Qt.ItemDataRole.UserRole) if parent is not None else None
-                        dest = pinfo.get("path") if isinstance(pinfo, dict) and pinfo.get("type") == "folder" else None
-                else:
-                    dest = None
-
+            dest = self._drop_destination(event.position().toPoint())
             if not dest:
                 event.ignore()
                 return
 
             dest_folder = Path(dest)
-            # Dropping onto the same folder should be a no-op. If we accept the move,
-            # Qt's internal drag handling may remove the item until a refresh.
+            # Dropping onto the same folder should be a no-op.
             if len(src_folders) == 1:
                 src_folder = next(iter(src_folders))
                 try:
@@ -2042,19 +2103,67 @@ class MainWindow(QMainWindow):
         self._folder_assets: dict[str, GameAssets] = {}
         self._palette_files: list[Path] = []
         self._keyboard_files: list[Path] = []
+        # Folder nodes of the tree, as reported by the scanner.
+        self._directories: list[Path] = []
+        # Parent -> child directories of `_directories`, for the file watcher's checks.
+        self._subdirectories: dict[Path, set[Path]] = {}
+        self._scan_snapshot: ScanSnapshot | None = None
+        self._analysis_cache: AnalysisCache | None = None
+        # Image card thumbnails; backed by <folder>/.sgm/thumbs once a folder is loaded.
+        self._thumbnails = ThumbnailCache(self)
+        # Existence of jzintv_extra flag targets; None until needed or after helper files change.
+        self._helper_paths: HelperPathIndex | None = None
         self._current: str | None = None
 
         self._analysis_enabled: bool = False
-        self._analysis_by_game: dict[str, set[str]] = {}
+        self._analysis_by_game: WarningIndex = WarningIndex()
         self._analysis_include_json_checks: bool = False
+        # Per analyzed game, the file_stamps() taken before computing its codes,
+        # and the settings the codes were computed with (see refresh()).
+        self._analysis_stamps: dict[str, tuple | None] = {}
+        self._analysis_settings: dict | None = None
         self._filter_checks: dict[str, QCheckBox] = {}
+        self._filter_labels: dict[str, str] = {}
+        # The (enabled code mask, only-with-warnings) the tree was last filtered with.
+        self._filters_applied: tuple[int, bool] | None = None
         self._list_panel: QWidget | None = None
         self._filters_scroll: QScrollArea | None = None
 
         self._force_expand_folder_paths: set[str] = set()
         self._post_move_select_id: str | None = None
+
+        # Search box (see _apply_search): keys of the scanned games, the ids matching
+        # the search (None: no search) and the folders holding shown matches.
+        self._search_index = GameSearchIndex()
+        self._search_matches: set[str] | None = None
+        self._search_folders: set[Path] | None = None
+        self._search_expanded_before: set[str] = set()
+        # Reads metadata names into the search index once the search box is used.
+        self._search_names_thread: AnalyzeThread | None = None
+        # Reads metadata for the Helper Files report; game id -> JSON facts read so far.
+        self._helper_refs_thread: AnalyzeThread | None = None
+        self._helper_refs_facts: dict[str, dict | None] = {}
+
+        # Turns external changes in the games folder into per-game updates.
+        self._watcher = LibraryWatcher(self)
+        self._watcher.directories_changed.connect(self._watched_directories_changed)
+
+        # Background scan started by load_folder()/Refresh (see _start_scan).
+        self._scan_thread: ScanThread | None = None
+        self._scanning: bool = False
+        self._scan_queue: deque = deque()
+        self._scan_completed: bool | None = None
+        self._scan_drain_pending: bool = False
+        self._scan_expanded: set[str] = set()
+        self._scan_select: str | None = None
         self._has_any_folders: bool = False
 
+        # Background Analyze (see _analyze_folder).
+        self._analyze_thread: AnalyzeThread | None = None
+        self._analyze_games: dict[str, GameAssets] = {}
+        self._analyze_done: int = 0
+        self._analyze_started: float = 0.0
+
         self._multi_selected_game_ids: list[str] = []
 
         self.setWindowTitle(main_window_title())
@@ -2140,8 +2249,52 @@ class MainWindow(QMainWindow):
         self._lbl_game_count = QLabel("Games: 0")
         list_l.addWidget(self._lbl_game_count)
 
-        self._tree = GamesTreeWidget(parent=self, on_move_games=self._move_games_to_folder, on_add_files=self._add_files_to_folder)
-        self._tree.itemSelectionChanged.connect(self._tree_selection_changed)
+        self._scan_progress = QWidget()
+        scan_row = QHBoxLayout(self._scan_progress)
+        scan_row.setContentsMargins(0, 0, 0, 0)
+        scan_row.setSpacing(6)
+        self._lbl_scan = QLabel("Scanning...")
+        scan_row.addWidget(self._lbl_scan)
+        self._scan_bar = QProgressBar()
+        self._scan_bar.setRange(0, 0)
+        self._scan_bar.setTextVisible(False)
+        self._scan_bar.setMaximumHeight(12)
+        scan_row.addWidget(self._scan_bar, 1)
+        self._btn_cancel_scan = QPushButton("Cancel")
+        self._btn_cancel_scan.setToolTip("Stop scanning; games found so far stay in the list")
+        self._btn_cancel_scan.setMaximumHeight(24)
+        self._btn_cancel_scan.clicked.connect(self._cancel_scan_clicked)
+        scan_row.addWidget(self._btn_cancel_scan)
+        self._scan_progress.setVisible(False)
+        list_l.addWidget(self._scan_progress)
+
+        self._search_edit = QLineEdit()
+        self._search_edit.setPlaceholderText("Search games, names, folders")
+        self._search_edit.setToolTip("Show the games whose file name, metadata name or folder contains every word")
+        self._search_edit.setClearButtonEnabled(True)
+        self._search_edit.textChanged.connect(self._apply_search)
+        list_l.addWidget(self._search_edit)
+
+        # The tree shows every scanned game; the proxy applies the Analyze filters and the search.
+        self._games_model = GamesTreeModel(
+            game_for=lambda gid: self._games.get(gid),
+            folder_icon=self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon),
+            game_icon=self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon),
+            parent=self,
+        )
+        self._games_model.set_flagged(self._game_is_flagged)
+        self._games_proxy = GamesFilterProxyModel(self)
+        self._games_proxy.setSourceModel(self._games_model)
+        self._games_proxy.set_game_filter(self._game_is_shown)
+        self._games_proxy.set_folder_filter(self._folder_is_shown)
+        self._tree = GamesTreeView(
+            parent=self,
+            model=self._games_model,
+            proxy=self._games_proxy,
+            on_move_games=self._move_games_to_folder,
+            on_add_files=self._add_files_to_folder,
+        )
+        self._tree.selection_changed.connect(self._tree_selection_changed)
         self._tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self._tree.customContextMenuRequested.connect(self._show_tree_context_menu)
         list_l.addWidget(self._tree, 1)
@@ -2168,6 +2321,22 @@ class MainWindow(QMainWindow):
         self._btn_analyze.setMaximumHeight(24)
         self._btn_analyze.clicked.connect(self._analyze_folder)
         row.addWidget(self._btn_analyze)
+        self._btn_helper_refs = QPushButton("Helper Files")
+        self._btn_helper_refs.setToolTip(
+            "Show which games use each palette / keyboard file, the files no game uses "
+            "and jzintv_extra references to missing files."
+        )
+        self._btn_helper_refs.setMaximumHeight(24)
+        self._btn_helper_refs.clicked.connect(self._open_helper_references)
+        row.addWidget(self._btn_helper_refs)
+        self._btn_export_analysis = QPushButton("Export...")
+        self._btn_export_analysis.setToolTip(
+            "Save the analysis results (files, image sizes and warning codes per game) as CSV or JSON Lines"
+        )
+        self._btn_export_analysis.setMaximumHeight(24)
+        self._btn_export_analysis.setEnabled(False)
+        self._btn_export_analysis.clicked.connect(self._export_analysis)
+        row.addWidget(self._btn_export_analysis)
         analyze_l.addLayout(row)
 
         self._chk_include_json_checks = QCheckBox("Include JSON Checks")
@@ -2182,9 +2351,25 @@ class MainWindow(QMainWindow):
         self._lbl_analyze.setVisible(False)
         analyze_l.addWidget(self._lbl_analyze)
 
+        self._analyze_progress = QWidget()
+        progress_row = QHBoxLayout(self._analyze_progress)
+        progress_row.setContentsMargins(0, 0, 0, 0)
+        progress_row.setSpacing(6)
+        self._analyze_bar = QProgressBar()
+        self._analyze_bar.setTextVisible(False)
+        self._analyze_bar.setMaximumHeight(12)
+        progress_row.addWidget(self._analyze_bar, 1)
+        self._btn_cancel_analyze = QPushButton("Cancel")
+        self._btn_cancel_analyze.setToolTip("Stop analyzing; games analyzed so far keep their warnings")
+        self._btn_cancel_analyze.setMaximumHeight(24)
+        self._btn_cancel_analyze.clicked.connect(self._cancel_analyze_clicked)
+        progress_row.addWidget(self._btn_cancel_analyze)
+        self._analyze_progress.setVisible(False)
+        analyze_l.addWidget(self._analyze_progress)
+
         self._chk_only_warnings = QCheckBox("Only games with warnings")
         self._chk_only_warnings.setEnabled(False)
-        self._chk_only_warnings.stateChanged.connect(lambda _=None: self._rebuild_game_list())
+        self._chk_only_warnings.stateChanged.connect(lambda _=None: self._apply_warning_filters())
         analyze_l.addWidget(self._chk_only_warnings)
 
         found_row = QHBoxLayout()
@@ -2244,7 +2429,7 @@ class MainWindow(QMainWindow):
         self._init_analyze_filters()
 
     def _tree_selection_changed(self) -> None:
-        items = list(self._tree.selectedItems() or []) if hasattr(self, "_tree") else []
+        items = self._tree.selected_indexes() if hasattr(self, "_tree") else []
         if len(items) != 1:
             prev = self._current
             if prev is not None and self._meta_editor.has_unsaved_changes():
@@ -2330,8 +2515,7 @@ class MainWindow(QMainWindow):
                 self._select_multi(items)
             return
 
-        item = items[0]
-        info = item.data(0, Qt.ItemDataRole.UserRole) if item is not None else None
+        info = GamesTreeView.info(items[0])
         if isinstance(info, dict) and info.get("type") == "game":
             self._select_game(str(info.get("id") or ""))
             return
@@ -2351,6 +2535,7 @@ class MainWindow(QMainWindow):
     def load_folder(self, folder: Path) -> None:
         self._reset_analysis_state()
         self._folder = folder
+        self._thumbnails.set_store(self._thumbnail_store_for(folder))
         self._lbl_folder.setText(str(folder))
 
         self._config.last_game_folder = str(folder)
@@ -2359,12 +2544,12 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-        self.refresh()
+        self._start_scan()
 
     def _refresh_clicked(self) -> None:
         # Manual refresh resets Analyze results; user must Analyze again to filter.
         self._reset_analysis_state()
-        self.refresh()
+        self._start_scan()
 
     def _open_ini_clicked(self) -> None:
         try:
@@ -2377,10 +2562,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Open sgm.ini", str(e))
 
     def _show_tree_context_menu(self, pos) -> None:
-        item = self._tree.itemAt(pos)
-        if item is None:
-            return
-        info = item.data(0, Qt.ItemDataRole.UserRole)
+        info = GamesTreeView.info(self._tree.indexAt(pos))
         if not isinstance(info, dict):
             return
         path_str = None
@@ -2469,7 +2651,7 @@ class MainWindow(QMainWindow):
                     self._meta_editor.set_preferred_language(self._config.language)
                 except Exception:
                     pass
-            self.refresh(preserve_metadata_edits=True)
+            self._apply_analysis_settings()
             return
 
         if key == "MetadataEditors":
@@ -2480,20 +2662,22 @@ class MainWindow(QMainWindow):
                     pass
             return
 
-        if key in {
-            "PaletteExtensions",
-            "DesiredMaxBaseFileLength",
-            "DesiredNumberOfSnaps",
-        }:
+        if key == "PaletteExtensions":
+            # Changes which files the scan treats as palettes.
             self.refresh(preserve_metadata_edits=True)
             return
 
+        if key in {"DesiredMaxBaseFileLength", "DesiredNumberOfSnaps"}:
+            self._apply_analysis_settings()
+            return
+
         if key == "MaxDescLength":
             if hasattr(self, "_meta_editor"):
                 try:
                     self._meta_editor.refresh_desc_count()
                 except Exception:
                     pass
+            self._apply_analysis_settings()
             return
 
         if key == "AutoSaveJson":
@@ -2516,12 +2700,17 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Open Config", str(e))
 
     def _reset_analysis_state(self) -> None:
+        self._stop_analysis()
         self._analysis_enabled = False
-        self._analysis_by_game = {}
+        self._analysis_by_game = WarningIndex()
+        self._analysis_stamps = {}
+        self._analysis_settings = None
 
         if hasattr(self, "_lbl_analyze"):
             self._lbl_analyze.setText("")
             self._lbl_analyze.setVisible(False)
+        if hasattr(self, "_btn_export_analysis"):
+            self._btn_export_analysis.setEnabled(False)
         if hasattr(self, "_chk_only_warnings"):
             with QSignalBlocker(self._chk_only_warnings):
                 self._chk_only_warnings.setChecked(False)
@@ -2535,21 +2724,336 @@ class MainWindow(QMainWindow):
 
         self._update_filter_visibility()
 
-    def refresh(self, *, preserve_metadata_edits: bool = False) -> None:
+    def _scan_snapshot_for(self, folder: Path) -> ScanSnapshot | None:
+        if not bool(getattr(self._config, "scan_cache", True)):
+            self._scan_snapshot = None
+            return None
+        if self._scan_snapshot is None or self._scan_snapshot.root != folder:
+            self._scan_snapshot = ScanSnapshot.open(folder)
+        return self._scan_snapshot
+
+    def _analysis_cache_for(self, folder: Path | None) -> AnalysisCache | None:
+        if folder is None or not bool(getattr(self._config, "analysis_cache", True)):
+            self._close_analysis_cache()
+            return None
+        if self._analysis_cache is None or self._analysis_cache.root != folder:
+            self._close_analysis_cache()
+            self._analysis_cache = AnalysisCache.open(folder)
+        return self._analysis_cache
+
+    def _thumbnail_store_for(self, folder: Path | None) -> ThumbnailStore | None:
+        if folder is None or not bool(getattr(self._config, "thumbnail_cache", True)):
+            return None
+        store = self._thumbnails.store
+        if store is None or store.root != folder:
+            mb = int(getattr(self._config, "thumbnail_cache_mb", 64) or 0)
+            store = ThumbnailStore(folder, max_bytes=mb * 1024 * 1024)
+        return store
+
+    def _close_analysis_cache(self) -> None:
+        cache, self._analysis_cache = self._analysis_cache, None
+        if cache is not None:
+            cache.save()
+            cache.close()
+
+    def _begin_full_analysis(self) -> None:
+        cache = self._analysis_cache_for(self._folder)
+        if cache is not None:
+            cache.begin_analysis()
+
+    def _save_analysis_cache(self, *, prune: bool = False) -> None:
+        if self._analysis_cache is not None:
+            self._analysis_cache.save(prune=prune)
+
+    def _image_sizes(self, paths: list[Path | None]) -> dict[Path, tuple[int, int] | None]:
+        cache = self._analysis_cache_for(self._folder)
+        if cache is not None:
+            return cache.image_sizes(paths)
+        return get_image_sizes(paths)
+
+    def _image_size(self, path: Path) -> tuple[int, int] | None:
+        cache = self._analysis_cache_for(self._folder)
+        if cache is not None:
+            return cache.image_size(path)
+        return get_image_size(path)
+
+    def _json_facts(self, path: Path) -> dict | None:
+        cache = self._analysis_cache_for(self._folder)
+        if cache is not None:
+            return cache.json_facts(path)
+        return read_json_facts(path)
+
+    def _start_scan(self) -> None:
+        """Rescan the games folder on a background thread, filling the tree as folders are read."""
+
+        if not self._folder:
+            return
+        self._stop_scan()
+        self._stop_search_names()
+        self._stop_helper_references()
+        folder = self._folder
+
+        self._scan_expanded = self._expanded_folder_paths() | set(self._force_expand_folder_paths)
+        self._scan_select = self._current
+        self._watcher.clear()
+
+        self._games = {}
+        self._folder_assets = {}
+        self._palette_files = []
+        self._keyboard_files = []
+        self._helper_paths = None
+        self._directories = []
+        self._subdirectories = {}
+        self._search_index.clear()
+        self._filters_applied = self._warning_filters()
+        self._tree.blockSignals(True)
+        self._games_model.reset(folder, (), ())
+        self._refilter_search()
+        self._tree.blockSignals(False)
+        self._tree.set_root_folder(folder)
+        self._has_any_folders = False
+        self._update_game_count_label(showing=0, total=0)
+
+        thread = ScanThread(
+            folder,
+            palette_exts=set(self._config.palette_extensions or []),
+            workers=self._config.scan_workers,
+            snapshot=self._scan_snapshot_for(folder),
+            parent=self,
+        )
+        thread.batch_ready.connect(lambda batch, t=thread: self._scan_batch_ready(t, batch))
+        thread.scan_finished.connect(lambda completed, t=thread: self._scan_finished(t, completed))
+        self._scan_thread = thread
+        self._scanning = True
+        self._scan_completed = None
+
+        self._lbl_scan.setText("Scanning...")
+        self._btn_cancel_scan.setEnabled(True)
+        self._scan_progress.setVisible(True)
+        self._btn_analyze.setEnabled(False)
+        self._btn_helper_refs.setEnabled(False)
+        thread.start()
+
+    def _cancel_scan_clicked(self) -> None:
+        if self._scan_thread is None:
+            return
+        self._btn_cancel_scan.setEnabled(False)
+        self._lbl_scan.setText("Cancelling...")
+        self._scan_thread.requestInterruption()
+
+    def _stop_scan(self) -> None:
+        """Stop a background scan and wait for it; results not yet shown are dropped."""
+
+        if not self._scanning:
+            return
+        self._scanning = False
+        self._scan_queue.clear()
+        thread = self._scan_thread
+        self._scan_thread = None
+        if thread is not None:
+            thread.requestInterruption()
+            thread.wait()
+            thread.deleteLater()
+        self._scan_progress.setVisible(False)
+        self._btn_analyze.setEnabled(True)
+        self._btn_helper_refs.setEnabled(True)
+
+    def _scan_batch_ready(self, thread: ScanThread, batch: list) -> None:
+        if thread is not self._scan_thread:
+            return
+        self._scan_queue.extend(batch)
+        self._schedule_scan_drain()
+
+    def _scan_finished(self, thread: ScanThread, completed: bool) -> None:
+        if thread is not self._scan_thread:
+            return
+        self._scan_thread = None
+        thread.wait()
+        thread.deleteLater()
+        self._scan_completed = completed
+        self._schedule_scan_drain()
+
+    def _schedule_scan_drain(self) -> None:
+        if self._scan_drain_pending:
+            return
+        self._scan_drain_pending = True
+        QTimer.singleShot(0, self._drain_scan_queue)
+
+    def _drain_scan_queue(self) -> None:
+        # Add scanned directories in short slices so the window stays responsive
+        # while a large library is still being read.
+        self._scan_drain_pending = False
+        if not self._scanning or not self._folder:
+            return
+
+        deadline = time.perf_counter() + 0.03
+        self._tree.blockSignals(True)
+        try:
+            while self._scan_queue:
+                self._add_scanned_directory(self._scan_queue.popleft())
+                if time.perf_counter() >= deadline:
+                    break
+            if self._search_matches is not None:
+                self._refilter_search()
+        finally:
+            self._tree.blockSignals(False)
+
+        self._has_any_folders = self._games_model.has_folders()
+        self._update_game_count_label(showing=len(self._games), total=len(self._games))
+        self._lbl_scan.setText(f"Scanning... {len(self._games)} games")
+
+        # Re-select the previous game/folder once it shows up, unless the user
+        # has picked something else in the meantime.
+        if self._scan_select and self._current == self._scan_select:
+            kind, val = self._current_selection() or ("", "")
+            found = val in self._games
+            if kind == "folder":
+                try:
+                    found = self._games_model.has_folder(Path(val).relative_to(self._folder))
+                except Exception:
+                    found = False
+            if found:
+                self._set_current_in_tree(self._scan_select, silent=False)
+                self._scan_select = None
+
+        if self._scan_queue:
+            self._schedule_scan_drain()
+        elif self._scan_completed is not None:
+            self._finish_scan(self._scan_completed)
+
+    def _add_scanned_directory(self, ds) -> None:
+        root = self._folder
+        result = ds.result
+        self._games.update(result.games)
+        self._folder_assets.update(result.folders)
+        self._palette_files.extend(result.palette_files)
+        self._keyboard_files.extend(result.keyboard_files)
+        self._helper_paths = None
+        self._directories.extend(ds.subdirs)
+        self._index_directories(ds.subdirs)
+        self._index_games_for_search(result.games.items())
+
+        try:
+            rel = ds.path.relative_to(root)
+        except Exception:
+            return
+        if rel != Path(".") and not self._games_model.has_folder(rel):
+            # Hidden subtree: only helper files, no tree nodes.
+            return
+
+        self._games_model.add_folders(rel, ds.subdirs)
+        for d in ds.subdirs:
+            if str(d) in self._scan_expanded:
+                self._tree.expand_folder(self._tree.view_index(self._games_model.index_for_folder(d)))
+
+        # Every directory is reported once, so its games are added after its folder nodes in one go.
+        self._games_model.add_games((game_id, game.folder) for game_id, game in result.games.items())
+
+    def _finish_scan(self, completed: bool) -> None:
+        self._scanning = False
+        self._scan_completed = None
+        self._scan_progress.setVisible(False)
+        self._btn_analyze.setEnabled(True)
+        self._btn_helper_refs.setEnabled(True)
+
+        if self._scan_snapshot is not None:
+            # Only a complete scan knows which directories are gone.
+            self._scan_snapshot.save(prune=completed)
+
+        self._games = dict(sorted(self._games.items(), key=lambda kv: (kv[0].lower(), kv[0])))
+        self._folder_assets = dict(sorted(self._folder_assets.items(), key=lambda kv: (kv[0].lower(), kv[0])))
+        self._palette_files = sorted(self._palette_files, key=lambda p: (str(p).casefold(), str(p)))
+        self._keyboard_files = sorted(self._keyboard_files, key=lambda p: (str(p).casefold(), str(p)))
+        self._helper_paths = None
+        self._directories = sorted(self._directories, key=lambda p: (p.as_posix().lower(), p.as_posix()))
+        self._has_any_folders = self._games_model.has_folders()
+        self._update_watched_directories()
+        self._update_game_count_label(showing=len(self._games), total=len(self._games))
+        if not completed:
+            self._lbl_game_count.setText(f"Games: {len(self._games)} (scan cancelled)")
+        if hasattr(self, "_btn_json_bulk_update"):
+            self._btn_json_bulk_update.setEnabled(bool(self._games))
+
+        pending = self._scan_select
+        self._scan_select = None
+        if pending and self._current == pending:
+            self._set_current_in_tree(pending, silent=False)
+        if not self._tree.currentIndex().isValid() and not self._tree.selected_indexes():
+            self._select_first_game()
+        if self._search_matches is not None:
+            self._load_search_names()
+
+    def closeEvent(self, event) -> None:
+        self._stop_scan()
+        self._stop_analysis()
+        self._stop_search_names()
+        self._stop_helper_references()
+        self._thumbnails.shutdown()
+        self._close_analysis_cache()
+        super().closeEvent(event)
+
+    def refresh(self, *, preserve_metadata_edits: bool = False, changed_dirs: list[Path] | None = None) -> None:
+        """Rescan the games folder synchronously.
+
+        `changed_dirs` are directories already rescanned on their own (by the
+        watcher), whose games' files may have changed although the snapshot
+        serves their listing.
+        """
+
         if not self._folder:
             return
-        scan = scan_folder(self._folder, palette_exts=set(self._config.palette_extensions or []))
+        # A synchronous rescan supersedes a background one.
+        self._stop_scan()
+        # An interrupted analysis goes on in the background after the rescan.
+        resume_analysis = self._analyze_thread is not None
+        self._stop_analysis()
+        snapshot = self._scan_snapshot_for(self._folder)
+        scan = scan_folder(
+            self._folder,
+            palette_exts=set(self._config.palette_extensions or []),
+            workers=self._config.scan_workers,
+            snapshot=snapshot,
+        )
+        if snapshot is not None:
+            snapshot.save()
+        previous = self._current_scan_result()
         self._games = scan.games
         self._folder_assets = scan.folders
         self._palette_files = list(scan.palette_files)
         self._keyboard_files = list(scan.keyboard_files)
+        self._helper_paths = None
+        self._directories = list(scan.directories)
+        self._subdirectories = {}
+        self._index_directories(self._directories)
 
+        diff = diff_scan(previous, scan)
+        codes_changed: set[str] = set()
         if self._analysis_enabled:
-            self._analysis_by_game = {
-                b: self._compute_warning_codes(g, include_json_checks=self._analysis_include_json_checks)
-                for b, g in self._games.items()
-            }
+            # Without a snapshot every directory was read again.
+            reread = set(snapshot.listed_dirs()) | set(changed_dirs or []) if snapshot is not None else None
+            codes_changed, pending = self._reanalyze_after_rescan(
+                set(diff.removed_games),
+                set(diff.added_games) | set(diff.changed_games),
+                helpers_changed=bool(diff.added_helper_files or diff.removed_helper_files),
+                reread_dirs=reread,
+                resume=resume_analysis,
+            )
+            if pending:
+                self._start_analysis_thread(pending)
+            else:
+                self._chk_only_warnings.setEnabled(True)
             self._update_filter_visibility()
+            self._update_analyze_label()
+
+        # Same folder nodes as the current tree: only touch the games that changed.
+        if self._games_model.root == self._folder and not (diff.added_directories or diff.removed_directories):
+            self._apply_tree_changes(
+                set(diff.removed_games),
+                set(diff.added_games) | set(diff.changed_games) | codes_changed,
+                preserve_metadata_edits=preserve_metadata_edits,
+                reselect=True,
+            )
+            return
 
         silent_preserve = bool(preserve_metadata_edits and self._meta_editor.has_unsaved_changes())
         self._rebuild_game_list(preserve=self._current, silent_preserve=silent_preserve)
@@ -2562,6 +3066,425 @@ class MainWindow(QMainWindow):
         if hasattr(self, "_btn_json_bulk_update"):
             self._btn_json_bulk_update.setEnabled(bool(self._games))
 
+    # ---------- incremental updates ----------
+
+    def _analysis_rules(self) -> list[WarningRule]:
+        return select_rules(include_json_checks=self._analysis_include_json_checks)
+
+    def _stale_rules(self, rules: list[WarningRule]) -> list[WarningRule]:
+        """The rules reading settings that changed since the codes were computed."""
+
+        if self._analysis_settings is None:
+            return list(rules)
+        now = settings_snapshot(self._config)
+        changed = {k for k, v in now.items() if self._analysis_settings.get(k) != v}
+        return rules_for_settings(changed, rules)
+
+    def _reevaluate_rules(self, rules: list[WarningRule], game_ids) -> set[str]:
+        """Re-run just `rules` for analyzed games; returns the ids whose codes changed."""
+
+        changed: set[str] = set()
+        for gid in game_ids:
+            old = self._analysis_by_game.get(gid)
+            game = self._games.get(gid)
+            if old is None or game is None:
+                continue
+            new = reevaluate_rules(old, rules, self._warning_context(game))
+            if new != old:
+                self._analysis_by_game[gid] = new
+                changed.add(gid)
+        return changed
+
+    def _analyze_game(self, game: GameAssets, *, include_json_checks: bool) -> tuple[tuple | None, int]:
+        """(file stamp, warning mask) of a game; the stamp is taken first so later edits are noticed."""
+
+        stamp = file_stamps(game.all_path_strs())
+        return stamp, self._compute_warning_mask(game, include_json_checks=include_json_checks)
+
+    def _analysis_worker(self, *, include_json_checks: bool) -> Callable[[GameAssets], tuple[tuple | None, int]]:
+        """_analyze_game() for a worker thread: it only uses what is captured here.
+
+        The config is copied and the cache and helper path index are opened
+        now, so the worker never touches MainWindow state the GUI thread may
+        replace meanwhile.
+        """
+
+        config = copy.deepcopy(self._config)
+        root = self._folder
+        cache = self._analysis_cache_for(root)
+        image_size = cache.image_size if cache is not None else get_image_size
+        json_facts = cache.json_facts if cache is not None else read_json_facts
+        path_exists = self._helper_path_index().exists
+        rules = select_rules(include_json_checks=include_json_checks)
+
+        def analyze(game: GameAssets) -> tuple[tuple | None, int]:
+            stamp = file_stamps(game.all_path_strs())
+            ctx = WarningContext(
+                game, config, root=root, image_size=image_size, json_facts=json_facts, path_exists=path_exists
+            )
+            return stamp, evaluate_rules(rules, ctx)
+
+        return analyze
+
+    def _store_analysis(self, game_id: str) -> None:
+        game = self._games[game_id]
+        stamp, mask = self._analyze_game(game, include_json_checks=self._analysis_include_json_checks)
+        self._analysis_stamps[game_id] = stamp
+        self._analysis_by_game[game_id] = mask
+
+    def _reanalyze_after_rescan(
+        self,
+        removed: set[str],
+        updated: set[str],
+        *,
+        helpers_changed: bool = False,
+        reread_dirs: set[Path] | None = None,
+        resume: bool = False,
+    ) -> tuple[set[str], list[str]]:
+        """Bring _analysis_by_game up to date after a rescan.
+
+        Games that were added or changed in the scan, or whose files'
+        size/mtime moved since they were analyzed, are recomputed. Files are
+        only stat'ed again for games in `reread_dirs` (the directories the
+        scan did not serve from its snapshot; None means all of them). For
+        the rest only the rules reading changed settings are re-run, plus the
+        jzintv_extra rules if helper files came or went.
+
+        Returns the ids whose codes changed, and the ids left for a
+        background run instead: every game if all rules are stale. With
+        `resume` (a background run was interrupted), that is also every game
+        to recompute, including the ones the run had not reached yet.
+        """
+
+        rules = self._analysis_rules()
+        stale = self._stale_rules(rules)
+        if helpers_changed:
+            stale += [r for r in rules if r.library_files and r not in stale]
+        for gid in removed:
+            self._analysis_by_game.pop(gid, None)
+            self._analysis_stamps.pop(gid, None)
+
+        self._analysis_settings = settings_snapshot(self._config)
+        if len(stale) == len(rules):
+            self._begin_full_analysis()
+            return set(), list(self._games)
+
+        changed: set[str] = set()
+        pending: list[str] = []
+        for gid, game in self._games.items():
+            if gid not in updated and gid not in self._analysis_by_game:
+                if resume:
+                    pending.append(gid)
+                continue
+            old_stamp = self._analysis_stamps.get(gid)
+            if gid not in updated:
+                if old_stamp is not None and reread_dirs is not None and game.folder not in reread_dirs:
+                    stamp = old_stamp
+                else:
+                    stamp = file_stamps(game.all_path_strs())
+                if stamp is not None and stamp == old_stamp:
+                    if stale:
+                        changed |= self._reevaluate_rules(stale, [gid])
+                    continue
+            if resume:
+                pending.append(gid)
+                continue
+            before = self._analysis_by_game.get(gid)
+            self._store_analysis(gid)
+            if self._analysis_by_game[gid] != before:
+                changed.add(gid)
+        self._save_analysis_cache()
+        return changed, pending
+
+    def _apply_analysis_settings(self) -> None:
+        """Update warnings after a settings change, re-running only the rules that read changed settings."""
+
+        if self._analyze_thread is not None:
+            # Games analyzed so far used the old settings; start over.
+            self._analyze_folder()
+            return
+        if self._analysis_enabled:
+            stale = self._stale_rules(self._analysis_rules())
+            self._analysis_settings = settings_snapshot(self._config)
+            if stale:
+                changed = self._reevaluate_rules(stale, list(self._analysis_by_game))
+                self._save_analysis_cache()
+                self._sync_game_items(set(), changed)
+                self._update_filter_visibility()
+                self._update_analyze_label()
+        if self._current:
+            self._reselect_current(preserve_metadata_edits=True)
+
+    def _current_scan_result(self) -> ScanResult:
+        return ScanResult(
+            folder=self._folder or Path("."),
+            games=self._games,
+            folders=self._folder_assets,
+            palette_files=self._palette_files,
+            keyboard_files=self._keyboard_files,
+            directories=self._directories,
+        )
+
+    def _update_watched_directories(self) -> None:
+        if not self._folder or not bool(getattr(self._config, "watch_game_folder", True)):
+            self._watcher.clear()
+            return
+        dirs = [self._folder] + [self._folder / rel for rel in self._games_model.folder_rels()]
+        self._watcher.set_directories(dirs)
+
+    def _watched_directories_changed(self, dirs: list[Path]) -> None:
+        self._apply_directory_changes(dirs, preserve_metadata_edits=True)
+
+    def _index_directories(self, dirs: list[Path]) -> None:
+        for d in dirs:
+            self._subdirectories.setdefault(d.parent, set()).add(d)
+
+    def _directory_structure_changed(self, directory: Path, scan: ScanResult) -> bool:
+        """True if the folder nodes directly under `directory` no longer match `scan`."""
+
+        if not self._folder or not directory.is_dir():
+            return True
+        if directory != self._folder and directory not in self._subdirectories.get(directory.parent, ()):
+            return True
+        return set(scan.directories) != self._subdirectories.get(directory, set())
+
+    def _sync_current_assets(self, *, preserve_metadata_edits: bool = True) -> None:
+        """Pick up file changes made to the selected game (or folder) by an edit action."""
+
+        sel = self._current_selection()
+        if sel is not None and sel[0] == "game":
+            self._refresh_game(sel[1], preserve_metadata_edits=preserve_metadata_edits)
+            return
+
+        assets = self._current_assets()
+        if assets is None:
+            self.refresh(preserve_metadata_edits=preserve_metadata_edits)
+            return
+        self._apply_directory_changes(
+            [assets.folder],
+            preserve_metadata_edits=preserve_metadata_edits,
+            force_current=True,
+        )
+
+    def _refresh_game(self, game_id: str, *, preserve_metadata_edits: bool = True) -> None:
+        """Rescan one game's files and patch its entry, analysis and tree item in place."""
+
+        game = self._games.get(game_id)
+        if game is None:
+            self.refresh(preserve_metadata_edits=preserve_metadata_edits)
+            return
+
+        updated = scan_game(game.folder, game.basename)
+        if updated is None:
+            # All files gone (or renamed away): let the directory diff sort it out.
+            self._apply_directory_changes([game.folder], preserve_metadata_edits=preserve_metadata_edits)
+            return
+
+        self._games[game_id] = updated
+        if self._analysis_enabled:
+            self._store_analysis(game_id)
+            self._save_analysis_cache()
+            self._update_filter_visibility()
+        self._sync_game_items(set(), {game_id})
+        # The folder is not marked synced: other games in it may have changed on
+        # disk meanwhile, so the watcher's event re-diffs it (this game then matches).
+
+        if self._current == f"g:{game_id}":
+            self._reselect_current(preserve_metadata_edits=preserve_metadata_edits)
+
+    def _apply_directory_changes(
+        self,
+        dirs: list[Path],
+        *,
+        preserve_metadata_edits: bool = False,
+        force_current: bool = False,
+    ) -> None:
+        """Rescan only `dirs` and patch games, analysis and tree items in place.
+
+        Falls back to a full refresh when a directory was added, removed or
+        renamed, since that changes the folder nodes of the tree. With
+        force_current, the selected game or folder is reloaded even if its file
+        names did not change (e.g. an image was overwritten).
+        """
+
+        if not self._folder:
+            return
+        root = self._folder
+
+        unique: list[Path] = []
+        for d in dirs:
+            if d not in unique:
+                unique.append(d)
+
+        snapshot = self._scan_snapshot_for(root)
+        palette_exts = set(self._config.palette_extensions or [])
+
+        scans: list[tuple[Path, ScanResult]] = []
+        for d in unique:
+            scan = scan_directory(root, d, palette_exts=palette_exts, snapshot=snapshot)
+            if self._directory_structure_changed(d, scan):
+                self.refresh(preserve_metadata_edits=preserve_metadata_edits, changed_dirs=unique)
+                return
+            scans.append((d, scan))
+
+        games = dict(self._games)
+        folders = dict(self._folder_assets)
+        palette_files = list(self._palette_files)
+        keyboard_files = list(self._keyboard_files)
+        added: set[str] = set()
+        removed: set[str] = set()
+        changed: set[str] = set()
+        changed_folders: set[str] = set()
+        helpers_changed = False
+
+        for d, scan in scans:
+            before = ScanResult(
+                folder=root,
+                games={k: g for k, g in games.items() if g.folder == d},
+                folders={k: f for k, f in folders.items() if f.folder == d},
+                palette_files=[p for p in palette_files if p.parent == d],
+                keyboard_files=[p for p in keyboard_files if p.parent == d],
+            )
+            diff = diff_scan(before, scan)
+
+            for k in diff.removed_games:
+                games.pop(k, None)
+            games.update(scan.games)
+            removed.update(diff.removed_games)
+            added.update(diff.added_games)
+            changed.update(diff.changed_games)
+
+            for k in diff.removed_folders:
+                folders.pop(k, None)
+            folders.update(scan.folders)
+            changed_folders.update(diff.added_folders, diff.removed_folders, diff.changed_folders)
+
+            if diff.added_helper_files or diff.removed_helper_files:
+                helpers_changed = True
+                palette_files = [p for p in palette_files if p.parent != d] + scan.palette_files
+                keyboard_files = [p for p in keyboard_files if p.parent != d] + scan.keyboard_files
+
+        if snapshot is not None:
+            snapshot.save(prune=False)
+        self._watcher.mark_synced(unique)
+        # Files may have come or gone at the root, or anywhere a flag points.
+        self._helper_paths = None
+
+        sel = self._current_selection()
+        if force_current and sel is not None:
+            kind, val = sel
+            if kind == "game" and val in games:
+                changed.add(val)
+            elif kind == "folder":
+                changed_folders.add(val)
+
+        if not (added or removed or changed or changed_folders or helpers_changed):
+            return
+
+        self._games = dict(sorted(games.items(), key=lambda kv: (kv[0].lower(), kv[0]))) if added else games
+        self._folder_assets = folders
+        if helpers_changed:
+            self._palette_files = sorted(palette_files, key=lambda p: str(p).casefold())
+            self._keyboard_files = sorted(keyboard_files, key=lambda p: str(p).casefold())
+
+        codes_changed: set[str] = set()
+        if self._analysis_enabled:
+            for k in removed:
+                self._analysis_by_game.pop(k, None)
+                self._analysis_stamps.pop(k, None)
+            for k in added | changed:
+                self._store_analysis(k)
+            if helpers_changed:
+                # Any game's jzintv_extra may point at the helper files that came or went.
+                library_rules = [r for r in self._analysis_rules() if r.library_files]
+                codes_changed = self._reevaluate_rules(library_rules, list(self._analysis_by_game))
+            self._save_analysis_cache()
+            self._update_filter_visibility()
+            self._update_analyze_label()
+
+        self._apply_tree_changes(
+            removed,
+            added | changed | codes_changed,
+            changed_folders=changed_folders,
+            preserve_metadata_edits=preserve_metadata_edits,
+        )
+
+    def _apply_tree_changes(
+        self,
+        removed: set[str],
+        updated: set[str],
+        *,
+        changed_folders: set[str] | None = None,
+        preserve_metadata_edits: bool = False,
+        reselect: bool = False,
+    ) -> None:
+        """Bring the tree and the detail panel in line after games changed.
+
+        Only the items of the given games are touched, so selection, expansion
+        and scroll position stay put. The selected game or folder is reloaded
+        if it is among the changes, or always with reselect=True.
+        """
+
+        self._sync_game_items(removed, updated)
+        self._restore_expanded_folder_paths(self._force_expand_folder_paths)
+        self._update_game_count_label(showing=len(self._games), total=len(self._games))
+        if hasattr(self, "_btn_json_bulk_update"):
+            self._btn_json_bulk_update.setEnabled(bool(self._games))
+
+        sel = self._current_selection()
+        if sel is None:
+            if reselect and not self._tree.selected_indexes():
+                self._select_first_game()
+            return
+        kind, val = sel
+        if kind == "game":
+            if val not in self._games:
+                self._tree.clearSelection()
+                self._select_none()
+            elif reselect or val in updated:
+                self._reselect_current(preserve_metadata_edits=preserve_metadata_edits)
+        elif kind == "folder":
+            if reselect or val in (changed_folders or set()):
+                self._reselect_current(preserve_metadata_edits=preserve_metadata_edits)
+
+    def _sync_game_items(self, removed: set[str], updated: set[str]) -> None:
+        """Remove, add, move or redraw the tree rows of the given game ids.
+
+        Rows the Analyze filters hide stay in the model; the proxy drops them.
+        """
+
+        if not (removed or updated):
+            return
+        blocker = QSignalBlocker(self._tree)
+        try:
+            gone = removed | {gid for gid in updated if gid not in self._games}
+            present = sorted((gid for gid in updated if gid in self._games), key=str.lower)
+            self._search_index.remove(gone)
+            self._index_games_for_search((gid, self._games[gid]) for gid in present)
+            # Their metadata may have changed: names are read again by the next search.
+            self._search_index.forget_names(present)
+            self._games_model.remove_games(gone)
+            self._games_model.add_games((gid, self._games[gid].folder) for gid in present)
+            if self._search_matches is not None:
+                self._refilter_search()
+                self._load_search_names()
+            else:
+                self._games_model.refresh_games(present)
+        finally:
+            _ = blocker
+
+    def _reselect_current(self, *, preserve_metadata_edits: bool) -> None:
+        if preserve_metadata_edits and self._meta_editor.has_unsaved_changes():
+            self._set_current_in_tree(self._current, silent=True)
+            self._refresh_current_details_without_metadata_reload()
+            return
+        before = self._tree.currentIndex()
+        self._set_current_in_tree(self._current, silent=False)
+        after = self._tree.currentIndex()
+        if after.isValid() and after == before and self._tree.selectionModel().isSelected(after):
+            # Same item, so no selection signal fired; reload the details explicitly.
+            self._tree_selection_changed()
+
     def _refresh_current_details_without_metadata_reload(self) -> None:
         sel = self._current_selection()
         if sel is None:
@@ -2691,10 +3614,110 @@ class MainWindow(QMainWindow):
             palette_files=self._palette_files,
             keyboard_files=self._keyboard_files,
             media_prefix=getattr(self._config, "jzintv_media_prefix", "/media/usb0"),
+            helper_paths=self._helper_path_index(),
             on_written=self._meta_editor.reload_from_disk,
         )
         dlg.exec()
 
+    def _open_helper_references(self) -> None:
+        """Read every game's metadata on a background thread, then show the Helper Files report."""
+
+        if not self._folder or self._helper_refs_thread is not None:
+            return
+        games = dict(self._games)
+        # Open the cache here: the worker only reads it.
+        cache = self._analysis_cache_for(self._folder)
+        json_facts = cache.json_facts if cache is not None else read_json_facts
+
+        thread = AnalyzeThread(
+            [(gid, g) for gid, g in games.items() if g.metadata is not None],
+            lambda g: json_facts(g.metadata),
+            parent=self,
+        )
+        thread.results_ready.connect(lambda results, t=thread: self._helper_references_ready(t, results))
+        thread.analysis_finished.connect(
+            lambda completed, t=thread, g=games: self._helper_references_finished(t, completed, g)
+        )
+        self._helper_refs_thread = thread
+        self._helper_refs_facts = {}
+        self._btn_helper_refs.setText("Helper Files (reading...)")
+        thread.start()
+
+    def _helper_references_ready(self, thread: AnalyzeThread, results: dict) -> None:
+        if thread is self._helper_refs_thread:
+            self._helper_refs_facts.update(results)
+
+    def _helper_references_finished(
+        self, thread: AnalyzeThread, completed: bool, games: dict[str, GameAssets]
+    ) -> None:
+        if thread is not self._helper_refs_thread:
+            return
+        self._helper_refs_thread = None
+        thread.wait()
+        thread.deleteLater()
+        self._btn_helper_refs.setText("Helper Files")
+        facts = {games[gid].metadata: data for gid, data in self._helper_refs_facts.items()}
+        self._helper_refs_facts = {}
+        # Metadata read for the report is kept for the next Analyze.
+        self._save_analysis_cache()
+        if not completed or not self._folder:
+            return
+
+        report = build_helper_reference_report(
+            games,
+            root=self._folder,
+            palette_files=self._palette_files,
+            keyboard_files=self._keyboard_files,
+            media_prefix=getattr(self._config, "jzintv_media_prefix", "/media/usb0"),
+            json_facts=facts.get,
+            helper_paths=self._helper_path_index(),
+        )
+        dlg = HelperReferencesDialog(
+            parent=self,
+            report=report,
+            on_select_game=lambda gid: self._set_current_in_tree(f"g:{gid}", silent=False),
+        )
+        dlg.exec()
+
+    def _stop_helper_references(self) -> None:
+        thread, self._helper_refs_thread = self._helper_refs_thread, None
+        self._helper_refs_facts = {}
+        if thread is None:
+            return
+        thread.requestInterruption()
+        thread.wait()
+        thread.deleteLater()
+        self._btn_helper_refs.setText("Helper Files")
+
+    def _export_analysis(self) -> None:
+        if not self._folder or not self._analysis_enabled or self._analyze_thread is not None:
+            return
+
+        start = Path(get_start_dir(self._folder)) / "analysis.csv"
+        path, selected = QFileDialog.getSaveFileName(
+            self,
+            "Export Analysis",
+            str(start),
+            "CSV (*.csv);;JSON Lines (*.jsonl)",
+        )
+        if not path:
+            return
+        remember_path(path)
+        fmt = report_format_for(path, default="jsonl" if "jsonl" in selected else "csv")
+
+        masks = self._analysis_by_game
+        entries = ((gid, game, masks[gid]) for gid, game in self._games.items() if gid in masks)
+        try:
+            export_report(
+                Path(path),
+                iter_report_rows(entries, root=self._folder, image_size=self._image_size),
+                fmt,
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Export failed", str(e))
+        finally:
+            self._save_analysis_cache()
+
     def _open_bulk_json_update(self, game_ids: list[str]) -> None:
         if not self._folder:
             return
@@ -2734,61 +3757,27 @@ class MainWindow(QMainWindow):
         dlg.exec()
         self.refresh()
 
-    def _iter_tree_items(self):
-        def walk(item: QTreeWidgetItem):
-            yield item
-            for i in range(item.childCount()):
-                yield from walk(item.child(i))
-
-        for i in range(self._tree.topLevelItemCount()):
-            yield from walk(self._tree.topLevelItem(i))
-
     def _expanded_folder_paths(self) -> set[str]:
-        expanded: set[str] = set()
-        for item in self._iter_tree_items():
-            info = item.data(0, Qt.ItemDataRole.UserRole)
-            if not isinstance(info, dict) or info.get("type") != "folder":
-                continue
-            try:
-                is_expanded = item.isExpanded()
-            except Exception:
-                try:
-                    is_expanded = bool(self._tree.isItemExpanded(item))
-                except Exception:
-                    is_expanded = False
-            if not is_expanded:
-                continue
-            p = info.get("path")
-            if p:
-                expanded.add(str(p))
-        return expanded
+        return self._tree.expanded_folders()
 
     def _restore_expanded_folder_paths(self, expanded: set[str]) -> None:
-        if not expanded:
-            return
-        for item in self._iter_tree_items():
-            info = item.data(0, Qt.ItemDataRole.UserRole)
-            if not isinstance(info, dict) or info.get("type") != "folder":
-                continue
-            p = info.get("path")
-            if p and str(p) in expanded:
-                self._tree.expandItem(item)
+        for p in expanded or ():
+            self._tree.expand_folder(self._tree.view_index(self._games_model.index_for_folder(Path(p))))
 
     def _selected_tree_folder(self) -> Path | None:
         if not hasattr(self, "_tree"):
             return None
-        item = self._tree.currentItem()
-        if item is None:
+        index = self._tree.currentIndex()
+        if not index.isValid():
             return self._folder
 
-        info = item.data(0, Qt.ItemDataRole.UserRole)
+        info = GamesTreeView.info(index)
         if isinstance(info, dict) and info.get("type") == "folder":
             p = info.get("path")
             return Path(p) if p else self._folder
 
         if isinstance(info, dict) and info.get("type") == "game":
-            parent = item.parent()
-            pinfo = parent.data(0, Qt.ItemDataRole.UserRole) if parent is not None else None
+            pinfo = GamesTreeView.info(index.parent())
             p = pinfo.get("path") if isinstance(pinfo, dict) and pinfo.get("type") == "folder" else None
             return Path(p) if p else self._folder
 
@@ -2953,7 +3942,7 @@ class MainWindow(QMainWindow):
                 def do_refresh() -> None:
                     try:
                         QApplication.processEvents()
-                        self.refresh()
+                        self._apply_directory_changes([dest])
                         if self._folder is not None:
                             try:
                                 is_root = sprint_path_key(dest) == sprint_path_key(self._folder)
@@ -3121,7 +4110,7 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.warning(self, "Copy failed", str(e))
                 return
-            self.refresh()
+            self._apply_directory_changes([dest])
             return
 
         self._move_game_to_folder(game_id, dest)
@@ -3163,7 +4152,7 @@ class MainWindow(QMainWindow):
             self._post_move_select_id = None
             try:
                 QApplication.processEvents()
-                self.refresh()
+                self._apply_directory_changes([game.folder, dest_folder])
                 if sel:
                     self._current = sel
                     self._set_current_in_tree(sel, silent=False)
@@ -3188,6 +4177,7 @@ class MainWindow(QMainWindow):
             ordered.append(g)
 
         moves: list[tuple[Path, Path]] = []
+        touched_dirs: list[Path] = [dest_folder]
         for gid in ordered:
             game = self._games.get(gid)
             if not game:
@@ -3200,6 +4190,7 @@ class MainWindow(QMainWindow):
 
             dest_folder.mkdir(parents=True, exist_ok=True)
             moves.extend(plan_move_game_files(game.folder, dest_folder, game.basename))
+            touched_dirs.append(game.folder)
 
         if not moves:
             return
@@ -3228,7 +4219,7 @@ class MainWindow(QMainWindow):
         def do_refresh() -> None:
             try:
                 QApplication.processEvents()
-                self.refresh()
+                self._apply_directory_changes(touched_dirs)
                 # Select destination folder (root has no visible folder node).
                 if self._folder is not None:
                     try:
@@ -3286,51 +4277,149 @@ class MainWindow(QMainWindow):
             chk = QCheckBox(label)
             chk.setChecked(True)
             chk.setEnabled(False)
-            chk.stateChanged.connect(lambda _=None: self._rebuild_game_list())
+            chk.stateChanged.connect(lambda _=None: self._apply_warning_filters())
             self._filters_l.addWidget(chk)
             self._filter_checks[code] = chk
+            self._filter_labels[code] = label
 
     def _analyze_folder(self) -> None:
-        if not self._folder:
+        """Compute warnings for every game on a background thread.
+
+        Results stream into _analysis_by_game and recolor the tree as games
+        finish; Cancel keeps what was analyzed so far.
+        """
+
+        if not self._folder or self._scanning:
             return
+        self._stop_analysis()
 
-        busy = QProgressDialog("Analyzing...", None, 0, 0, self)
-        busy.setWindowTitle("Analyze")
-        busy.setWindowModality(Qt.WindowModality.ApplicationModal)
-        busy.setCancelButton(None)
-        busy.setMinimumDuration(0)
-        busy.show()
-        QApplication.processEvents()
+        self._analysis_enabled = True
+        self._analysis_include_json_checks = bool(self._chk_include_json_checks.isChecked())
+        self._analysis_by_game = WarningIndex()
+        self._analysis_stamps = {}
+        self._analysis_settings = settings_snapshot(self._config)
 
+        self._begin_full_analysis()
+        self._chk_only_warnings.setEnabled(False)
+        self._update_filter_visibility()
+        self._rebuild_game_list(preserve=self._current, silent_preserve=True)
+        self._start_analysis_thread(list(self._games))
+
+    def _start_analysis_thread(self, game_ids: list[str]) -> None:
+        """Analyze `game_ids` on a background thread, adding to the current results."""
+
+        self._analyze_games = {gid: self._games[gid] for gid in game_ids}
+        self._analyze_done = 0
+        self._analyze_started = time.monotonic()
+        thread = AnalyzeThread(
+            list(self._analyze_games.items()),
+            self._analysis_worker(include_json_checks=self._analysis_include_json_checks),
+            parent=self,
+        )
+        thread.results_ready.connect(lambda results, t=thread: self._analyze_results_ready(t, results))
+        thread.analysis_finished.connect(lambda completed, t=thread: self._analyze_finished(t, completed))
+        self._analyze_thread = thread
+        self._chk_only_warnings.setEnabled(False)
+
+        self._analyze_bar.setRange(0, max(1, len(self._analyze_games)))
+        self._analyze_bar.setValue(0)
+        self._btn_cancel_analyze.setEnabled(True)
+        self._analyze_progress.setVisible(True)
+        self._btn_analyze.setEnabled(False)
+        self._btn_helper_refs.setEnabled(False)
+        self._update_analyze_label()
+        self._lbl_analyze.setVisible(True)
+        thread.start()
+
+    def _cancel_analyze_clicked(self) -> None:
+        if self._analyze_thread is None:
+            return
+        self._btn_cancel_analyze.setEnabled(False)
+        self._analyze_thread.requestInterruption()
+
+    def _stop_analysis(self) -> None:
+        """Stop a background analysis and wait for it; results not yet shown are dropped."""
+
+        thread = self._analyze_thread
+        if thread is None:
+            return
+        self._analyze_thread = None
+        thread.requestInterruption()
+        thread.wait()
+        thread.deleteLater()
+        self._analyze_games = {}
+        self._save_analysis_cache()
+        if hasattr(self, "_analyze_progress"):
+            self._analyze_progress.setVisible(False)
+            self._btn_analyze.setEnabled(not self._scanning)
+            self._btn_helper_refs.setEnabled(not self._scanning)
+            self._btn_export_analysis.setEnabled(self._analysis_enabled)
+
+    def _analyze_results_ready(self, thread: AnalyzeThread, results: dict) -> None:
+        if thread is not self._analyze_thread:
+            return
+        self._analyze_done += len(results)
+        # Games replaced by a rescan meanwhile were already re-analyzed there.
+        fresh: dict[str, int] = {}
+        for gid, (stamp, mask) in results.items():
+            if self._games.get(gid) is self._analyze_games.get(gid):
+                self._analysis_stamps[gid] = stamp
+                fresh[gid] = mask
+        self._analysis_by_game.update(fresh)
+        blocker = QSignalBlocker(self._tree)
         try:
-            self._analysis_enabled = True
-            self._analysis_include_json_checks = bool(self._chk_include_json_checks.isChecked())
-            self._analysis_by_game = {
-                b: self._compute_warning_codes(g, include_json_checks=self._analysis_include_json_checks)
-                for b, g in self._games.items()
-            }
-        except Exception as e:
-            # Qt can swallow exceptions in slots; show a visible error.
-            QMessageBox.warning(self, "Analyze failed", str(e))
-            self._analysis_enabled = False
-            self._analysis_by_game = {}
-            return
+            self._games_model.refresh_games(fresh)
         finally:
-            try:
-                busy.close()
-            except Exception:
-                pass
+            blocker.unblock()
+        # Show a code's filter when it first turns up; the counts are filled in when the run ends.
+        found = 0
+        for mask in fresh.values():
+            found |= mask
+        if any(found & CODE_BITS.get(code, 0) and not chk.isEnabled() for code, chk in self._filter_checks.items()):
+            self._update_filter_visibility()
+        self._analyze_bar.setValue(self._analyze_done)
+        self._update_analyze_label()
 
-        total = len(self._analysis_by_game)
-        with_w = sum(1 for s in self._analysis_by_game.values() if s)
-        self._lbl_analyze.setText(f"Analyzed: {total} games; {with_w} with warnings")
-        self._lbl_analyze.setVisible(True)
+    def _analyze_finished(self, thread: AnalyzeThread, completed: bool) -> None:
+        if thread is not self._analyze_thread:
+            return
+        self._analyze_thread = None
+        thread.wait()
+        thread.deleteLater()
+        self._analyze_games = {}
+        # Only a complete run knows which cached files are no longer used.
+        self._save_analysis_cache(prune=completed)
+
+        self._analyze_progress.setVisible(False)
+        self._btn_analyze.setEnabled(True)
+        self._btn_helper_refs.setEnabled(True)
+        self._update_analyze_label(cancelled=not completed)
 
         self._chk_only_warnings.setEnabled(True)
         self._update_filter_visibility()
         self._update_filter_scroll_height()
-
-        self._rebuild_game_list(preserve=self._current)
+        if self._current:
+            # Refresh the warnings shown for the selection.
+            self._reselect_current(preserve_metadata_edits=True)
+        if thread.error is not None:
+            QMessageBox.warning(self, "Analyze failed", thread.error)
+
+    def _update_analyze_label(self, *, cancelled: bool = False) -> None:
+        self._btn_export_analysis.setEnabled(self._analysis_enabled and self._analyze_thread is None)
+        with_w = len(self._analysis_by_game.warned())
+        if self._analyze_thread is not None:
+            total = len(self._analyze_games)
+            elapsed = max(1e-6, time.monotonic() - self._analyze_started)
+            rate = self._analyze_done / elapsed
+            self._lbl_analyze.setText(
+                f"Analyzing: {self._analyze_done}/{total} games ({rate:.0f}/s); {with_w} with warnings"
+            )
+            return
+        total = len(self._analysis_by_game)
+        if cancelled:
+            self._lbl_analyze.setText(f"Analysis cancelled: {total} games analyzed; {with_w} with warnings")
+        else:
+            self._lbl_analyze.setText(f"Analyzed: {total} games; {with_w} with warnings")
 
     def _update_filter_visibility(self) -> None:
         if not self._analysis_enabled:
@@ -3347,13 +4436,12 @@ class MainWindow(QMainWindow):
                 chk.setEnabled(False)
             return
 
-        found: set[str] = set()
-        for codes in self._analysis_by_game.values():
-            found |= set(codes)
-
         any_visible = False
         for code, chk in self._filter_checks.items():
-            vis = code in found
+            count = self._analysis_by_game.count(CODE_BITS.get(code, 0))
+            vis = count > 0
+            if vis:
+                chk.setText(f"{self._filter_labels.get(code, code)} ({count})")
             chk.setVisible(vis)
             chk.setEnabled(vis)
             any_visible = any_visible or vis
@@ -3378,7 +4466,7 @@ class MainWindow(QMainWindow):
                 chk.setChecked(checked)
             any_changed = True
         if any_changed:
-            self._rebuild_game_list(preserve=self._current)
+            self._apply_warning_filters()
 
     def _select_all_warning_filters(self) -> None:
         self._set_all_warning_filters(True)
@@ -3398,87 +4486,28 @@ class MainWindow(QMainWindow):
     def _rebuild_game_list(self, preserve: str | None = None, *, silent_preserve: bool = False) -> None:
         prev = preserve
         expanded_before = self._expanded_folder_paths() | set(self._force_expand_folder_paths)
-        self._tree.blockSignals(True)
-        self._tree.clear()
-
-        total_count = len(self._games)
-        showing_count = 0
-
-        enabled_codes = {code for code, chk in self._filter_checks.items() if chk.isChecked()}
-        only_warn = bool(self._analysis_enabled and self._chk_only_warnings.isChecked())
+        self._filters_applied = self._warning_filters()
+        self._sync_search_index()
 
         root_folder = self._folder
+        self._tree.blockSignals(True)
+        # Folder nodes (including empty) come from the last scan, so rebuilding does not touch the disk.
+        self._games_model.reset(
+            root_folder or None,
+            self._directories if root_folder else (),
+            ((game_id, game.folder) for game_id, game in self._games.items()) if root_folder else (),
+        )
+        self._refilter_search()
+        self._tree.blockSignals(False)
         if not root_folder:
-            self._tree.blockSignals(False)
             self._has_any_folders = False
             self._update_game_count_label(showing=0, total=0)
             return
 
         self._tree.set_root_folder(root_folder)
-
-        folder_icon: QIcon = self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
-        game_icon: QIcon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
-
-        # Build folder nodes (including empty). Top-level nodes are root contents.
-        folder_items: dict[Path, QTreeWidgetItem] = {}
-        for d in sorted(
-            [p for p in root_folder.rglob("*") if p.is_dir() and not _is_hidden_dir(p)],
-            key=lambda p: p.as_posix().lower(),
-        ):
-            try:
-                rel = d.relative_to(root_folder)
-            except Exception:
-                continue
-            parent_rel = rel.parent
-
-            parent_item = folder_items.get(parent_rel) if parent_rel != Path(".") else None
-
-            item = QTreeWidgetItem([d.name])
-            item.setIcon(0, folder_icon)
-            item.setToolTip(0, str(d))
-            item.setData(0, Qt.ItemDataRole.UserRole, {"type": "folder", "path": str(d)})
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsDropEnabled)
-            if parent_item is None:
-                self._tree.addTopLevelItem(item)
-            else:
-                parent_item.addChild(item)
-            folder_items[rel] = item
-
-        self._has_any_folders = bool(folder_items)
-
-        # Add games under their folder nodes
-        for game_id, game in self._games.items():
-            codes = self._analysis_by_game.get(game_id, set()) if self._analysis_enabled else set()
-            if self._analysis_enabled and enabled_codes:
-                codes = {c for c in codes if c in enabled_codes}
-            if only_warn and not codes:
-                continue
-
-            rel_folder = Path(".")
-            try:
-                rel_folder = game.folder.relative_to(root_folder)
-            except Exception:
-                rel_folder = Path(".")
-
-            parent_item = folder_items.get(rel_folder) if rel_folder != Path(".") else None
-            gitem = QTreeWidgetItem([game.basename])
-            gitem.setIcon(0, game_icon)
-            gitem.setToolTip(0, str(game.folder))
-            gitem.setData(0, Qt.ItemDataRole.UserRole, {"type": "game", "id": game_id, "folder": str(game.folder)})
-            gitem.setFlags(gitem.flags() | Qt.ItemFlag.ItemIsDragEnabled)
-            # Ensure games are not drop targets.
-            gitem.setFlags(gitem.flags() & ~Qt.ItemFlag.ItemIsDropEnabled)
-            if self._analysis_enabled and codes:
-                gitem.setForeground(0, Qt.GlobalColor.red)
-
-            if parent_item is None:
-                self._tree.addTopLevelItem(gitem)
-            else:
-                parent_item.addChild(gitem)
-            showing_count += 1
-
-        self._tree.blockSignals(False)
-        self._update_game_count_label(showing=showing_count, total=total_count)
+        self._has_any_folders = self._games_model.has_folders()
+        self._update_game_count_label(showing=len(self._games), total=len(self._games))
+        self._update_watched_directories()
 
         self._restore_expanded_folder_paths(expanded_before)
 
@@ -3486,24 +4515,28 @@ class MainWindow(QMainWindow):
             self._set_current_in_tree(prev, silent=bool(silent_preserve))
             return
 
+        self._select_first_game()
+
+    def _select_first_game(self) -> None:
         # Default selection: first visible game in the tree.
-        def first_game(item: QTreeWidgetItem) -> QTreeWidgetItem | None:
-            info = item.data(0, Qt.ItemDataRole.UserRole)
-            if isinstance(info, dict) and info.get("type") == "game":
-                return item
-            for i in range(item.childCount()):
-                found = first_game(item.child(i))
+        proxy = self._games_proxy
+
+        def first_game(parent: QModelIndex) -> QModelIndex | None:
+            for row in range(proxy.rowCount(parent)):
+                index = proxy.index(row, 0, parent)
+                info = GamesTreeView.info(index)
+                if isinstance(info, dict) and info.get("type") == "game":
+                    return index
+                found = first_game(index)
                 if found is not None:
                     return found
             return None
 
-        for i in range(self._tree.topLevelItemCount()):
-            top = self._tree.topLevelItem(i)
-            found = first_game(top)
-            if found is not None:
-                self._tree.setCurrentItem(found)
-                self._tree.scrollToItem(found)
-                return
+        found = first_game(QModelIndex())
+        if found is not None:
+            self._tree.setCurrentIndex(found)
+            self._tree.scrollTo(found)
+            return
 
         self._select_none()
 
@@ -3513,196 +4546,257 @@ class MainWindow(QMainWindow):
         # Always show total games across all folders/subfolders.
         self._lbl_game_count.setText(f"Games: {max(0, total)}")
 
-    def _compute_warning_codes(
-        self,
-        game: GameAssets,
-        *,
-        include_rom_cfg: bool = True,
-        include_json_checks: bool = False,
-    ) -> set[str]:
-        codes: set[str] = set()
+    def _warning_filters(self) -> tuple[int, bool]:
+        """The mask of the checked warning codes and whether only games with warnings are shown."""
 
-        if len(game.basename) > self._config.desired_max_base_file_length:
-            codes.add("longname")
+        enabled_mask = codes_to_mask(code for code, chk in self._filter_checks.items() if chk.isChecked())
+        only_warn = bool(self._analysis_enabled and self._chk_only_warnings.isChecked())
+        return enabled_mask, only_warn
 
-        if "'" in game.basename:
-            codes.add("invalidname")
+    def _flagged_game_ids(self, enabled_mask: int) -> set[str]:
+        """The games _game_filter_mask gives a non-zero mask (drawn red)."""
 
-        if include_rom_cfg:
-            if game.rom is None:
-                codes.add("missing:rom")
+        if not self._analysis_enabled:
+            return set()
+        if enabled_mask:
+            return self._analysis_by_game.matching(enabled_mask)
+        return set(self._analysis_by_game.warned())
 
-            if game.rom is not None and game.rom.suffix.lower() in {".int", ".bin"} and game.config is None:
-                codes.add("missing:cfg")
+    def _game_is_flagged(self, game_id: str) -> bool:
+        """Whether a game's row is drawn red under the applied Analyze filters."""
 
-        if game.metadata is None:
-            codes.add("missing:metadata")
+        enabled_mask, only_warn = self._filters_applied or self._warning_filters()
+        return bool(self._game_filter_mask(game_id, enabled_mask=enabled_mask, only_warn=only_warn))
 
-        def _is_blank(value) -> bool:
-            if value is None:
-                return True
-            if isinstance(value, str):
-                return value.strip() == ""
+    def _game_is_shown(self, game_id: str) -> bool:
+        """Whether the search and the applied Analyze filters let a game's row through the tree's proxy."""
+
+        if self._search_matches is not None and game_id not in self._search_matches:
             return False
+        enabled_mask, only_warn = self._filters_applied or self._warning_filters()
+        return self._game_filter_mask(game_id, enabled_mask=enabled_mask, only_warn=only_warn) is not None
 
-        def _strip_wrapping_quotes(s: str) -> str:
-            s = (s or "").strip()
-            if len(s) >= 2 and ((s[0] == s[-1] == '"') or (s[0] == s[-1] == "'")):
-                return s[1:-1]
-            return s
+    def _folder_is_shown(self, rel: Path) -> bool:
+        """Folders are hidden only while a search has no shown match in them."""
 
-        def _split_flags(value: str) -> list[str]:
-            s = (value or "").strip()
-            if not s:
-                return []
-            try:
-                return shlex.split(s, posix=True)
-            except Exception:
-                return [t for t in s.split(" ") if t.strip()]
+        return self._search_folders is None or rel in self._search_folders
 
-        def _find_equals_flag_value(tokens: list[str], flag_prefix: str) -> str | None:
-            for t in tokens:
-                if t.startswith(flag_prefix):
-                    return t[len(flag_prefix) :]
-            return None
+    # ---------- search ----------
 
-        def _normalize_media_prefix(prefix: str | None) -> str:
-            s = (prefix or "").strip() or "/media/usb0"
-            s = s.rstrip("/")
-            return s or "/media/usb0"
-
-        def _device_to_local_path(*, root: Path, device_path: str, media_prefix: str) -> Path | None:
-            s = _strip_wrapping_quotes(device_path)
-            prefix = _normalize_media_prefix(media_prefix)
-            if s == prefix:
-                return root
-            if s.startswith(prefix + "/"):
-                rel = s[len(prefix) + 1 :]
-                if rel:
-                    return root / Path(PurePosixPath(rel))
-                return root
-            return None
+    def _index_games_for_search(self, games) -> None:
+        """Add (game id, game) pairs to the search index, keyed by file name and folder path."""
 
-        def _exists_for_flag_path(flag_value: str) -> bool:
-            root = self._folder or game.folder
-            local = _device_to_local_path(
-                root=root,
-                device_path=flag_value,
-                media_prefix=getattr(self._config, "jzintv_media_prefix", "/media/usb0"),
-            )
-            if local is not None:
-                try:
-                    return local.exists()
-                except Exception:
-                    return False
-            try:
-                return Path(_strip_wrapping_quotes(flag_value)).exists()
-            except Exception:
-                return False
+        root = str(self._folder or "")
+        folders: dict[Path, str] = {}
+        for game_id, game in games:
+            folder = folders.get(game.folder)
+            if folder is None:
+                s = str(game.folder)
+                folder = s[len(root) :].lstrip("\\/") if root and s.startswith(root) else s
+                folder = folders[game.folder] = folder.replace("\\", "/")
+            self._search_index.set_game(game_id, basename=game.basename, folder=folder)
 
-        def add_image(kind: str, p: Path | None, expected) -> None:
-            if p is None:
-                codes.add(f"missing:{kind}")
-                return
-            size = get_image_size(p)
-            if size is None:
-                codes.add(f"resolution:{kind}")
-                return
-            if size != (expected.width, expected.height):
-                codes.add(f"resolution:{kind}")
+    def _sync_search_index(self) -> None:
+        index = self._search_index
+        index.remove([gid for gid in index.game_ids() if gid not in self._games])
+        self._index_games_for_search((gid, g) for gid, g in self._games.items() if gid not in index)
 
-        def add_resolution_only(kind: str, p: Path | None, expected) -> None:
-            if p is None:
-                return
-            size = get_image_size(p)
-            if size is None:
-                codes.add(f"resolution:{kind}")
-                return
-            if size != (expected.width, expected.height):
-                codes.add(f"resolution:{kind}")
+    def _refilter_search(self) -> None:
+        """Match the search box against the index and re-filter the rows the view has built."""
+
+        matches = self._search_index.search(self._search_edit.text()) if self._folder else None
+        self._search_matches = matches
+        if matches is None:
+            self._search_folders = None
+        else:
+            # The folders holding a match the Analyze filters show, and their parents.
+            enabled_mask, only_warn = self._filters_applied or self._warning_filters()
+            shown = matches & self._flagged_game_ids(enabled_mask) if only_warn else matches
+            folder_of = self._games_model.game_folder_rel
+            folders: set[Path] = set()
+            top = Path(".")
+            for rel in {folder_of(gid) for gid in shown}:
+                while rel is not None and rel != top and rel not in folders:
+                    folders.add(rel)
+                    rel = rel.parent
+            self._search_folders = folders
+        self._games_proxy.invalidateFilter()
+
+    def _apply_search(self, *_args) -> None:
+        """Filter the tree to the games matching the search box, on top of the Analyze filters.
+
+        Each keystroke matches the in-memory search index; the tree is not
+        rebuilt and only rows the view has built are re-filtered. Metadata
+        names are read in the background the first time a search is made.
+        """
+
+        was_searching = self._search_matches is not None
+        if not was_searching:
+            self._search_expanded_before = self._expanded_folder_paths()
+        blocker = QSignalBlocker(self._tree)
+        try:
+            self._refilter_search()
+        finally:
+            blocker.unblock()
+        matches = self._search_matches
 
-        add_image("box", game.box, self._config.box_resolution)
-        add_image("box_small", game.box_small, self._config.box_small_resolution)
-        add_image("overlay_big", game.overlay_big, self._config.overlay_big_resolution)
-        add_image("overlay", game.overlay, self._config.overlay_resolution)
+        if matches is None:
+            if was_searching:
+                self._tree.collapseAll()
+                self._restore_expanded_folder_paths(self._search_expanded_before)
+                self._set_current_in_tree(self._current, silent=True)
+            return
 
-        # Multi-overlay support: only warn on resolution if the files exist.
-        add_resolution_only("overlay2", game.overlay2, self._config.overlay_resolution)
-        add_resolution_only("overlay3", game.overlay3, self._config.overlay_resolution)
+        self._load_search_names()
+        if len(matches) <= SEARCH_EXPAND_MAX:
+            for rel in self._search_folders or ():
+                self._tree.expand_folder(self._tree.view_index(self._games_model.index_for_folder_rel(rel)))
+        if not self._tree.selected_indexes():
+            # The selection was filtered out: jump to the first match.
+            self._select_first_game()
 
-        add_image("qrcode", game.qrcode, self._config.qrcode_resolution)
+    def _load_search_names(self) -> None:
+        """Read the metadata names the search index lacks on a background thread."""
 
-        desired = self._config.desired_number_of_snaps
-        snaps = [(1, game.snap1), (2, game.snap2), (3, game.snap3)]
-        for idx, p in snaps:
-            if idx <= desired:
-                add_image(f"snap{idx}", p, self._config.snap_resolution)
+        if self._search_names_thread is not None or not self._folder:
+            return
+        games = [(gid, self._games[gid]) for gid in self._search_index.unnamed() if gid in self._games]
+        if not games:
+            return
+        # Open the cache here: the worker only reads it.
+        cache = self._analysis_cache_for(self._folder)
+        json_facts = cache.json_facts if cache is not None else read_json_facts
 
-        if include_json_checks and game.metadata is not None and game.metadata.exists():
-            try:
-                data = json.loads(game.metadata.read_text(encoding="utf-8"))
-            except Exception:
-                data = {}
-            if not isinstance(data, dict):
-                data = {}
+        def metadata_name(game: GameAssets) -> str | None:
+            path = game.metadata
+            return (json_facts(path) or {}).get("name") if path is not None else None
 
-            if _is_blank(data.get("name")):
-                codes.add("json:empty:name")
+        thread = AnalyzeThread(games, metadata_name, parent=self)
+        thread.results_ready.connect(lambda results, t=thread: self._search_names_ready(t, results))
+        thread.analysis_finished.connect(lambda completed, t=thread: self._search_names_finished(t, completed))
+        self._search_names_thread = thread
+        thread.start()
 
-            nb = data.get("nb_players")
-            nb_str = "" if nb is None else str(nb)
-            if _is_blank(nb) or nb_str.strip() == "0":
-                codes.add("json:empty:nb_players")
+    def _search_names_ready(self, thread: AnalyzeThread, results: dict) -> None:
+        if thread is not self._search_names_thread:
+            return
+        for gid, name in results.items():
+            self._search_index.set_name(gid, None if name is None else str(name))
+        if self._search_matches is not None:
+            blocker = QSignalBlocker(self._tree)
+            try:
+                self._refilter_search()
+            finally:
+                blocker.unblock()
+            if not self._tree.selected_indexes():
+                self._select_first_game()
+
+    def _search_names_finished(self, thread: AnalyzeThread, completed: bool) -> None:
+        if thread is not self._search_names_thread:
+            return
+        self._search_names_thread = None
+        thread.wait()
+        thread.deleteLater()
+        self._save_analysis_cache()
+        if completed and self._search_matches is not None:
+            # Games changed while it ran.
+            self._load_search_names()
+
+    def _stop_search_names(self) -> None:
+        thread, self._search_names_thread = self._search_names_thread, None
+        if thread is None:
+            return
+        thread.requestInterruption()
+        thread.wait()
+        thread.deleteLater()
+
+    def _apply_warning_filters(self) -> None:
+        """Apply changed Analyze filters by touching only the games whose row changes.
+
+        With the code index this is a few set operations; a game's row
+        changes if it gains or loses its red color or enters or leaves the
+        "only games with warnings" view. Only rows the view has built are
+        redrawn and re-filtered.
+        """
+
+        enabled_mask, only_warn = self._warning_filters()
+        applied = self._filters_applied
+        if applied is None or self._games_model.root != self._folder:
+            self._rebuild_game_list(preserve=self._current)
+            return
+        old_mask, old_only_warn = applied
+        old_flagged = self._flagged_game_ids(old_mask)
+        new_flagged = self._flagged_game_ids(enabled_mask)
+        changed = old_flagged ^ new_flagged
+        if old_only_warn != only_warn:
+            # Games without shown codes enter or leave the tree.
+            changed |= set(self._games) - (old_flagged & new_flagged)
+        self._filters_applied = (enabled_mask, only_warn)
+        if not changed:
+            return
+        blocker = QSignalBlocker(self._tree)
+        try:
+            if self._search_matches is not None:
+                # Which folders hold shown matches depends on the filters too.
+                self._refilter_search()
+            elif len(changed) > len(self._games) // 2:
+                self._games_model.refresh_all()
             else:
-                try:
-                    if int(nb_str.strip()) == 0:
-                        codes.add("json:empty:nb_players")
-                except Exception:
-                    pass
+                self._games_model.refresh_games(changed)
+        finally:
+            blocker.unblock()
+        sel = self._current_selection()
+        if sel is not None and sel[0] == "game" and not self._tree.selected_indexes():
+            # The selected game was filtered out.
+            self._select_first_game()
 
-            if _is_blank(data.get("editor")):
-                codes.add("json:empty:editor")
+    def _game_filter_mask(self, game_id: str, *, enabled_mask: int, only_warn: bool) -> int | None:
+        """The mask of the warning codes shown for a game, or None if the Analyze filters hide it."""
 
-            yr = data.get("year")
-            if yr is None:
-                codes.add("json:empty:year")
-            else:
-                try:
-                    if int(str(yr).strip() or "0") == 0:
-                        codes.add("json:empty:year")
-                except Exception:
-                    codes.add("json:empty:year")
+        mask = self._analysis_by_game.get(game_id, 0) if self._analysis_enabled else 0
+        if self._analysis_enabled and enabled_mask:
+            mask &= enabled_mask
+        if only_warn and not mask:
+            return None
+        return mask
+
+    def _helper_path_index(self) -> HelperPathIndex:
+        index = self._helper_paths
+        if index is None or index.root != (self._folder or Path(".")):
+            index = HelperPathIndex.build(self._folder or Path("."), self._palette_files, self._keyboard_files)
+            self._helper_paths = index
+        return index
+
+    def _warning_context(self, game: GameAssets) -> WarningContext:
+        return WarningContext(
+            game,
+            self._config,
+            root=self._folder,
+            image_size=self._image_size,
+            json_facts=self._json_facts,
+            path_exists=self._helper_path_index().exists,
+        )
 
-            desc = data.get("description")
-            lang = (getattr(self._config, "language", "en") or "en").strip().lower() or "en"
-            if not isinstance(desc, dict):
-                codes.add("json:empty:description")
-            else:
-                if _is_blank(desc.get(lang)):
-                    codes.add("json:empty:description")
-                max_desc = int(getattr(self._config, "max_desc_length", 0) or 0)
-                if max_desc > 0:
-                    raw_desc = "" if desc.get(lang) is None else str(desc.get(lang))
-                    count = len(raw_desc) if raw_desc.strip() else 0
-                    if count > max_desc:
-                        codes.add("longdesc")
-
-            extra = data.get("jzintv_extra")
-            extra_s = ("" if extra is None else str(extra)).strip()
-            if extra_s:
-                tokens = _split_flags(extra_s)
-
-                kbd = _find_equals_flag_value(tokens, "--kbdhackfile=")
-                if kbd is not None:
-                    if _is_blank(kbd) or not _exists_for_flag_path(kbd):
-                        codes.add("json:missing:kbdhackfile")
-
-                pal = _find_equals_flag_value(tokens, "--gfx-palette=")
-                if pal is not None:
-                    if _is_blank(pal) or not _exists_for_flag_path(pal):
-                        codes.add("json:missing:gfx-palette")
-
-        return codes
+    def _compute_warning_mask(
+        self,
+        game: GameAssets,
+        *,
+        include_rom_cfg: bool = True,
+        include_json_checks: bool = False,
+    ) -> int:
+        rules = select_rules(include_rom_cfg=include_rom_cfg, include_json_checks=include_json_checks)
+        return evaluate_rules(rules, self._warning_context(game))
+
+    def _compute_warning_codes(
+        self,
+        game: GameAssets,
+        *,
+        include_rom_cfg: bool = True,
+        include_json_checks: bool = False,
+    ) -> set[str]:
+        return mask_to_codes(
+            self._compute_warning_mask(game, include_rom_cfg=include_rom_cfg, include_json_checks=include_json_checks)
+        )
 
     # ---------- ui build ----------
 
@@ -3786,6 +4880,7 @@ class MainWindow(QMainWindow):
 
         self._img_box = ImageCard(
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Box", expected=self._config.box_resolution, filename="{basename}.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3795,6 +4890,7 @@ class MainWindow(QMainWindow):
 
         self._img_box_small = ImageCard(
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Box Small", expected=self._config.box_small_resolution, filename="{basename}_small.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3804,6 +4900,7 @@ class MainWindow(QMainWindow):
 
         self._img_overlay_big = ImageCard(
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Overlay Big", expected=self._config.overlay_big_resolution, filename="{basename}_big_overlay.png"),
             on_changed=self._overlay_big_changed,
             keep_ratio_enabled=True,
@@ -3821,6 +4918,7 @@ class MainWindow(QMainWindow):
             index=1,
             on_reorder=self._reorder_overlays,
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Overlay 1", expected=self._config.overlay_resolution, filename="{basename}_overlay.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3841,6 +4939,7 @@ class MainWindow(QMainWindow):
             index=2,
             on_reorder=self._reorder_overlays,
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Overlay 2", expected=self._config.overlay_resolution, filename="{basename}_overlay2.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3861,6 +4960,7 @@ class MainWindow(QMainWindow):
             index=3,
             on_reorder=self._reorder_overlays,
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Overlay 3", expected=self._config.overlay_resolution, filename="{basename}_overlay3.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3879,6 +4979,7 @@ class MainWindow(QMainWindow):
 
         self._img_qr = ImageCard(
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="QR Code", expected=self._config.qrcode_resolution, filename="{basename}_qrcode.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3894,6 +4995,7 @@ class MainWindow(QMainWindow):
         self._snap1 = SnapshotCard(
             index=1,
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Snap 1", expected=self._config.snap_resolution, filename="{basename}_snap1.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3902,6 +5004,7 @@ class MainWindow(QMainWindow):
         self._snap2 = SnapshotCard(
             index=2,
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Snap 2", expected=self._config.snap_resolution, filename="{basename}_snap2.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3910,6 +5013,7 @@ class MainWindow(QMainWindow):
         self._snap3 = SnapshotCard(
             index=3,
             config=self._config,
+            thumbnails=self._thumbnails,
             spec=ImageSpec(title="Snap 3", expected=self._config.snap_resolution, filename="{basename}_snap3.png"),
             on_changed=self._images_changed,
             keep_ratio_enabled=True,
@@ -3959,47 +5063,25 @@ class MainWindow(QMainWindow):
         blocker = QSignalBlocker(self._tree) if silent else None
         try:
             if not game_id:
-                self._tree.setCurrentItem(None)
+                self._tree.setCurrentIndex(QModelIndex())
                 return
 
             target = str(game_id)
-            want_type: str
-            want_val: str
-            if target.startswith("g:"):
-                want_type = "game"
-                want_val = target[2:]
-            elif target.startswith("f:"):
-                want_type = "folder"
-                want_val = target[2:]
+            if target.startswith("f:"):
+                source = self._games_model.index_for_folder(Path(target[2:]))
             else:
-                want_type = "game"
-                want_val = target
-
-            def walk(item: QTreeWidgetItem) -> QTreeWidgetItem | None:
-                info = item.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(info, dict) and info.get("type") == want_type:
-                    if want_type == "game" and str(info.get("id") or "") == want_val:
-                        return item
-                    if want_type == "folder" and str(info.get("path") or "") == want_val:
-                        return item
-                for i in range(item.childCount()):
-                    found = walk(item.child(i))
-                    if found is not None:
-                        return found
-                return None
-
-            for i in range(self._tree.topLevelItemCount()):
-                top = self._tree.topLevelItem(i)
-                found = walk(top)
-                if found is not None:
-                    # Ensure the item is visible.
-                    p = found.parent()
-                    while p is not None:
-                        self._tree.expandItem(p)
-                        p = p.parent()
-                    self._tree.setCurrentItem(found)
-                    self._tree.scrollToItem(found)
-                    return
+                source = self._games_model.index_for_game(target[2:] if target.startswith("g:") else target)
+            index = self._tree.view_index(source)
+            if not index.isValid():
+                # Not in the tree, or hidden by the Analyze filters.
+                return
+            # Ensure the item is visible.
+            p = index.parent()
+            while p.isValid():
+                self._tree.expand_folder(p)
+                p = p.parent()
+            self._tree.setCurrentIndex(index)
+            self._tree.scrollTo(index)
         finally:
             # Keep blocker alive until after all operations.
             _ = blocker
@@ -4242,7 +5324,7 @@ class MainWindow(QMainWindow):
         self._set_images_context(assets)
         self._lbl_warnings.setText(f"Warnings: {len(self._compute_warning_codes(assets, include_rom_cfg=False))}")
 
-    def _select_multi(self, items: list[QTreeWidgetItem]) -> None:
+    def _select_multi(self, items: list[QModelIndex]) -> None:
         # Multiple selection: do not show per-game details to avoid ambiguity.
         self._current = None
 
@@ -4251,7 +5333,7 @@ class MainWindow(QMainWindow):
         game_count = 0
         folder_count = 0
         for item in items or []:
-            info = item.data(0, Qt.ItemDataRole.UserRole) if item is not None else None
+            info = GamesTreeView.info(item)
             if isinstance(info, dict) and info.get("type") == "game":
                 game_count += 1
                 gid = str(info.get("id") or "").strip()
@@ -4395,11 +5477,29 @@ class MainWindow(QMainWindow):
     def _set_images_context(self, game: GameAssets | None) -> None:
         folder = game.folder if game else None
         basename = game.basename if game else None
+        sizes = (
+            self._image_sizes(
+                [
+                    game.box,
+                    game.box_small,
+                    game.overlay_big,
+                    game.overlay,
+                    game.overlay2,
+                    game.overlay3,
+                    game.qrcode,
+                    game.snap1,
+                    game.snap2,
+                    game.snap3,
+                ]
+            )
+            if game
+            else {}
+        )
 
         def resolution_status(p: Path | None, expected) -> tuple[list[str], bool]:
             if p is None:
                 return (["Missing"], False)
-            size = get_image_size(p)
+            size = sizes.get(p)
             if size is None:
                 return (["Unreadable image"], False)
             if size != (expected.width, expected.height):
@@ -4539,7 +5639,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Copy failed", str(e))
                 return
 
-        self.refresh(preserve_metadata_edits=True)
+        self._apply_directory_changes([dest_root], preserve_metadata_edits=True, force_current=True)
 
     def _add_rom(self, src: Path) -> None:
         game = self._current_game()
@@ -4592,7 +5692,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Copy failed", str(e))
             return
-        self.refresh(preserve_metadata_edits=True)
+        self._apply_directory_changes([dest.parent], preserve_metadata_edits=True, force_current=True)
 
     # ---------- rename ----------
 
@@ -4737,7 +5837,7 @@ class MainWindow(QMainWindow):
             )
 
         self._current = f"g:{new_id}"
-        self.refresh(preserve_metadata_edits=True)
+        self._apply_directory_changes([game.folder], preserve_metadata_edits=True)
 
     # ---------- images ----------
 
@@ -4754,7 +5854,7 @@ class MainWindow(QMainWindow):
                     except Exception as e:
                         QMessageBox.warning(self, "Box Small", str(e))
         # Preserve unsaved metadata edits when updating image thumbnails.
-        self.refresh(preserve_metadata_edits=True)
+        self._sync_current_assets()
 
     def _overlay_big_changed(self) -> None:
         """Handle updates to the Big Overlay image slot.
@@ -4765,22 +5865,22 @@ class MainWindow(QMainWindow):
 
         assets = self._current_assets()
         if not assets:
-            self.refresh(preserve_metadata_edits=True)
+            self._sync_current_assets()
             return
 
         # Default: behave like normal image updates.
         if not bool(getattr(self._config, "auto_build_overlay", False)):
-            self.refresh(preserve_metadata_edits=True)
+            self._sync_current_assets()
             return
 
         overlay1 = assets.folder / f"{assets.basename}_overlay.png"
         if overlay1.exists():
-            self.refresh(preserve_metadata_edits=True)
+            self._sync_current_assets()
             return
 
         big_overlay = assets.folder / f"{assets.basename}_big_overlay.png"
         if not big_overlay.exists():
-            self.refresh(preserve_metadata_edits=True)
+            self._sync_current_assets()
             return
 
         blank_default = resource_path("Overlay_empty.png")
@@ -4792,7 +5892,7 @@ class MainWindow(QMainWindow):
             if override_list:
                 msg = f"Missing overlay template override: {blank}"
             QMessageBox.warning(self, "AutoBuildOverlay", msg)
-            self.refresh(preserve_metadata_edits=True)
+            self._sync_current_assets()
             return
 
         build_res = self._config.overlay_build_resolution
@@ -4812,7 +5912,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "AutoBuildOverlay", str(e))
 
-        self.refresh(preserve_metadata_edits=True)
+        self._sync_current_assets()
 
     def _clean_overlay_big(self) -> None:
         assets = self._current_assets()
@@ -4856,7 +5956,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Box Small", str(e))
             return
-        self.refresh(preserve_metadata_edits=True)
+        self._sync_current_assets()
 
     def _build_overlay(self, which: int = 1) -> None:
         game = self._current_assets()
@@ -4942,7 +6042,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "QR failed", str(e))
             return
-        self.refresh(preserve_metadata_edits=True)
+        self._sync_current_assets()
 
     def _reorder_snaps(self, src_index: int, dst_index: int) -> None:
         game = self._current_assets()
@@ -4974,7 +6074,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Reorder failed", str(e))
                 return
 
-        self.refresh()
+        self._sync_current_assets(preserve_metadata_edits=False)
 
     def _reorder_overlays(self, src_index: int, dst_index: int) -> None:
         game = self._current_assets()
@@ -5028,4 +6128,4 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Reorder failed", str(e))
                 return
 
-        self.refresh()
+        self._sync_current_assets(preserve_metadata_edits=False)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from sgm.scan_snapshot import ScanSnapshot
+from sgm.scanner import iter_scan_folder
+
+
+class ScanThread(QThread):
+    """Scans a games folder in the background and reports directories in batches.
+
+    batch_ready carries a list of sgm.scanner.DirectoryScan. The first directory
+    (the games folder itself) is sent right away, later ones at most every
+    `interval_ms` so the UI thread is not flooded. scan_finished carries True
+    if the whole folder was scanned, False if it was interrupted.
+    """
+
+    batch_ready = Signal(list)
+    scan_finished = Signal(bool)
+
+    def __init__(
+        self,
+        folder: Path,
+        *,
+        palette_exts: set[str] | None = None,
+        workers: int = 1,
+        snapshot: ScanSnapshot | None = None,
+        interval_ms: int = 100,
+        parent: QObject | None = None,
+    ):
+        super().__init__(parent)
+        self._folder = folder
+        self._palette_exts = palette_exts
+        self._workers = workers
+        self._snapshot = snapshot
+        self._interval_s = max(0, int(interval_ms)) / 1000.0
+
+    def run(self) -> None:
+        completed = False
+        batch: list = []
+        last = 0.0
+        it = iter_scan_folder(
+            self._folder,
+            palette_exts=self._palette_exts,
+            workers=self._workers,
+            snapshot=self._snapshot,
+        )
+        try:
+            for ds in it:
+                if self.isInterruptionRequested():
+                    break
+                batch.append(ds)
+                now = time.monotonic()
+                if now - last >= self._interval_s:
+                    self.batch_ready.emit(batch)
+                    batch = []
+                    last = now
+            else:
+                completed = True
+        except Exception:
+            completed = False
+        finally:
+            it.close()
+
+        if batch:
+            self.batch_ready.emit(batch)
+        self.scan_finished.emit(completed)
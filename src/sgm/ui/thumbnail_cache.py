@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+from PySide6.QtCore import QObject, QRunnable, Qt, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from sgm.scan_snapshot import RACY_WINDOW_NS, SNAPSHOT_DIR_NAME
+
+
+THUMBS_DIR_NAME = "thumbs"
+
+# Scaled thumbnails kept in memory: ten cards per game, so a few dozen games.
+MEMORY_THUMBNAILS = 300
+
+# Threads decoding thumbnails (one game has up to ten images).
+THUMBNAIL_THREADS = 4
+
+# (path, mtime_ns, size, max_w, max_h): an edited image gets a new key.
+ThumbKey = tuple[str, int, int, int, int]
+
+
+def thumb_key(path: Path, max_w: int, max_h: int) -> ThumbKey | None:
+    """The cache key of `path` scaled to fit max_w x max_h; None if the file is missing."""
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size, max_w, max_h)
+
+
+def decode_thumbnail(path: Path, max_w: int, max_h: int) -> QImage | None:
+    """Read an image scaled to fit max_w x max_h (keeping its aspect ratio).
+
+    The reader is given the target size up front, so formats that support it
+    decode straight to thumbnail size and the full-size image is never kept.
+    """
+
+    reader = QImageReader(str(path))
+    size = reader.size()
+    if size.isValid() and not size.isEmpty():
+        reader.setScaledSize(size.scaled(max_w, max_h, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if not size.isValid():
+        # The header did not tell the size: scale after decoding.
+        image = image.scaled(
+            max_w, max_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+    return image
+
+
+class ThumbnailStore:
+    """Scaled thumbnails saved as small PNGs in `<root>/.sgm/thumbs`.
+
+    Files are named after a hash of the thumbnail key (the image path is
+    taken relative to the library root, so a moved library keeps its
+    thumbnails). When the files grow past `max_bytes`, the least recently
+    used ones (oldest mtime; a hit touches its file) are deleted. load() and
+    save() may run on worker threads.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int, dir_path: Path | None = None):
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        self.dir_path = dir_path if dir_path is not None else ThumbnailStore.default_dir(root)
+        # Total size of the stored files; None until the directory is first listed.
+        self._total: int | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_dir(root: Path) -> Path:
+        return root / SNAPSHOT_DIR_NAME / THUMBS_DIR_NAME
+
+    def _file_for(self, key: ThumbKey) -> Path:
+        path, mtime_ns, size, max_w, max_h = key
+        try:
+            name = Path(path).relative_to(self.root).as_posix()
+        except Exception:
+            name = Path(path).as_posix()
+        digest = hashlib.sha1(f"{name}\0{mtime_ns}\0{size}\0{max_w}x{max_h}".encode("utf-8")).hexdigest()
+        return self.dir_path / f"{digest}.png"
+
+    def load(self, key: ThumbKey) -> QImage | None:
+        p = self._file_for(key)
+        if not p.exists():
+            return None
+        image = QImage(str(p))
+        if image.isNull():
+            return None
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return image
+
+    def save(self, key: ThumbKey, image: QImage) -> None:
+        if self.max_bytes <= 0:
+            return
+        p = self._file_for(key)
+        tmp = p.with_suffix(".tmp")
+        try:
+            self.dir_path.mkdir(parents=True, exist_ok=True)
+            if not image.save(str(tmp), "PNG"):
+                return
+            os.replace(tmp, p)
+            written = p.stat().st_size
+        except Exception:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, _, size in self._list_files())
+            else:
+                self._total += written
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _list_files(self) -> list[tuple[int, str, int]]:
+        """(mtime_ns, path, size) of the stored thumbnails."""
+        files: list[tuple[int, str, int]] = []
+        try:
+            with os.scandir(self.dir_path) as it:
+                for entry in it:
+                    if not entry.name.endswith(".png"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime_ns, entry.path, st.st_size))
+        except OSError:
+            pass
+        return files
+
+    def _evict(self) -> None:
+        # Go well below the limit so the next few saves do not list the directory again.
+        files = sorted(self._list_files())
+        total = sum(size for _, _, size in files)
+        target = self.max_bytes * 3 // 4
+        for _, path, size in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total = total
+
+
+class _ThumbnailJob(QRunnable):
+    def __init__(self, cache: "ThumbnailCache", key: ThumbKey, store: ThumbnailStore | None, keep: bool):
+        super().__init__()
+        self._cache = cache
+        self._key = key
+        self._store = store
+        self._keep = keep
+
+    def run(self) -> None:
+        key = self._key
+        if not self._cache._claim(key):
+            return
+        image: QImage | None = None
+        try:
+            if self._keep and self._store is not None:
+                image = self._store.load(key)
+            if image is None:
+                image = decode_thumbnail(Path(key[0]), key[3], key[4])
+                if image is not None and self._keep and self._store is not None:
+                    self._store.save(key, image)
+        except Exception:
+            image = None
+        self._cache._decoded.emit(key, image, self._keep)
+
+
+class ThumbnailCache(QObject):
+    """Scaled image-card thumbnails: an LRU of QPixmaps, optionally backed by a ThumbnailStore.
+
+    request() answers from memory right away; otherwise the thumbnail is
+    read from the store or decoded on a thread pool and handed to the
+    callback later. A thumbnail is decoded from its image only when neither
+    level has it, so switching between games does not read the same PNG
+    twice. Requests nobody waits for any more (see cancel()) are skipped.
+    """
+
+    _decoded = Signal(object, object, bool)
+
+    def __init__(self, parent: QObject | None = None, *, max_entries: int = MEMORY_THUMBNAILS):
+        super().__init__(parent)
+        self.max_entries = max(1, int(max_entries))
+        self._memory: OrderedDict[ThumbKey, QPixmap | None] = OrderedDict()
+        self._store: ThumbnailStore | None = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(THUMBNAIL_THREADS)
+        # Key -> {ticket number: callback} of the requests still waiting.
+        self._waiting: dict[ThumbKey, dict[int, Callable[[QPixmap | None], None]]] = {}
+        # Keys of the jobs started and not finished (or skipped) yet.
+        self._queued: set[ThumbKey] = set()
+        self._next_ticket = 0
+        self._lock = threading.Lock()
+        self._decoded.connect(self._on_decoded)
+
+    @property
+    def store(self) -> ThumbnailStore | None:
+        return self._store
+
+    def set_store(self, store: ThumbnailStore | None) -> None:
+        self._store = store
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def shutdown(self) -> None:
+        """Drop the waiting requests and wait for the running jobs."""
+        with self._lock:
+            self._waiting.clear()
+        self._pool.clear()
+        self._pool.waitForDone()
+        with self._lock:
+            self._queued.clear()
+
+    def request(
+        self, path: Path, *, max_w: int, max_h: int, on_ready: Callable[[QPixmap | None], None]
+    ) -> tuple[ThumbKey, int] | None:
+        """Call `on_ready` with `path` scaled to fit max_w x max_h (None if missing or unreadable).
+
+        Cached thumbnails are passed before returning and None is returned;
+        otherwise returns a ticket for cancel().
+        """
+
+        key = thumb_key(path, max_w, max_h)
+        if key is None:
+            on_ready(None)
+            return None
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            on_ready(self._memory[key])
+            return None
+
+        # An image written within the mtime resolution may still change under the same key.
+        keep = time.time_ns() - key[1] >= RACY_WINDOW_NS
+        with self._lock:
+            self._next_ticket += 1
+            ticket = self._next_ticket
+            self._waiting.setdefault(key, {})[ticket] = on_ready
+            start = key not in self._queued
+            if start:
+                self._queued.add(key)
+        if start:
+            self._pool.start(_ThumbnailJob(self, key, self._store, keep))
+        return key, ticket
+
+    def cancel(self, ticket: tuple[ThumbKey, int] | None) -> None:
+        """Forget a request; its job is skipped if nobody else waits for the same thumbnail."""
+        if ticket is None:
+            return
+        key, number = ticket
+        with self._lock:
+            callbacks = self._waiting.get(key)
+            if callbacks is not None:
+                callbacks.pop(number, None)
+                if not callbacks:
+                    del self._waiting[key]
+
+    def _claim(self, key: ThumbKey) -> bool:
+        # Worker thread: go on only if someone still waits for `key`.
+        with self._lock:
+            if key in self._waiting:
+                return True
+            self._queued.discard(key)
+            return False
+
+    def _on_decoded(self, key: ThumbKey, image: QImage | None, keep: bool) -> None:
+        with self._lock:
+            self._queued.discard(key)
+            callbacks = self._waiting.pop(key, {})
+        pix = QPixmap.fromImage(image) if image is not None else None
+        if keep:
+            # Unreadable images are remembered too (as None) until the file changes.
+            self._memory[key] = pix
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        for on_ready in callbacks.values():
+            on_ready(pix)
@@ -34,15 +34,17 @@ from sgm.image_ops import (
 )
 from sgm.resources import resource_path
 from sgm.ui.dialog_state import get_start_dir, remember_path
+from sgm.ui.thumbnail_cache import ThumbKey, ThumbnailCache, decode_thumbnail
 
 
-def _thumb_for(path: Path, *, max_w: int = 128, max_h: int = 128) -> QPixmap | None:
+THUMB_SIZE = 128
+
+
+def _thumb_for(path: Path, *, max_w: int = THUMB_SIZE, max_h: int = THUMB_SIZE) -> QPixmap | None:
     if not path.exists():
         return None
-    pix = QPixmap(str(path))
-    if pix.isNull():
-        return None
-    return pix.scaled(max_w, max_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    image = decode_thumbnail(path, max_w, max_h)
+    return QPixmap.fromImage(image) if image is not None else None
 
 
 class _ImagePreviewDialog(QDialog):
@@ -92,6 +94,7 @@ class ImageCard(QFrame):
         before_write: Callable[[Path, str, Path], bool] | None = None,
         keep_ratio_enabled: bool = False,
         keep_ratio_tooltip: str | None = None,
+        thumbnails: ThumbnailCache | None = None,
     ):
         super().__init__()
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Plain)
@@ -100,6 +103,10 @@ class ImageCard(QFrame):
         self._spec = spec
         self._on_changed = on_changed
         self._before_write = before_write
+        self._thumbnails = thumbnails
+        # The pending thumbnail request; results of older ones are dropped.
+        self._thumb_ticket: tuple[ThumbKey, int] | None = None
+        self._thumb_generation = 0
 
         self._folder: Path | None = None
         self._basename: str | None = None
@@ -257,6 +264,18 @@ class ImageCard(QFrame):
         self._btn_blank.clicked.connect(handler)
         self._btn_blank.setVisible(True)
 
+    def _thumb_ready(self, generation: int, pix: QPixmap | None) -> None:
+        if generation != self._thumb_generation:
+            return
+        self._thumb_ticket = None
+        self._show_thumb(pix)
+
+    def _show_thumb(self, pix: QPixmap | None) -> None:
+        if pix is not None:
+            self._thumb.setPixmap(pix)
+        else:
+            self._thumb.setText("(no preview)")
+
     def set_context(
         self,
         *,
@@ -276,12 +295,23 @@ class ImageCard(QFrame):
         self._btn_extra.setEnabled(bool(self._folder and self._basename) and (not self._extra_requires_image or has_image))
         self._btn_blank.setEnabled(bool(self._folder and self._basename))
 
+        self._thumb_generation += 1
+        if self._thumbnails is not None:
+            self._thumbnails.cancel(self._thumb_ticket)
+            self._thumb_ticket = None
         if existing_path and existing_path.exists():
-            pix = _thumb_for(existing_path)
-            if pix is not None:
-                self._thumb.setPixmap(pix)
+            if self._thumbnails is not None:
+                # Placeholder until the thumbnail is decoded; a cached one replaces it right away.
+                self._thumb.setText("(loading...)")
+                generation = self._thumb_generation
+                self._thumb_ticket = self._thumbnails.request(
+                    existing_path,
+                    max_w=THUMB_SIZE,
+                    max_h=THUMB_SIZE,
+                    on_ready=lambda pix, generation=generation: self._thumb_ready(generation, pix),
+                )
             else:
-                self._thumb.setText("(no preview)")
+                self._show_thumb(_thumb_for(existing_path))
         else:
             self._thumb.setPixmap(QPixmap())
             self._thumb.setText("(missing)")
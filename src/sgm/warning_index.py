@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, MutableMapping
+
+from sgm.warning_rules import iter_bits
+
+
+class WarningIndex(MutableMapping):
+    """Warning mask per game id (bits from sgm.warning_rules.CODE_BITS), indexed the other way round as well.
+
+    Besides game id -> mask it keeps code bit -> game ids and the set of
+    games with any warning, so filtering by code and per-code counts cost
+    as much as the games involved instead of a pass over the whole library.
+    The sets returned by games_with() and warned() are live and must not be
+    modified.
+    """
+
+    def __init__(self, items: Iterable[tuple[str, int]] = ()):
+        self._masks: dict[str, int] = {}
+        self._games: dict[int, set[str]] = {}
+        self._warned: set[str] = set()
+        for game_id, mask in items:
+            self[game_id] = mask
+
+    def __getitem__(self, game_id: str) -> int:
+        return self._masks[game_id]
+
+    def __setitem__(self, game_id: str, mask: int) -> None:
+        old = self._masks.get(game_id)
+        if old is not None:
+            if old == mask:
+                return
+            self._unindex(game_id, old)
+        self._masks[game_id] = mask
+        for bit in iter_bits(mask):
+            self._games.setdefault(bit, set()).add(game_id)
+        if mask:
+            self._warned.add(game_id)
+
+    def __delitem__(self, game_id: str) -> None:
+        self._unindex(game_id, self._masks.pop(game_id))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._masks)
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def clear(self) -> None:
+        self._masks.clear()
+        self._games.clear()
+        self._warned.clear()
+
+    def _unindex(self, game_id: str, mask: int) -> None:
+        for bit in iter_bits(mask):
+            games = self._games[bit]
+            games.discard(game_id)
+            if not games:
+                del self._games[bit]
+        self._warned.discard(game_id)
+
+    def games_with(self, bit: int) -> set[str]:
+        return self._games.get(bit, set())
+
+    def count(self, bit: int) -> int:
+        return len(self._games.get(bit, ()))
+
+    def warned(self) -> set[str]:
+        """The games with at least one code."""
+        return self._warned
+
+    def matching(self, mask: int) -> set[str]:
+        """The games with at least one of the bits in `mask`."""
+        result: set[str] = set()
+        for bit in iter_bits(mask):
+            result |= self._games.get(bit, set())
+        return result
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from sgm.config import AppConfig
+from sgm.domain import GameAssets
+from sgm.helper_paths import extra_flag_value, flag_target_path
+
+
+class WarningContext:
+    """What a warning rule may look at for one game.
+
+    Image sizes and metadata JSON facts come from the given callables (the
+    analysis cache in the app) and are only fetched when a rule asks.
+    `path_exists` answers for jzintv_extra flag targets (a HelperPathIndex
+    in the app); it defaults to checking the disk.
+    """
+
+    def __init__(
+        self,
+        game: GameAssets,
+        config: AppConfig,
+        *,
+        root: Path | None,
+        image_size: Callable[[Path], tuple[int, int] | None],
+        json_facts: Callable[[Path], dict | None],
+        path_exists: Callable[[Path], bool] | None = None,
+    ):
+        self.game = game
+        self.config = config
+        self.root = root or game.folder
+        self._image_size = image_size
+        self._json_facts = json_facts
+        self.path_exists: Callable[[Path], bool] = path_exists or Path.exists
+        self._json: dict | None = None
+        self._json_loaded = False
+
+    def image_size(self, path: Path) -> tuple[int, int] | None:
+        return self._image_size(path)
+
+    def json(self) -> dict | None:
+        """The game's metadata JSON facts; None if there is no readable metadata file."""
+
+        if not self._json_loaded:
+            self._json_loaded = True
+            if self.game.metadata is not None:
+                self._json = self._json_facts(self.game.metadata)
+        return self._json
+
+
+@dataclass(frozen=True)
+class WarningRule:
+    """One check of the warning analysis, with the inputs it depends on.
+
+    `codes` lists every code the rule can report, so its old result can be
+    replaced without re-running the other rules. `settings` are the
+    AppConfig fields it reads, `images` the asset slots whose image size it
+    reads and `json_keys` the metadata JSON keys it reads (such rules only
+    run with JSON checks on). `library_files` rules also look at files
+    outside the game (jzintv_extra flag targets).
+    """
+
+    name: str
+    codes: frozenset[str]
+    check: Callable[[WarningContext], Iterable[str]]
+    settings: frozenset[str] = frozenset()
+    images: tuple[str, ...] = ()
+    json_keys: frozenset[str] = frozenset()
+    rom_cfg: bool = False
+    library_files: bool = False
+
+
+def _is_blank(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip() == ""
+    return False
+
+
+def _exists_for_flag_path(ctx: WarningContext, flag_value: str) -> bool:
+    try:
+        target = flag_target_path(
+            flag_value,
+            root=ctx.root,
+            media_prefix=getattr(ctx.config, "jzintv_media_prefix", "/media/usb0"),
+        )
+        return ctx.path_exists(target)
+    except Exception:
+        return False
+
+
+# ---------- rules ----------
+
+
+def _check_longname(ctx: WarningContext) -> Iterable[str]:
+    if len(ctx.game.basename) > ctx.config.desired_max_base_file_length:
+        yield "longname"
+
+
+def _check_invalidname(ctx: WarningContext) -> Iterable[str]:
+    if "'" in ctx.game.basename:
+        yield "invalidname"
+
+
+def _check_rom_cfg(ctx: WarningContext) -> Iterable[str]:
+    rom = ctx.game.rom
+    if rom is None:
+        yield "missing:rom"
+    elif rom.suffix.lower() in {".int", ".bin"} and ctx.game.config is None:
+        yield "missing:cfg"
+
+
+def _check_metadata(ctx: WarningContext) -> Iterable[str]:
+    if ctx.game.metadata is None:
+        yield "missing:metadata"
+
+
+def _image_rule(slot: str, setting: str, *, required: bool = True, snap_index: int | None = None) -> WarningRule:
+    """missing:<slot> (if `required`) and resolution:<slot> against config.<setting>.
+
+    Snaps are only checked up to DesiredNumberOfSnaps.
+    """
+
+    def check(ctx: WarningContext) -> Iterable[str]:
+        if snap_index is not None and snap_index > ctx.config.desired_number_of_snaps:
+            return
+        p = getattr(ctx.game, slot)
+        if p is None:
+            if required:
+                yield f"missing:{slot}"
+            return
+        expected = getattr(ctx.config, setting)
+        if ctx.image_size(p) != (expected.width, expected.height):
+            yield f"resolution:{slot}"
+
+    settings = {setting}
+    if snap_index is not None:
+        settings.add("desired_number_of_snaps")
+    codes = {f"resolution:{slot}"}
+    if required:
+        codes.add(f"missing:{slot}")
+    return WarningRule(
+        name=slot,
+        codes=frozenset(codes),
+        check=check,
+        settings=frozenset(settings),
+        images=(slot,),
+    )
+
+
+def _check_json_name(ctx: WarningContext) -> Iterable[str]:
+    data = ctx.json()
+    if data is not None and _is_blank(data.get("name")):
+        yield "json:empty:name"
+
+
+def _check_json_nb_players(ctx: WarningContext) -> Iterable[str]:
+    data = ctx.json()
+    if data is None:
+        return
+    nb = data.get("nb_players")
+    nb_str = "" if nb is None else str(nb)
+    if _is_blank(nb) or nb_str.strip() == "0":
+        yield "json:empty:nb_players"
+        return
+    try:
+        if int(nb_str.strip()) == 0:
+            yield "json:empty:nb_players"
+    except Exception:
+        pass
+
+
+def _check_json_editor(ctx: WarningContext) -> Iterable[str]:
+    data = ctx.json()
+    if data is not None and _is_blank(data.get("editor")):
+        yield "json:empty:editor"
+
+
+def _check_json_year(ctx: WarningContext) -> Iterable[str]:
+    data = ctx.json()
+    if data is None:
+        return
+    yr = data.get("year")
+    if yr is None:
+        yield "json:empty:year"
+        return
+    try:
+        if int(str(yr).strip() or "0") == 0:
+            yield "json:empty:year"
+    except Exception:
+        yield "json:empty:year"
+
+
+def _check_json_description(ctx: WarningContext) -> Iterable[str]:
+    data = ctx.json()
+    if data is None:
+        return
+    desc = data.get("description")
+    lang = (getattr(ctx.config, "language", "en") or "en").strip().lower() or "en"
+    if not isinstance(desc, dict):
+        yield "json:empty:description"
+        return
+    if _is_blank(desc.get(lang)):
+        yield "json:empty:description"
+    max_desc = int(getattr(ctx.config, "max_desc_length", 0) or 0)
+    if max_desc > 0:
+        raw_desc = "" if desc.get(lang) is None else str(desc.get(lang))
+        count = len(raw_desc) if raw_desc.strip() else 0
+        if count > max_desc:
+            yield "longdesc"
+
+
+def _flag_rule(flag: str, code: str) -> WarningRule:
+    """`code` if jzintv_extra has `<flag>=` pointing at nothing."""
+
+    prefix = f"--{flag}="
+
+    def check(ctx: WarningContext) -> Iterable[str]:
+        data = ctx.json()
+        if data is None:
+            return
+        extra = data.get("jzintv_extra")
+        extra_s = ("" if extra is None else str(extra)).strip()
+        if not extra_s:
+            return
+        value = extra_flag_value(extra_s, prefix)
+        if value is not None and (_is_blank(value) or not _exists_for_flag_path(ctx, value)):
+            yield code
+
+    return WarningRule(
+        name=flag,
+        codes=frozenset({code}),
+        check=check,
+        settings=frozenset({"jzintv_media_prefix"}),
+        json_keys=frozenset({"jzintv_extra"}),
+        library_files=True,
+    )
+
+
+WARNING_RULES: tuple[WarningRule, ...] = (
+    WarningRule(
+        "longname",
+        frozenset({"longname"}),
+        _check_longname,
+        settings=frozenset({"desired_max_base_file_length"}),
+    ),
+    WarningRule("invalidname", frozenset({"invalidname"}), _check_invalidname),
+    WarningRule("rom_cfg", frozenset({"missing:rom", "missing:cfg"}), _check_rom_cfg, rom_cfg=True),
+    WarningRule("metadata", frozenset({"missing:metadata"}), _check_metadata),
+    _image_rule("box", "box_resolution"),
+    _image_rule("box_small", "box_small_resolution"),
+    _image_rule("overlay_big", "overlay_big_resolution"),
+    _image_rule("overlay", "overlay_resolution"),
+    # Multi-overlay support: only warn on resolution if the files exist.
+    _image_rule("overlay2", "overlay_resolution", required=False),
+    _image_rule("overlay3", "overlay_resolution", required=False),
+    _image_rule("qrcode", "qrcode_resolution"),
+    _image_rule("snap1", "snap_resolution", snap_index=1),
+    _image_rule("snap2", "snap_resolution", snap_index=2),
+    _image_rule("snap3", "snap_resolution", snap_index=3),
+    WarningRule(
+        "json_name",
+        frozenset({"json:empty:name"}),
+        _check_json_name,
+        json_keys=frozenset({"name"}),
+    ),
+    WarningRule(
+        "json_nb_players",
+        frozenset({"json:empty:nb_players"}),
+        _check_json_nb_players,
+        json_keys=frozenset({"nb_players"}),
+    ),
+    WarningRule(
+        "json_editor",
+        frozenset({"json:empty:editor"}),
+        _check_json_editor,
+        json_keys=frozenset({"editor"}),
+    ),
+    WarningRule(
+        "json_year",
+        frozenset({"json:empty:year"}),
+        _check_json_year,
+        json_keys=frozenset({"year"}),
+    ),
+    WarningRule(
+        "json_description",
+        frozenset({"json:empty:description", "longdesc"}),
+        _check_json_description,
+        settings=frozenset({"language", "max_desc_length"}),
+        json_keys=frozenset({"description"}),
+    ),
+    _flag_rule("kbdhackfile", "json:missing:kbdhackfile"),
+    _flag_rule("gfx-palette", "json:missing:gfx-palette"),
+)
+
+# Every AppConfig field some rule reads.
+RULE_SETTINGS: frozenset[str] = frozenset().union(*(r.settings for r in WARNING_RULES))
+
+# The code registry: every code a rule can report, and its bit in a warning mask.
+# Analysis results are stored as int masks; codes are strings only at the UI edge.
+WARNING_CODES: tuple[str, ...] = tuple(code for r in WARNING_RULES for code in sorted(r.codes))
+CODE_BITS: dict[str, int] = {code: 1 << i for i, code in enumerate(WARNING_CODES)}
+
+
+def codes_to_mask(codes: Iterable[str]) -> int:
+    mask = 0
+    for code in codes:
+        mask |= CODE_BITS[code]
+    return mask
+
+
+def mask_to_codes(mask: int) -> set[str]:
+    return {code for code, bit in CODE_BITS.items() if mask & bit}
+
+
+def iter_bits(mask: int) -> Iterable[int]:
+    """The single-bit masks set in `mask`, lowest first."""
+
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+def rules_mask(rules: Iterable[WarningRule]) -> int:
+    """The bits of every code the rules can report."""
+
+    mask = 0
+    for rule in rules:
+        mask |= codes_to_mask(rule.codes)
+    return mask
+
+
+def select_rules(*, include_rom_cfg: bool = True, include_json_checks: bool = False) -> list[WarningRule]:
+    return [
+        r
+        for r in WARNING_RULES
+        if (include_rom_cfg or not r.rom_cfg) and (include_json_checks or not r.json_keys)
+    ]
+
+
+def settings_snapshot(config: AppConfig) -> dict[str, Any]:
+    """The values of RULE_SETTINGS, to find out later which ones changed."""
+
+    return {name: getattr(config, name, None) for name in RULE_SETTINGS}
+
+
+def rules_for_settings(changed: Iterable[str], rules: Iterable[WarningRule]) -> list[WarningRule]:
+    """The rules among `rules` that read any of the `changed` settings."""
+
+    changed = set(changed)
+    return [r for r in rules if r.settings & changed]
+
+
+def evaluate_rules(rules: Iterable[WarningRule], ctx: WarningContext) -> int:
+    """The warning mask of the codes the rules report."""
+
+    mask = 0
+    for rule in rules:
+        for code in rule.check(ctx):
+            mask |= CODE_BITS[code]
+    return mask
+
+
+def reevaluate_rules(mask: int, rules: list[WarningRule], ctx: WarningContext) -> int:
+    """`mask` with the results of `rules` replaced by a fresh run of them."""
+
+    return (mask & ~rules_mask(rules)) | evaluate_rules(rules, ctx)
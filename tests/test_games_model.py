@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt, QtMsgType, qInstallMessageHandler
+from PySide6.QtGui import QIcon
+from PySide6.QtTest import QAbstractItemModelTester
+from PySide6.QtWidgets import QApplication
+
+from sgm.domain import GameAssets
+from sgm.ui.games_model import GamesFilterProxyModel, GamesTreeModel
+
+
+ROOT = Path("/library")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def qt_warnings():
+    """Warnings and criticals Qt reports (QAbstractItemModelTester reports its failures this way)."""
+
+    messages: list[str] = []
+
+    def handler(mode, _context, message):
+        if mode in (QtMsgType.QtWarningMsg, QtMsgType.QtCriticalMsg, QtMsgType.QtFatalMsg):
+            messages.append(message)
+
+    previous = qInstallMessageHandler(handler)
+    yield messages
+    qInstallMessageHandler(previous)
+
+
+class Library:
+    """The folders, games and filters a model should show, and a model kept in sync with them."""
+
+    def __init__(self, dirs: list[Path], games: dict[str, Path]):
+        self.dirs = list(dirs)
+        self.games = dict(games)
+        self.hidden_games: set[str] = set()
+        self.hidden_folders: set[Path] = set()
+        self.model, self.proxy = self.new_models()
+        self.testers = [
+            QAbstractItemModelTester(m, QAbstractItemModelTester.FailureReportingMode.Warning)
+            for m in (self.model, self.proxy)
+        ]
+
+    def game_for(self, game_id: str) -> GameAssets | None:
+        folder = self.games.get(game_id)
+        return GameAssets(basename=game_id.rsplit("/", 1)[-1], folder=folder) if folder is not None else None
+
+    def new_models(self) -> tuple[GamesTreeModel, GamesFilterProxyModel]:
+        model = GamesTreeModel(game_for=self.game_for, folder_icon=QIcon(), game_icon=QIcon())
+        proxy = GamesFilterProxyModel()
+        proxy.setRecursiveFilteringEnabled(False)
+        proxy.set_game_filter(lambda gid: gid not in self.hidden_games)
+        proxy.set_folder_filter(lambda rel: rel not in self.hidden_folders)
+        proxy.setSourceModel(model)
+        model.reset(ROOT, self.dirs, self.games.items())
+        return model, proxy
+
+    def fresh_dump(self) -> list:
+        model, proxy = self.new_models()
+        return dump(proxy)
+
+
+def dump(model, parent: QModelIndex = QModelIndex()) -> list:
+    """The tree below `parent` as nested (display text, UserRole, children) tuples; builds every row."""
+
+    rows = []
+    for row in range(model.rowCount(parent)):
+        ix = model.index(row, 0, parent)
+        info = ix.data(Qt.ItemDataRole.UserRole)
+        rows.append((ix.data(Qt.ItemDataRole.DisplayRole), info, dump(model, ix)))
+    return rows
+
+
+def touch(model, parent: QModelIndex = QModelIndex(), depth: int = 0) -> None:
+    """Build the rows of some folders only, so later updates meet a partly built tree."""
+
+    for row in range(model.rowCount(parent)):
+        ix = model.index(row, 0, parent)
+        if depth < 1 and row % 2 == 0:
+            touch(model, ix, depth + 1)
+
+
+def make_library() -> Library:
+    dirs = [ROOT / "Action", ROOT / "action2", ROOT / "Action" / "Old", ROOT / "Sports", ROOT / "Sports" / "ball"]
+    games: dict[str, Path] = {}
+    for d in [ROOT, *dirs]:
+        rel = d.relative_to(ROOT).as_posix()
+        prefix = "" if rel == "." else f"{rel}/"
+        for name in ("Zeta", "alpha", "Beta", "beta2"):
+            games[f"{prefix}{name}"] = d
+    return Library(dirs, games)
+
+
+def test_model_matches_fresh_reset(qt_warnings):
+    lib = make_library()
+    assert dump(lib.proxy) == lib.fresh_dump()
+    assert lib.model.has_folders()
+    assert not qt_warnings
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_updates_match_fresh_reset(qt_warnings, seed):
+    rnd = random.Random(seed)
+    lib = make_library()
+    if seed % 2:
+        dump(lib.proxy)
+    else:
+        touch(lib.proxy)
+    counter = 0
+
+    for step in range(60):
+        op = rnd.choice(["add", "add", "move", "remove", "folder", "filter", "folder_filter", "reset"])
+        folders = [ROOT, *lib.dirs]
+        if op == "add":
+            counter += 1
+            folder = rnd.choice(folders)
+            rel = folder.relative_to(ROOT).as_posix()
+            gid = ("" if rel == "." else f"{rel}/") + rnd.choice(["new", "New", "aa", "zz", "Mid"]) + str(counter)
+            lib.games[gid] = folder
+            lib.model.add_games([(gid, folder)])
+        elif op == "move" and lib.games:
+            gid = rnd.choice(sorted(lib.games))
+            folder = rnd.choice(folders)
+            lib.games[gid] = folder
+            lib.model.add_games([(gid, folder)])
+        elif op == "remove" and lib.games:
+            gids = rnd.sample(sorted(lib.games), min(len(lib.games), rnd.randint(1, 3)))
+            for gid in gids:
+                del lib.games[gid]
+            lib.model.remove_games(gids)
+        elif op == "folder":
+            counter += 1
+            parent = rnd.choice(folders)
+            d = parent / rnd.choice(["Sub", "sub", "Aaa", "Zzz"]) if rnd.random() < 0.7 else parent / f"n{counter}"
+            if d not in lib.dirs:
+                lib.dirs.append(d)
+                lib.model.add_folders(parent.relative_to(ROOT), [d])
+        elif op == "filter":
+            lib.hidden_games = set(rnd.sample(sorted(lib.games), len(lib.games) // 3))
+            lib.proxy.invalidateFilter()
+        elif op == "folder_filter":
+            rels = [d.relative_to(ROOT) for d in lib.dirs]
+            lib.hidden_folders = set(rnd.sample(rels, len(rels) // 4))
+            lib.proxy.invalidateFilter()
+        elif op == "reset":
+            lib.model.reset(ROOT, lib.dirs, lib.games.items())
+            touch(lib.proxy)
+
+        if step % 3 == 0:
+            lib.model.refresh_all()
+        assert dump(lib.proxy) == lib.fresh_dump(), f"step {step}: {op}"
+        for gid in rnd.sample(sorted(lib.games), min(5, len(lib.games))):
+            ix = lib.model.index_for_game(gid)
+            assert ix.data(Qt.ItemDataRole.UserRole)["id"] == gid
+        assert not qt_warnings, qt_warnings
+
+
+def test_removing_many_rows_at_once(qt_warnings):
+    lib = make_library()
+    # A few hundred rows, removed in one go.
+    added = [(f"Sports/bulk{i:04}", ROOT / "Sports") for i in range(300)]
+    lib.games.update(added)
+    lib.model.reset(ROOT, lib.dirs, lib.games.items())
+    dump(lib.proxy)
+    persistent = [QPersistentModelIndex(lib.proxy.mapFromSource(lib.model.index_for_game(gid))) for gid, _ in added]
+    kept = QPersistentModelIndex(lib.proxy.mapFromSource(lib.model.index_for_game("Sports/alpha")))
+
+    gids = [gid for gid, _ in added]
+    for gid in gids:
+        del lib.games[gid]
+    lib.model.remove_games(gids)
+
+    # Every removed row outlives its removal until the next reset.
+    assert len(lib.model._retired) == len(gids)
+    assert not any(p.isValid() for p in persistent)
+    assert kept.data(Qt.ItemDataRole.UserRole)["id"] == "Sports/alpha"
+    assert dump(lib.proxy) == lib.fresh_dump()
+    assert not qt_warnings, qt_warnings
+    lib.model.reset(ROOT, lib.dirs, lib.games.items())
+    assert not lib.model._retired
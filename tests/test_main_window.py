@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from sgm.config import AppConfig
+from sgm.ui.main_window import MainWindow
+from sgm.warning_rules import mask_to_codes
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def wait_for(app, done, timeout: float = 20.0) -> None:
+    end = time.monotonic() + timeout
+    while not done():
+        assert time.monotonic() < end, "timed out"
+        app.processEvents()
+        time.sleep(0.005)
+    app.processEvents()
+
+
+def add_game(folder: Path, name: str, extra: str = "") -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / f"{name}.rom").write_bytes(b"\0")
+    meta = {"name": name, "nb_players": "1", "year": 1983, "description": {"en": "A game."}, "jzintv_extra": extra}
+    (folder / f"{name}.json").write_text(json.dumps(meta), encoding="utf-8")
+
+
+@pytest.fixture
+def window(app, tmp_path):
+    cfg_path = tmp_path / "sgm.ini"
+    w = MainWindow(config=AppConfig.load_or_create(cfg_path), config_path=cfg_path)
+    yield w
+    w.close()
+
+
+def codes(w: MainWindow, game_id: str) -> set[str]:
+    return set(mask_to_codes(w._analysis_by_game.get(game_id, 0)))
+
+
+def test_watcher_reanalyzes_games_pointing_at_root_helper_files(app, window, tmp_path):
+    root = tmp_path / "games"
+    add_game(root, "Root", "--kbdhackfile=/media/usb0/hack.kbd")
+    add_game(root / "Sub", "Nested", "--gfx-palette=/media/usb0/colors.txt")
+    add_game(root / "Sub", "Plain")
+
+    window.load_folder(root)
+    wait_for(app, lambda: not window._scanning)
+    window._chk_include_json_checks.setChecked(True)
+    window._analyze_folder()
+    wait_for(app, lambda: window._analyze_thread is None)
+
+    assert "json:missing:kbdhackfile" in codes(window, "Root")
+    assert "json:missing:gfx-palette" in codes(window, "Sub/Nested")
+    assert window._filter_checks["json:missing:kbdhackfile"].isEnabled()
+
+    # Only the root changes; the games pointing at the new files live elsewhere too.
+    (root / "hack.kbd").write_text("", encoding="utf-8")
+    (root / "colors.txt").write_text("", encoding="utf-8")
+    window._watched_directories_changed([root])
+
+    assert "json:missing:kbdhackfile" not in codes(window, "Root")
+    assert "json:missing:gfx-palette" not in codes(window, "Sub/Nested")
+    assert not window._filter_checks["json:missing:kbdhackfile"].isEnabled()
+    assert not window._filter_checks["json:missing:gfx-palette"].isEnabled()
+
+    (root / "hack.kbd").unlink()
+    (root / "colors.txt").unlink()
+    window._watched_directories_changed([root])
+
+    assert "json:missing:kbdhackfile" in codes(window, "Root")
+    assert "json:missing:gfx-palette" in codes(window, "Sub/Nested")
+    assert window._filter_checks["json:missing:gfx-palette"].isEnabled()
+    assert "json:missing:gfx-palette" not in codes(window, "Sub/Plain")
+
+
+def test_refreshing_one_game_keeps_other_changes_in_its_folder(app, window, tmp_path):
+    root = tmp_path / "games"
+    add_game(root, "Edited")
+    add_game(root, "Other")
+    window.load_folder(root)
+    wait_for(app, lambda: not window._scanning)
+
+    # Another game's file arrives while the watcher is still debouncing the folder...
+    (root / "Other_snap1.png").write_bytes(b"")
+    # ...and the app refreshes the game it just edited in the same folder.
+    (root / "Edited_snap1.png").write_bytes(b"")
+    window._refresh_game("Edited")
+
+    assert window._games["Edited"].snap1 == root / "Edited_snap1.png"
+    wait_for(app, lambda: window._games["Other"].snap1 is not None, timeout=5.0)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sgm.scan_snapshot import SNAPSHOT_DIR_NAME, ScanSnapshot
+from sgm.scanner import scan_folder
+
+
+def test_app_cache_directory_is_not_walked(tmp_path):
+    (tmp_path / "Game.rom").write_bytes(b"\0")
+    thumbs = tmp_path / SNAPSHOT_DIR_NAME / "thumbs"
+    thumbs.mkdir(parents=True)
+    (thumbs / "my_palette.txt").write_text("", encoding="utf-8")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "other_palette.txt").write_text("", encoding="utf-8")
+
+    snapshot = ScanSnapshot.open(tmp_path)
+    scan = scan_folder(tmp_path, palette_exts={".txt"}, snapshot=snapshot)
+
+    assert list(scan.games) == ["Game"]
+    assert scan.palette_files == [tmp_path / ".hidden" / "other_palette.txt"]
+    assert thumbs not in snapshot.listed_dirs()
+    assert tmp_path / SNAPSHOT_DIR_NAME not in snapshot.listed_dirs()